@@ -0,0 +1,91 @@
+"""benchmark of the import time of mstarpy with python -X importtime
+
+Examples:
+    python benchmarks/importtime.py
+    python benchmarks/importtime.py --max-ms 250 --repeat 5
+    python benchmarks/importtime.py --max-ms 0
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+# modules which must not be imported by import mstarpy
+DEFERRED = ["pandas", "numpy", "selenium.webdriver"]
+
+
+# maximum median import time of mstarpy in milliseconds
+MAX_MS = 400.0
+
+
+CHECK = (
+    "import sys, mstarpy; "
+    "print(','.join(name for name in {deferred} if name in sys.modules))"
+)
+
+
+def import_times(module:str="mstarpy") -> dict:
+    """
+    This function imports a module in a new interpreter with -X importtime.
+
+    Args:
+        module (str) : module to import
+
+    Returns:
+        dict with the cumulative import time in microseconds by module
+
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                             capture_output=True, text=True, check=True)
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() == "site":
+            # modules imported by the interpreter before the module
+            times = {}
+            continue
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def loaded_modules() -> list:
+    """
+    This function returns the modules of DEFERRED executed by import mstarpy.
+    """
+    process = subprocess.run([sys.executable, "-c", CHECK.format(deferred=DEFERRED)],
+                             capture_output=True, text=True, check=True)
+    return [name for name in process.stdout.strip().split(",") if name]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="number of imports measured")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest modules shown")
+    parser.add_argument("--max-ms", type=float, default=MAX_MS,
+                        help="fail if the median import time is above this threshold, 0 to disable")
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.repeat)]
+    median = statistics.median(run["mstarpy"] for run in runs) / 1000
+
+    print(f"import mstarpy : {median:.1f} ms (median of {args.repeat})")
+    for name, cumulative in sorted(runs[-1].items(), key=lambda x: -x[1])[1:args.top + 1]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    status = 0
+    loaded = loaded_modules()
+    if loaded:
+        print(f"error : import mstarpy executes {', '.join(loaded)}")
+        status = 1
+
+    if args.max_ms and median > args.max_ms:
+        print(f"error : import time above {args.max_ms} ms")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,907 @@
+"""module to request the Morningstar APIs with asyncio"""
+from __future__ import annotations
+import asyncio
+import functools
+import inspect
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .error import not_200_response
+from .funds import Funds
+from .lazy import lazy_import
+from .screener import UNIVERSE_OUTPUT, screener_frame
+from .search import CHART_URL, MorningstarSession, _find_token
+from .stock import Stock
+from .timeseries import check_output, series_output
+from .transport import RateLimiter
+from .utils import LANGUAGE, random_user_agent
+
+pd = lazy_import("pandas")
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncMorningstarSession():
+    """
+    Asynchronous session to request the Morningstar APIs with aiohttp.
+    The cookies, headers, chart token and retry policy are the ones of a MorningstarSession,
+    so a cookie refresh of one session is seen by the other. The rate limits are the ones
+    of the asynchronous session, the requests are not limited by default.
+
+    Args:
+        session (MorningstarSession) : session sharing its cookies, a new one is created if not set
+        limit (int) : maximum number of connections open at the same time
+        limit_per_host (int) : maximum number of connections open per host, 0 is no limit
+        rate_limits (dict) : requests per second, burst and maximum number of requests in flight per host,
+        example : {"api-global": {"rate": 100.0, "burst": 200, "concurrency": 200}}, the missing limits
+        are the ones of RATE_LIMIT, default is no limit
+
+    Examples:
+        >>> async with AsyncMorningstarSession(session, limit=200) as aio:
+        ...     fund = await AsyncFunds.create("myria", session=aio)
+        ...     await fund.feeLevel()
+
+    Raises:
+        ImportError: raised whenever aiohttp is not installed
+        TypeError: raised whenever the parameter type is not the type expected
+
+    """
+
+    def __init__(self,
+                 session:MorningstarSession=None,
+                 limit:int=100,
+                 limit_per_host:int=0,
+                 rate_limits:dict=None) -> None:
+
+        if aiohttp is None:
+            raise ImportError(
+                "aiohttp is required by the asynchronous client, install it with pip install mstarpy[async]"
+            )
+
+        if session and not isinstance(session, MorningstarSession):
+            raise TypeError("session parameter should be a MorningstarSession")
+
+        if not isinstance(limit, int):
+            raise TypeError("limit parameter should be an integer")
+
+        if not isinstance(limit_per_host, int):
+            raise TypeError("limit_per_host parameter should be an integer")
+
+        self.session = session or MorningstarSession()
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.limiter = RateLimiter(rate_limits)
+        self._client = None
+        self._refresh_lock = asyncio.Lock()
+        self._token_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        This function closes the connections of the session.
+        """
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+        self._client = None
+
+    def _client_session(self):
+        """
+        This function returns the aiohttp session, it is created in the running event loop.
+        """
+        if self._client is None or self._client.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self._client = aiohttp.ClientSession(connector=connector)
+        return self._client
+
+    async def _send(self,
+                    method:str,
+                    url:str,
+                    params:dict=None,
+                    headers:dict=None,
+                    proxies:dict=None,
+                    timeout:float|tuple=None) -> requests.Response:
+        """
+        This function sends a request with the cookies and headers of the MorningstarSession.
+
+        Returns:
+            requests.Response with the content already read
+        """
+        request_headers = CaseInsensitiveDict(self.session.headers)
+        cookies = "; ".join(f"{name}={value}" for name, value in self.session.cookies.items())
+        if cookies:
+            request_headers["Cookie"] = cookies
+        if headers:
+            request_headers.update(headers)
+
+        if params:
+            params = {key: str(value) for key, value in params.items() if value is not None}
+
+        proxy = (proxies or {}).get("https")
+        if timeout is None:
+            timeout = self.session.request_timeout(url)
+        if isinstance(timeout, tuple):
+            client_timeout = aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+        else:
+            client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+        try:
+            async with self._client_session().request(method,
+                                                      url,
+                                                      params=params,
+                                                      headers=dict(request_headers.items()),
+                                                      proxy=proxy,
+                                                      timeout=client_timeout) as r:
+                content = await r.read()
+        # the errors are the ones of requests, so they are retried as the ones of MorningstarSession
+        except asyncio.TimeoutError as e:
+            raise requests.Timeout(str(e)) from e
+        except aiohttp.ClientError as e:
+            raise requests.ConnectionError(str(e)) from e
+
+        response = requests.Response()
+        response.status_code = r.status
+        response.reason = r.reason
+        response.headers = CaseInsensitiveDict(r.headers)
+        response.url = str(r.url)
+        response.encoding = r.charset
+        response._content = content
+        return response
+
+    async def request(self,
+                      method:str,
+                      url:str,
+                      params:dict=None,
+                      headers:dict=None,
+                      proxies:dict=None,
+                      timeout:float|tuple=None) -> requests.Response:
+        """
+        This function sends a request within the rate limits of the session and with the retry policy
+        of the MorningstarSession, the cookies are refreshed once with the browser
+        of the MorningstarSession if a WAF challenge is detected.
+
+        Args:
+            method (str) : http method
+            url (str) : url of the request
+            params (dict) : parameters of the request
+            headers (dict) : headers added to the ones of the session
+            proxies (dict) : set the proxy if needed, example : {"http": "http://host:port","https": "https://host:port"}
+            timeout (float|tuple) : total timeout in seconds or (connect, read) timeouts of the request,
+            default is the timeout of the MorningstarSession for the endpoint
+
+        Returns:
+            requests.Response
+
+        Raises:
+            requests.ConnectionError: raised whenever the connection fails after the retries
+            requests.Timeout: raised whenever the request times out after the retries
+
+        """
+        attempt = 0
+        while True:
+            r, error = None, None
+            try:
+                r = await self._attempt(method, url, params, headers, proxies, timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+
+            delay = self.session.retry.delay(url, method, attempt, r, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return r
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _attempt(self,
+                       method:str,
+                       url:str,
+                       params:dict=None,
+                       headers:dict=None,
+                       proxies:dict=None,
+                       timeout:float|tuple=None) -> requests.Response:
+        """
+        This function sends a request and sends it again once the cookies are refreshed
+        if a WAF challenge is detected.
+        """
+        cookies = self.session.cookies.get_dict()
+        r = await self._limited_send(method, url, params, headers, proxies, timeout)
+
+        # Detect WAF challenge
+        if r.status_code == 202 or r.headers.get("x-amzn-waf-action") == "challenge":
+            await self._refresh_cookies(cookies)
+            r = await self._limited_send(method, url, params, headers, proxies, timeout)
+
+        return r
+
+    async def _limited_send(self,
+                            method:str,
+                            url:str,
+                            params:dict=None,
+                            headers:dict=None,
+                            proxies:dict=None,
+                            timeout:float|tuple=None) -> requests.Response:
+        """
+        This function sends a request within the rate and concurrency limits of its host.
+        """
+        limiter = self.limiter.host(url)
+        if limiter is None:
+            return await self._send(method, url, params, headers, proxies, timeout)
+
+        await limiter.acquire_async()
+        response = None
+        try:
+            response = await self._send(method, url, params, headers, proxies, timeout)
+        finally:
+            limiter.release(response)
+        return response
+
+    async def _refresh_cookies(self,
+                               cookies:dict) -> None:
+        """
+        This function refreshes the cookies of the MorningstarSession in a thread,
+        only one refresh runs at a time and it is skipped if the cookies changed while waiting.
+        """
+        async with self._refresh_lock:
+            await asyncio.to_thread(self.session._refresh_cookies, cookies)
+
+    async def get(self,
+                  url:str,
+                  params:dict=None,
+                  headers:dict=None,
+                  proxies:dict=None,
+                  timeout:float|tuple=None) -> requests.Response:
+        """
+        This function sends a GET request.
+
+        Examples:
+            >>> await AsyncMorningstarSession().get("https://global.morningstar.com/api/v1/fr/stores/filters")
+
+        """
+        return await self.request("GET", url, params, headers, proxies, timeout)
+
+    async def general_search(self,
+                             params:dict,
+                             language:str="en-gb",
+                             proxies:dict=None,
+                             timeout:float|tuple=None) -> dict:
+        """
+        This function will use the screener of morningstar.com
+        to find informations about funds or classification
+
+        Args:
+        params (dict) : paramaters of the request
+        language (str) : language of the request, default is "en-gb"
+        proxies (dict) : set the proxy if needed,
+        example : {"http": "http://host:port","https": "https://host:port"}
+        timeout (float|tuple) : timeout in seconds or (connect, read) timeouts of the request,
+        default is the timeout of the session for the endpoint
+
+        Returns:
+        dict of information
+
+        Examples:
+        >>> await general_search(params = {'query': "_ ~= 'US67066G1040'", 'fields': 'isin,name', 'limit': 3})
+
+        """
+        if not isinstance(params, dict):
+            raise TypeError("params parameter should be dict")
+
+        if not isinstance(language, str):
+            raise TypeError("language parameter should be a string")
+
+        if proxies and not isinstance(proxies, dict):
+            raise TypeError("proxies parameter should be dict")
+
+        if language not in LANGUAGE:
+            raise ValueError(
+                f"language parameter can only take one of the values : {', '.join(LANGUAGE)}"
+            )
+
+        url = f"https://global.morningstar.com/api/v1/{language}/tools/screener/_data"
+
+        response = await self.get(url, params=params, proxies=proxies, timeout=timeout)
+
+        not_200_response(url, response)
+
+        return response.json()
+
+    async def screener_universe(self,
+                                term:str,
+                                language:str="en-gb",
+                                field:str|list="",
+                                filters:dict=None,
+                                pageSize:int=10,
+                                page:int=1,
+                                sortby:str=None,
+                                ascending:bool=True,
+                                proxies:dict=None,
+                                output:str="records",
+                                timeout:float|tuple=None) -> list|pd.DataFrame:
+        """
+        This function will use the screener of global.morningstar.com
+        to find funds, etf, stocks which include the term.
+        The parameters are the ones of MorningstarSession.screener_universe.
+
+        Returns:
+        list of dict with secrity information or DataFrame
+
+        Examples:
+        >>> await screener_universe("myria", field=["isin", "name"], pageSize=10, page=1)
+
+        """
+        if not isinstance(term, str):
+            raise TypeError("term parameter should be a string")
+
+        if not isinstance(field, (str, list)):
+            raise TypeError("field parameter should be a string or a list")
+
+        if filters and not isinstance(filters, dict):
+            raise TypeError("filters parameter should be a dict")
+
+        if not isinstance(pageSize, int):
+            raise TypeError("pageSize parameter should be an integer")
+
+        if not isinstance(page, int):
+            raise TypeError("page parameter should be an integer")
+
+        if output not in UNIVERSE_OUTPUT:
+            raise ValueError(
+                f"output parameter must take one of the following value : {', '.join(UNIVERSE_OUTPUT)}"
+            )
+
+        # the catalogues of the screener are cached by the MorningstarSession,
+        # they are checked in a thread in case they have to be requested
+        fields = await asyncio.to_thread(self.session._screener_fields, field, sortby, timeout)
+        query_filters = await asyncio.to_thread(self.session._screener_filters, filters, timeout)
+
+        params = MorningstarSession._screener_params(
+            f"_ ~= '{term}'" + query_filters, fields, page, pageSize, sortby, ascending
+        )
+
+        result = await self.general_search(params, language=language, proxies=proxies, timeout=timeout)
+
+        if output == "frame":
+            numeric = await asyncio.to_thread(self.session.numeric_fields, timeout)
+
+        if not "results" in result:
+            print(f"0 fund found whith the term {term}")
+            if output == "frame":
+                return screener_frame([], field, numeric)
+            return {}
+
+        if output == "frame":
+            return screener_frame(result["results"], field, numeric)
+        return result["results"]
+
+    async def token_chart(self,
+                          proxies:dict=None,
+                          refresh:bool=False) -> str:
+        """
+        This function will scrape the Bearer Token needed to access MS API chart data,
+        the token is cached by the MorningstarSession and scraped again only when it
+        is about to expire or when refresh is True.
+
+        Returns:
+        str bearer token
+
+        """
+        if proxies and not isinstance(proxies, dict):
+            raise TypeError("proxies parameter should be dict")
+
+        token = None if refresh else self.session._cached_chart_token()
+        if token:
+            return token
+
+        async with self._token_lock:
+            token = None if refresh else self.session._cached_chart_token()
+            if token:
+                return token
+
+            response = await self.get(CHART_URL, proxies=proxies)
+
+            token = _find_token(response.text)
+            if token is None:
+                return None
+
+            self.session._set_chart_token(token)
+            return token
+
+
+class _PendingResponse():
+    """
+    Response of an asynchronous GetData, the request is sent when the response
+    or its json is awaited.
+    """
+
+    def __init__(self, send) -> None:
+        self._send = send
+
+    def __await__(self):
+        return self._send().__await__()
+
+    async def _json(self):
+        return (await self._send()).json()
+
+    def json(self):
+        return self._json()
+
+
+def _awaitable(method):
+    """
+    This function wraps a synchronous endpoint so it can be awaited,
+    the endpoints of the asynchronous classes return awaitables.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+    return wrapper
+
+
+async def _async_session(session:MorningstarSession|AsyncMorningstarSession=None) -> AsyncMorningstarSession:
+    """
+    This function returns the asynchronous session of a security, a new MorningstarSession
+    is created in a thread since it may start a browser.
+    """
+    if isinstance(session, AsyncMorningstarSession):
+        return session
+    if session is None:
+        session = await asyncio.to_thread(MorningstarSession)
+    return AsyncMorningstarSession(session)
+
+
+def _async_endpoints(cls):
+    """
+    This decorator makes awaitable the public methods inherited from the synchronous classes
+    which are not redefined by the asynchronous class.
+    """
+    for klass in cls.__mro__[::-1]:
+        if klass is object or issubclass(klass, AsyncSecurity):
+            continue
+        for name, method in vars(klass).items():
+            if name.startswith("_") or not inspect.isfunction(method):
+                continue
+            if any(name in vars(k) for k in cls.__mro__ if issubclass(k, AsyncSecurity)):
+                continue
+            setattr(cls, name, _awaitable(method))
+    return cls
+
+
+class AsyncSecurity():
+    """
+    Asynchronous version of Security, every endpoint method returns an awaitable.
+    The securities are created with the coroutine create or without request with from_id.
+
+    The methods which download documents use the MorningstarSession in a thread.
+
+    Examples:
+        >>> fund = await AsyncFunds.create("myria", session=aio)
+        >>> await fund.TimeSeries(["nav"], start_date, end_date)
+        >>> await asyncio.gather(fund.quote(), fund.sector(), fund.feeLevel())
+
+    """
+
+    @classmethod
+    async def create(cls,
+                     term:str,
+                     language:str="en-gb",
+                     filters:dict=None,
+                     itemRange:int=0,
+                     pageSize:int=10,
+                     page:int=1,
+                     sortby:str=None,
+                     ascending:bool=True,
+                     proxies:dict=None,
+                     session:AsyncMorningstarSession=None):
+        """
+        This function finds a security with the screener and creates it,
+        the parameters are the ones of the synchronous class.
+
+        Returns:
+            security of the class
+
+        Examples:
+            >>> await AsyncFunds.create("myria", session=aio)
+            >>> await AsyncStock.create("US0378331005", session=aio)
+
+        Raises:
+            TypeError: raised whenever the parameter type is not the type expected
+            ValueError : raised whenever the parameter is not valid or no security found
+
+        """
+        if not isinstance(term, str):
+            raise TypeError("term parameter should be a string")
+
+        if not isinstance(language, str):
+            raise TypeError("language parameter should be a string")
+
+        if not isinstance(itemRange, int):
+            raise TypeError("itemRange parameter should be an integer")
+
+        if pageSize <= itemRange:
+            raise ValueError(
+                "itemRange parameter should be strictly inferior to pageSize parameter"
+            )
+
+        if filters and not isinstance(filters, dict):
+            raise TypeError("filters parameter should be dict")
+
+        if language not in LANGUAGE:
+            raise ValueError(
+                f"language parameter can only take one of the values : {', '.join(LANGUAGE)}"
+            )
+
+        class_filters = cls._default_filters
+        if filters:
+            class_filters = (class_filters or {}) | filters
+
+        security = cls.__new__(cls)
+        security._set_attributes(await _async_session(session),
+                                 language,
+                                 proxies=proxies,
+                                 filters=class_filters,
+                                 pageSize=pageSize,
+                                 page=page,
+                                 sortby=sortby,
+                                 ascending=ascending,
+                                 itemRange=itemRange)
+
+        code_list = await security.aio.screener_universe(term,
+                                                         language=language,
+                                                         field=["isin", "name"],
+                                                         filters=class_filters,
+                                                         pageSize=pageSize,
+                                                         page=page,
+                                                         sortby=sortby,
+                                                         ascending=ascending,
+                                                         proxies=proxies)
+        if not code_list:
+            raise ValueError(f"0 {security.asset_type} found with the term {term}")
+
+        if itemRange >= len(code_list):
+            raise ValueError(
+                f"Found only {len(code_list)} {security.asset_type} with the term {term}. The paramater itemRange must maximum equal to {len(code_list)-1}"
+            )
+
+        security._set_security(code_list[itemRange], term, cls._default_asset_type)
+        return security
+
+    @classmethod
+    async def from_list(cls,
+                        terms:list,
+                        by:str="isin",
+                        language:str="en-gb",
+                        filters:dict=None,
+                        chunkSize:int=100,
+                        proxies:dict=None,
+                        session:AsyncMorningstarSession=None) -> tuple[dict, list]:
+        """
+        This function creates many securities from a list of isin or ids,
+        the parameters are the ones of Security.from_list.
+
+        Returns:
+            tuple with a dict of securities by term and the list of terms not found
+
+        Examples:
+            >>> await AsyncFunds.from_list(["FR0010921445", "LU1681043599"], session=aio)
+
+        """
+        session = await _async_session(session)
+
+        class_filters = cls._default_filters
+        if filters:
+            class_filters = (class_filters or {}) | filters
+
+        found = await asyncio.to_thread(session.session.resolve_securities,
+                                        terms,
+                                        by=by,
+                                        language=language,
+                                        filters=class_filters,
+                                        chunkSize=chunkSize,
+                                        proxies=proxies)
+
+        return cls._from_results(terms, found, session, language, proxies, class_filters)
+
+    def _set_attributes(self,
+                        session:AsyncMorningstarSession,
+                        language:str,
+                        *args,
+                        **kwargs) -> None:
+        """
+        This function sets the attributes of the security, the synchronous session
+        is the one of the asynchronous session.
+        """
+        if not isinstance(session, AsyncMorningstarSession):
+            session = AsyncMorningstarSession(session)
+        self.aio = session
+        super()._set_attributes(session.session, language, *args, **kwargs)
+
+    async def _load_metadata_async(self) -> None:
+        """
+        This function retrieves the name and the isin of a security created with from_id
+        in a thread, the screener request does not block the event loop.
+        """
+        if (self._name is None or self._isin is None) and not self._metadata_loaded:
+            await asyncio.to_thread(self._load_metadata)
+
+    async def dataPoint(self,
+                        field:str|list) -> list[dict]:
+        """
+        This function retrieves infos about securities such as name,
+        performance, risk metrics...
+
+        Examples:
+            >>> await fund.dataPoint(['name', 'isin', 'priipsKidCosts'])
+
+        """
+        await self._load_metadata_async()
+
+        result = await self.aio.screener_universe(
+            self.isin,
+            language=self.language,
+            field=field,
+            filters=self.filters,
+            proxies=self.proxies,
+            pageSize=self.pageSize,
+            page=self.page,
+            sortby=self.sortby,
+            ascending=self.ascending,
+        )
+
+        return result[self.itemRange]['fields']
+
+    async def fetch_many(self,
+                         methods:list|dict,
+                         max_workers:int=8) -> tuple[dict, dict]:
+        """
+        This function calls many methods of the security concurrently,
+        the parameters are the ones of Security.fetch_many.
+
+        Returns:
+            tuple with a dict of results and a dict of errors, both by method
+
+        Examples:
+            >>> await fund.fetch_many(["quote", "sector", "holdings", "feeLevel"])
+
+        """
+        if not isinstance(methods, (list, dict)):
+            raise TypeError("methods parameter should be a list or a dict")
+
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError("max_workers parameter should be a positive integer")
+
+        calls = self._method_calls(methods)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def call(function, kwargs):
+            async with semaphore:
+                return await function(**kwargs)
+
+        outputs = await asyncio.gather(*(call(function, kwargs) for function, kwargs in calls.values()),
+                                       return_exceptions=True)
+
+        results = {}
+        errors = {}
+        for key, output in zip(calls, outputs):
+            if isinstance(output, Exception):
+                errors[key] = output
+            else:
+                results[key] = output
+        return results, errors
+
+    def GetData(self,
+                field:str,
+                params:dict=None,
+                headers:dict=None,
+                url_suffix:str="data",
+                timeout:float|tuple=None) -> _PendingResponse:
+        """
+        This function retrieves data from the MorningStar global API,
+        the response or its json have to be awaited.
+
+        Examples:
+            >>> await fund.GetData("price/feeLevel").json()
+
+        """
+        url, params, headers = self._data_request(field, params, headers, url_suffix)
+
+        async def send():
+            response = await self.aio.get(url, params=params, headers=headers, proxies=self.proxies,
+                                          timeout=timeout)
+            not_200_response(url, response)
+            return response
+
+        return _PendingResponse(send)
+
+    async def ltData(self,
+                     field:str,
+                     currency:str="EUR",
+                     timeout:float|tuple=None) -> dict:
+        """
+        Generic function to use MorningStar lt api.
+
+        Examples:
+            >>> await fund.ltData("Mifid")
+
+        """
+        url, params = self._lt_request(field, currency)
+
+        response = await self.aio.get(url, params=params, proxies=self.proxies, timeout=timeout)
+
+        not_200_response(url, response)
+
+        return self._lt_result(response)
+
+    async def RealtimeData(self,
+                           url_suffix:str,
+                           timeout:float|tuple=None) -> dict:
+        """
+        This function retrieves realtime data.
+
+        Examples:
+            >>> await stock.RealtimeData("quotes")
+
+        """
+        url, params, headers = self._realtime_request(url_suffix)
+
+        response = await self.aio.get(url,
+                                      params=params,
+                                      headers=headers,
+                                      proxies=self.proxies,
+                                      timeout=timeout)
+
+        not_200_response(url, response)
+
+        return response.json()
+
+    async def TimeSeries(self,
+                         field:str|list,
+                         start_date,
+                         end_date,
+                         frequency:str="daily",
+                         output:str="records",
+                         timeout:float|tuple=None) -> list|pd.DataFrame|dict:
+        """
+        This function retrieves historical data of the specified fields.
+
+        Examples:
+            >>> await fund.TimeSeries(["nav","totalReturn"], start_date, end_date)
+
+        """
+        check_output(output)
+        url, params = self._time_series_request(field, start_date, end_date, frequency)
+
+        bearer_token = await self.aio.token_chart()
+        headers = {
+            "user-agent": random_user_agent(),
+            "authorization": f"Bearer {bearer_token}",
+        }
+
+        response = await self.aio.get(url, params=params, headers=headers, proxies=self.proxies,
+                                      timeout=timeout)
+
+        # the cached token is rejected, it is scraped again
+        if response.status_code == 401:
+            headers["authorization"] = f"Bearer {await self.aio.token_chart(refresh=True)}"
+            response = await self.aio.get(url, params=params, headers=headers, proxies=self.proxies,
+                                          timeout=timeout)
+
+        not_200_response(url, response)
+
+        return series_output(self._time_series_result(response), field, output)
+
+
+@_async_endpoints
+class AsyncFunds(AsyncSecurity, Funds):
+    """
+    Asynchronous version of Funds, every endpoint method returns an awaitable.
+
+    Examples:
+        >>> fund = await AsyncFunds.create("myria", session=aio)
+        >>> await fund.holdings()
+
+    """
+
+    async def holdings(self,
+                       holdingType:str="all",
+                       version:int=2,
+                       columns:list=None,
+                       typed:bool=False):
+        """
+        This function retrieves holdings of the funds.
+
+        Examples:
+            >>> await fund.holdings("equity")
+
+        """
+        self._check_holdings(holdingType, version, columns, typed)
+
+        position = await self.position(version=version)
+
+        return self._holdings_frame(position, holdingType, columns, typed)
+
+    async def getDocumentInformation(self,
+                                     marketId:str) -> dict:
+        """
+        This function retrieves the information of the documents, the request is sent in a thread.
+
+        Examples:
+            >>> await fund.getDocumentInformation("fr")
+
+        """
+        return await asyncio.to_thread(Funds.getDocumentInformation, self, marketId)
+
+    async def downloadDocument(self,
+                               marketId:str,
+                               documentType:str,
+                               languageId:str,
+                               folderPath:str=".") -> dict:
+        """
+        This function downloads documents, the download and the file are written in a thread.
+
+        Examples:
+            >>> await fund.downloadDocument("fr", "PRIIP KID", "en")
+
+        """
+        if not isinstance(marketId, str):
+            raise TypeError("marketId parameter should be a string")
+
+        if not isinstance(documentType, str):
+            raise TypeError("documentType parameter should be a string")
+
+        if not isinstance(languageId, str):
+            raise TypeError("languageId parameter should be a string")
+
+        docInfo = await self.getDocumentInformation(marketId)
+
+        return await asyncio.to_thread(self._download_document, docInfo, marketId,
+                                       documentType, languageId, folderPath)
+
+
+@_async_endpoints
+class AsyncStock(AsyncSecurity, Stock):
+    """
+    Asynchronous version of Stock, every endpoint method returns an awaitable.
+
+    Examples:
+        >>> stock = await AsyncStock.create("US0378331005", session=aio)
+        >>> await stock.historical(start_date, end_date)
+
+    """
+
+    async def financialStatement(self,
+                                 statement:str="summary",
+                                 period:str="annual",
+                                 reportType:str="original",
+                                 export:bool=False,
+                                 folderPath:str=".") -> dict:
+        """
+        This function retrieves the financial statement or downloads it as a xls file,
+        the file is written in a thread.
+
+        Examples:
+            >>> await stock.financialStatement('cashflow', 'annual', 'restated')
+
+        """
+        params, url_suffix = self._financial_statement_request(
+            statement, period, reportType, export, folderPath
+        )
+
+        response = await self.GetData("newfinancials", params=params, url_suffix=url_suffix)
+
+        if not export:
+            return response.json()
+
+        return await asyncio.to_thread(self._export_statement, response, url_suffix.split("/")[0], folderPath)
@@ -0,0 +1,341 @@
+"""module to cache the responses of the Morningstar APIs"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .transport import request_key
+
+
+# time to live in seconds of the responses by endpoint, an endpoint matches
+# a key whenever the key is a part of its path, example : feeLevel matches price/feeLevel/v1
+ENDPOINT_TTL = {
+    "people": 604800,
+    "investmentStrategy": 604800,
+    "feeLevel": 604800,
+    "parentSummary": 604800,
+}
+
+
+# time to live in seconds of the responses of the other endpoints
+DEFAULT_TTL = 3600
+
+
+class ResponseCache(ABC):
+    """
+    Abstract parent class of the caches of responses, the inherited classes store
+    the responses with the methods _load, _store and clear. The responses are kept
+    during the time to live of their endpoint and revalidated with their ETag or
+    Last-Modified header once expired, the counters of the cache are given by the method stats.
+
+    Args:
+        ttl (dict) : time to live in seconds by endpoint, merged with ENDPOINT_TTL,
+        0 disables the cache for an endpoint
+        default_ttl (float) : time to live in seconds of the other endpoints
+
+    Raises:
+        TypeError: raised whenever the parameter type is not the type expected
+
+    """
+
+    def __init__(self,
+                 ttl:dict=None,
+                 default_ttl:float=DEFAULT_TTL) -> None:
+
+        if ttl and not isinstance(ttl, dict):
+            raise TypeError("ttl parameter should be a dict")
+
+        if not isinstance(default_ttl, (int, float)):
+            raise TypeError("default_ttl parameter should be a number")
+
+        self.ttl = ENDPOINT_TTL | (ttl or {})
+        self.default_ttl = default_ttl
+        self._counters = {"hits": 0, "misses": 0, "revalidated": 0, "bytes_saved": 0}
+        self._counter_lock = threading.Lock()
+
+    def endpoint_ttl(self,
+                     endpoint:str) -> float:
+        """
+        This function returns the time to live of an endpoint,
+        the longest key of ttl which is a part of the path of the endpoint.
+
+        Args:
+            endpoint (str) : path of the endpoint, example : price/feeLevel/v1
+
+        Returns:
+            float time to live in seconds
+
+        Examples:
+            >>> MemoryCache().endpoint_ttl("people/proxyVoting/management")
+
+        """
+        path = f"/{endpoint.strip('/')}/"
+        keys = [key for key in self.ttl if f"/{key.strip('/')}/" in path]
+        if not keys:
+            return self.default_ttl
+        return self.ttl[max(keys, key=len)]
+
+    @staticmethod
+    def key(url:str,
+            params:dict=None,
+            headers:dict=None,
+            proxies:dict=None) -> str:
+        """
+        This function returns the key of a request in the cache, the responses to
+        requests with different headers or proxies are stored apart.
+        """
+        return request_key(url, params, headers, proxies)
+
+    def stats(self) -> dict:
+        """
+        This function returns the counters of the cache.
+
+        Returns:
+            dict with the number of hits, misses, revalidated responses and the bytes not downloaded
+
+        Examples:
+            >>> session.cache.stats()
+            {'hits': 12, 'misses': 4, 'revalidated': 1, 'bytes_saved': 48213}
+
+        """
+        with self._counter_lock:
+            return dict(self._counters)
+
+    def _count(self,
+               counter:str,
+               value:int=1) -> None:
+        with self._counter_lock:
+            self._counters[counter] += value
+
+    def request(self,
+                session:requests.Session,
+                endpoint:str,
+                url:str,
+                params:dict=None,
+                headers:dict=None,
+                **kwargs) -> requests.Response:
+        """
+        This function returns the cached response of a GET request if it is still valid,
+        revalidates an expired response with its validators and requests the API otherwise.
+
+        Args:
+            session (requests.Session) : session used for the request
+            endpoint (str) : path of the endpoint, used to find the time to live
+            url (str) : url of the request
+            params (dict) : parameters of the request
+            headers (dict) : headers of the request
+            kwargs : other arguments of session.get
+
+        Returns:
+            requests.Response
+
+        """
+        ttl = self.endpoint_ttl(endpoint)
+        if ttl <= 0:
+            return session.get(url, params=params, headers=headers, **kwargs)
+
+        key = self.key(url, params, headers, kwargs.get("proxies"))
+        entry = self._load(key)
+
+        if entry and entry["expires"] > time.time():
+            self._count("hits")
+            self._count("bytes_saved", len(entry["content"]))
+            return self._response(entry)
+
+        validators = {}
+        cached_headers = CaseInsensitiveDict(entry["headers"] if entry else {})
+        if cached_headers.get("ETag"):
+            validators["If-None-Match"] = cached_headers["ETag"]
+        if cached_headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = cached_headers["Last-Modified"]
+
+        response = session.get(url, params=params, headers=(headers or {}) | validators, **kwargs)
+
+        # the expired response is still valid
+        if response.status_code == 304 and entry:
+            entry["expires"] = time.time() + ttl
+            self._store(key, entry)
+            self._count("revalidated")
+            self._count("bytes_saved", len(entry["content"]))
+            return self._response(entry)
+
+        self._count("misses")
+        if response.status_code == 200:
+            self._store(key, {"url": response.url,
+                              "headers": dict(response.headers),
+                              "content": response.content,
+                              "expires": time.time() + ttl})
+        return response
+
+    @staticmethod
+    def _response(entry:dict) -> requests.Response:
+        """
+        This function rebuilds a response from an entry of the cache.
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = entry["url"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["content"]
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    @abstractmethod
+    def _load(self,
+              key:str) -> dict|None:
+        """
+        This function returns the entry of a key, None if the key is not in the cache.
+        """
+
+    @abstractmethod
+    def _store(self,
+               key:str,
+               entry:dict) -> None:
+        """
+        This function stores the entry of a key, it replaces the previous one.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        This function deletes all the responses of the cache.
+        """
+
+
+class MemoryCache(ResponseCache):
+    """
+    Cache of responses in memory, the least recently used responses are dropped
+    when the cache is full.
+
+    Args:
+        maxsize (int) : maximum number of responses
+        ttl (dict) : time to live in seconds by endpoint, merged with ENDPOINT_TTL
+        default_ttl (float) : time to live in seconds of the other endpoints
+
+    Examples:
+        >>> MemoryCache(maxsize=2048, ttl={"trailingReturn": 86400})
+
+    Raises:
+        TypeError: raised whenever the parameter type is not the type expected
+        ValueError : raised whenever maxsize is not positive
+
+    """
+
+    def __init__(self,
+                 maxsize:int=1024,
+                 ttl:dict=None,
+                 default_ttl:float=DEFAULT_TTL) -> None:
+
+        super().__init__(ttl, default_ttl)
+
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError("maxsize parameter should be a positive integer")
+
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self,
+              key:str) -> dict|None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return dict(entry)
+            return None
+
+    def _store(self,
+               key:str,
+               entry:dict) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(ResponseCache):
+    """
+    Cache of responses in a SQLite file, the responses are kept between sessions.
+
+    Args:
+        path (str) : path of the SQLite file
+        ttl (dict) : time to live in seconds by endpoint, merged with ENDPOINT_TTL
+        default_ttl (float) : time to live in seconds of the other endpoints
+
+    Examples:
+        >>> SQLiteCache("~/.mstarpy/cache.db")
+
+    Raises:
+        TypeError: raised whenever the parameter type is not the type expected
+
+    """
+
+    def __init__(self,
+                 path:str,
+                 ttl:dict=None,
+                 default_ttl:float=DEFAULT_TTL) -> None:
+
+        super().__init__(ttl, default_ttl)
+
+        if not isinstance(path, str):
+            raise TypeError("path parameter should be a string")
+
+        self.path = os.path.expanduser(path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._connection as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY, url TEXT, headers TEXT, content BLOB, expires REAL)"""
+            )
+
+    def _load(self,
+              key:str) -> dict|None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT url, headers, content, expires FROM responses WHERE key=?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        url, headers, content, expires = row
+        return {"url": url, "headers": json.loads(headers), "content": content, "expires": expires}
+
+    def _store(self,
+               key:str,
+               entry:dict) -> None:
+        with self._lock, self._connection as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, entry["url"], json.dumps(entry["headers"]), entry["content"], entry["expires"]),
+            )
+
+    def purge(self) -> None:
+        """
+        This function deletes the expired responses which cannot be revalidated.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, headers FROM responses WHERE expires <= ?", (time.time(),)
+            ).fetchall()
+            expired = [(key,) for key, headers in rows
+                       if not {"etag", "last-modified"} & {name.lower() for name in json.loads(headers)}]
+            with self._connection as conn:
+                conn.executemany("DELETE FROM responses WHERE key=?", expired)
+
+    def clear(self) -> None:
+        with self._lock, self._connection as conn:
+            conn.execute("DELETE FROM responses")
@@ -1,16 +1,74 @@
 """module to raise error"""
 import requests
 
+
+# status codes of the responses which may succeed if the request is sent again
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class ResponseError(ConnectionError):
+    """
+    Error raised whenever the API does not answer with the status 200.
+
+    Args:
+        message (str) : message of the error
+        url (str) : url of the request
+        status_code (int) : status code of the response
+        retryable (bool) : True if the request may succeed if it is sent again
+
+    """
+
+    def __init__(self,
+                 message:str,
+                 url:str=None,
+                 status_code:int=None,
+                 retryable:bool=False) -> None:
+        super().__init__(message)
+        self.url = url
+        self.status_code = status_code
+        self.retryable = retryable
+
+
+class RetryableResponseError(ResponseError):
+    """
+    Error raised whenever the API answers with a transient status, such as 429 or 503.
+    """
+
+    def __init__(self,
+                 message:str,
+                 url:str=None,
+                 status_code:int=None) -> None:
+        super().__init__(message, url, status_code, retryable=True)
+
+
+class FatalResponseError(ResponseError):
+    """
+    Error raised whenever the API answers with a status which will not change if
+    the request is sent again, such as 401 or 404.
+    """
+
+    def __init__(self,
+                 message:str,
+                 url:str=None,
+                 status_code:int=None) -> None:
+        super().__init__(message, url, status_code, retryable=False)
+
+
 def not_200_response(url:str, 
                      response:requests.models.Response) -> None:
     """
-    This function raise a ConnectionError
-    if the status code a requests is not 200.
+    This function raise a ResponseError, which is a ConnectionError,
+    if the status code a requests is not 200. The error is a RetryableResponseError
+    if the status is transient and a FatalResponseError otherwise.
     """
     if not response.status_code == 200:
-        raise ConnectionError(
+        error = (RetryableResponseError if response.status_code in RETRYABLE_STATUS
+                 else FatalResponseError)
+        raise error(
             f"""Error {response.status_code}
-            for the api {url}. Message : {response.reason}."""
+            for the api {url}. Message : {response.reason}.""",
+            url=url,
+            status_code=response.status_code,
         )
 
 
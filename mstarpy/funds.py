@@ -1,12 +1,25 @@
 """ class funds """
-import pandas as pd
+from __future__ import annotations
 import datetime
+import itertools
 import warnings
 import requests
 
+from .lazy import lazy_import
 from .security import Security
 from .utils import random_user_agent
 
+pd = lazy_import("pandas")
+
+
+# pages of the position of the funds by type of holdings
+HOLDING_PAGE = {
+    "all": ["equityHoldingPage", "boldHoldingPage", "otherHoldingPage"],
+    "bond": ["boldHoldingPage"],
+    "equity": ["equityHoldingPage"],
+    "other": ["otherHoldingPage"],
+}
+
 
 class Funds(Security):
     """
@@ -33,6 +46,9 @@ class Funds(Security):
 
     """
 
+    _default_asset_type = "fund"
+    _default_filters = {"investmentType" : ['FE', 'FO', 'FC', 'FV','FM']}
+
     def __init__(
         self,
         term:str,
@@ -47,7 +63,7 @@ class Funds(Security):
         session:requests.Session=None
     ) -> None:
         
-        fund_filter = {"investmentType" : ['FE', 'FO', 'FC', 'FV','FM']}
+        fund_filter = dict(self._default_filters)
         if filters:
             fund_filter = fund_filter | filters
         
@@ -271,6 +287,17 @@ class Funds(Security):
 
         docInfo = self.getDocumentInformation(marketId)
 
+        return self._download_document(docInfo, marketId, documentType, languageId, folderPath)
+
+    def _download_document(self,
+                           docInfo:dict,
+                           marketId:str,
+                           documentType:str,
+                           languageId:str,
+                           folderPath:str=".") -> dict:
+        """
+        This function finds a document in the documents information and downloads it.
+        """
         if "documents" not in docInfo["components"]:
             raise FileNotFoundError(f"There are no documents available for the {self.asset_type} {self.name} ({self.code})") 
         docFound = False
@@ -589,12 +616,17 @@ class Funds(Security):
 
     def holdings(self, 
                  holdingType: str = "all",
-                 version:int = 2) -> pd.DataFrame:
+                 version:int = 2,
+                 columns:list = None,
+                 typed:bool = False) -> pd.DataFrame:
         """
         This function retrieves holdings of the funds.
 
         Args:
             holdingType (str) : paramater to select the kind of holdings; all, bond, equity or other
+            version (int) : version of the api of holdings
+            columns (list) : columns to keep, all the columns are returned if not set
+            typed (bool) : if True, the columns are converted to the best possible dtypes
 
         Returns:
             pandas DataFrame holdings
@@ -607,33 +639,53 @@ class Funds(Security):
             >>> Funds("myria").holdings("bond")
             >>> Funds("myria").holdings("equity")
             >>> Funds("myria").holdings("other")
+            >>> Funds("myria").holdings(columns=["securityName", "isin", "weighting"], typed=True)
+
+        """
+        self._check_holdings(holdingType, version, columns, typed)
+
+        return self._holdings_frame(self.position(version=version), holdingType, columns, typed)
 
+    @staticmethod
+    def _check_holdings(holdingType:str,
+                        version:int,
+                        columns:list=None,
+                        typed:bool=False) -> None:
         """
-        holdingType_to_holdingPage = {
-            "all": "all",
-            "bond": "boldHoldingPage",
-            "equity": "equityHoldingPage",
-            "other": "otherHoldingPage",
-        }
-        if holdingType not in holdingType_to_holdingPage:
+        This function checks the parameters of holdings.
+        """
+        if holdingType not in HOLDING_PAGE:
             raise ValueError(
                 f"""parameter holdingType must take one of the following values
-                : {", ".join(holdingType_to_holdingPage.keys())}"""
+                : {", ".join(HOLDING_PAGE.keys())}"""
             )
         
         if not isinstance(version,int):
             raise TypeError("version paramater should be an integer")
 
-        if holdingType == "all":
-            return pd.DataFrame(
-                self.position(version=version)["equityHoldingPage"]["holdingList"]
-                + self.position(version=version)["boldHoldingPage"]["holdingList"]
-                + self.position(version=version)["otherHoldingPage"]["holdingList"]
-            )
-        else:
-            return pd.DataFrame(
-                self.position(version=version)[holdingType_to_holdingPage[holdingType]]["holdingList"]
-            )
+        if columns and not isinstance(columns, list):
+            raise TypeError("columns parameter should be a list")
+
+        if not isinstance(typed, bool):
+            raise TypeError("typed parameter should be a boolean")
+
+    @staticmethod
+    def _holdings_frame(position:dict,
+                        holdingType:str="all",
+                        columns:list=None,
+                        typed:bool=False) -> pd.DataFrame:
+        """
+        This function builds the DataFrame of holdings from the position of the funds,
+        the holding lists are read one after the other without being concatenated.
+        """
+        holding_lists = (position[holdingPage]["holdingList"]
+                         for holdingPage in HOLDING_PAGE[holdingType])
+
+        df = pd.DataFrame.from_records(itertools.chain.from_iterable(holding_lists),
+                                       columns=columns or None)
+        if typed:
+            df = df.convert_dtypes(convert_integer=False)
+        return df
 
     def investmentFee(self) -> dict:
         """
@@ -853,7 +905,8 @@ class Funds(Security):
     def nav(self, 
             start_date:datetime.datetime,
             end_date: datetime.datetime, 
-            frequency:str="daily") -> list[dict]:
+            frequency:str="daily",
+            output:str="records") -> list[dict]|pd.DataFrame|dict:
         """
         This function retrieves the NAV of the funds
 
@@ -861,9 +914,11 @@ class Funds(Security):
             start_date (datetime) : start date to get nav
             end_date (datetime) : end date to get nav
             frequency (str) : can be daily, weekly, monthly
+            output (str) : records for a list of dict, frame for a DataFrame indexed by date,
+            arrays for a dict of numpy arrays
 
         Returns:
-            list of dict with nav
+            list of dict with nav, DataFrame or dict of numpy arrays
 
             >>> Funds("myria").nav(datetime.datetime.today() 
             - datetime.timedelta(30),datetime.datetime.today())
@@ -879,6 +934,7 @@ class Funds(Security):
             start_date=start_date,
             end_date=end_date,
             frequency=frequency,
+            output=output,
         )
 
     def otherFee(self) -> dict:
@@ -0,0 +1,70 @@
+"""module to import the heavy dependencies only when they are used"""
+import importlib
+import threading
+
+
+# the imports of the lazy modules are made one at a time, a module being imported
+# by a thread is not visible to the other threads before it is fully executed
+_import_lock = threading.RLock()
+
+
+class LazyModule():
+    """
+    Proxy of a module imported on its first attribute access.
+
+    Args:
+        name (str) : name of the module
+
+    Examples:
+        >>> pd = LazyModule("pandas")
+        >>> pd.DataFrame()
+
+    """
+
+    def __init__(self,
+                 name:str) -> None:
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            with _import_lock:
+                module = self._module
+                if module is None:
+                    module = importlib.import_module(self._name)
+                    object.__setattr__(self, "_module", module)
+        return module
+
+    def __getattr__(self, attribute:str):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute:str, value) -> None:
+        setattr(self._load(), attribute, value)
+
+    def __dir__(self) -> list:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name:str) -> LazyModule:
+    """
+    This function returns a module which is imported on its first attribute access,
+    so importing mstarpy does not pay the import of pandas or numpy until they are used.
+    The import is made under a lock, the threads using the module at the same time
+    wait until it is fully imported.
+
+    Args:
+        name (str) : name of the module
+
+    Returns:
+        LazyModule proxy of the module
+
+    Examples:
+        >>> pd = lazy_import("pandas")
+
+    """
+    return LazyModule(name)
@@ -0,0 +1,264 @@
+"""module to page through the results of the screener of Morningstar"""
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import math
+
+from .lazy import lazy_import
+from .utils import LANGUAGE
+
+pd = lazy_import("pandas")
+
+
+# modes of iteration of the screener, a list of results per page or one result at a time
+SCREENER_MODE = ["page", "record"]
+
+
+# outputs of a screener scan, a DataFrame or an iterator of pages or of results
+SCAN_OUTPUT = ["frame"] + SCREENER_MODE
+
+
+# outputs of a screener request, the list of results or a DataFrame
+UNIVERSE_OUTPUT = ["records", "frame"]
+
+
+# ids of the meta of the results of the screener, always in the columns of a DataFrame
+META_COLUMNS = ["securityID", "performanceID", "fundID", "universe"]
+
+
+def _value(value):
+    """
+    This function returns the value of a field of a result of the screener.
+    """
+    return value.get("value") if isinstance(value, dict) else value
+
+
+def _column(values:list) -> pd.Series:
+    """
+    This function returns a column of a DataFrame whose dtype is inferred,
+    object if there is no value.
+    """
+    return pd.Series(values, dtype=None if values else object)
+
+
+def screener_frame(results:list,
+                   field:str|list=None,
+                   numeric:set=None) -> pd.DataFrame:
+    """
+    This function flattens the results of the screener, the ids of meta and
+    the value of every field become columns. The numeric fields are float64 columns,
+    with nan for the missing values.
+
+    Args:
+        results (list) : results of MorningstarSession.screener_universe
+        field (str|list) : fields of the columns, all the fields of the results if not set
+        numeric (set) : numeric fields, given by MorningstarSession.numeric_fields()
+
+    Returns:
+        DataFrame with one row per security
+
+    Examples:
+        >>> screener_frame(session.screener_universe("a", field=["name", "isin"]))
+        >>> screener_frame(results, ["isin", "ongoingCharge"], session.numeric_fields())
+
+    """
+    metas = [security.get("meta") or {} for security in results]
+    values = [security.get("fields") or {} for security in results]
+
+    fields = [field] if isinstance(field, str) and field else list(field or [])
+    if not fields:
+        fields = list(dict.fromkeys(name for fields_values in values for name in fields_values))
+
+    meta_columns = list(dict.fromkeys(META_COLUMNS + [name for meta in metas for name in meta]))
+    columns = {name: _column([meta.get(name) for meta in metas])
+               for name in meta_columns if name not in fields}
+
+    numeric = numeric or set()
+    for name in fields:
+        column = [_value(fields_values.get(name)) for fields_values in values]
+        if name in numeric:
+            columns[name] = pd.to_numeric(pd.Series(column, dtype=object),
+                                          errors="coerce").astype("float64")
+        else:
+            columns[name] = _column(column)
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(results)))
+
+
+class ScreenerIterator():
+    """
+    Iterator over all the results of a screener request, the pages are requested until
+    the results run out while the next pages are requested in the background. Once the
+    total number of results is known, up to workers pages are requested at the same time
+    and the pages are still yielded in order. The fields and the filters are checked once, the position of the next
+    result is given by the attribute cursor to resume an interrupted scan.
+
+    Args:
+        session (MorningstarSession) : session used for the requests
+        term (str): text to find a security can be a the name, part of a name or the isin
+        language (str): language of the request, default is "en-gb"
+        field (str | list) : field to find
+        filters (dict) : filter, use the method search_filter() to find the different possible filter keys
+        pageSize (int): number of securities per page
+        sortby (str) : sort by a field, keeps the order of the pages stable
+        ascending (bool) : True sort by ascending order, False sort by descending order
+        mode (str) : page to yield a list of results per page, record to yield one result at a time
+        prefetch (bool) : if True, the next pages are requested while the current one is consumed
+        workers (int) : maximum number of pages requested at the same time
+        cursor (dict) : position to resume from, the attribute cursor of a previous iterator
+        proxies (dict) : set the proxy if needed , example : {"http": "http://host:port","https": "https://host:port"}
+
+    Examples:
+        >>> for page in ScreenerIterator(session, "a", field=["isin", "name"], pageSize=500, sortby="isin"):
+        ...     print(len(page))
+        >>> iterator = session.screener_pages("a", field=["isin"], mode="record")
+        >>> next(iter(iterator)), iterator.cursor
+        >>> session.screener_pages("a", field=["isin"], mode="record", cursor=iterator.cursor)
+
+    Raises:
+        TypeError: raised whenever the parameter type is not the type expected
+        ValueError : raised whenever the parameter is not valid
+
+    """
+
+    def __init__(self,
+                 session,
+                 term:str,
+                 language:str="en-gb",
+                 field:str|list="",
+                 filters:dict=None,
+                 pageSize:int=500,
+                 sortby:str=None,
+                 ascending:bool=True,
+                 mode:str="page",
+                 prefetch:bool=True,
+                 workers:int=1,
+                 cursor:dict=None,
+                 proxies:dict=None) -> None:
+
+        if not isinstance(term, str):
+            raise TypeError("term parameter should be a string")
+
+        if not isinstance(language, str):
+            raise TypeError("language parameter should be a string")
+
+        if language not in LANGUAGE:
+            raise ValueError(
+                f"language parameter can only take one of the values : {', '.join(LANGUAGE)}"
+            )
+
+        if not isinstance(field, (str, list)):
+            raise TypeError("field parameter should be a string or a list")
+
+        if filters and not isinstance(filters, dict):
+            raise TypeError("filters parameter should be a dict")
+
+        if not isinstance(pageSize, int) or pageSize < 1:
+            raise ValueError("pageSize parameter should be a positive integer")
+
+        if sortby and not isinstance(sortby, str):
+            raise TypeError("sortby parameter should be a string")
+
+        if not isinstance(ascending, bool):
+            raise TypeError("ascending parameter should be a boolean")
+
+        if mode not in SCREENER_MODE:
+            raise ValueError(
+                f"mode parameter must take one of the following value : {', '.join(SCREENER_MODE)}"
+            )
+
+        if not isinstance(prefetch, bool):
+            raise TypeError("prefetch parameter should be a boolean")
+
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError("workers parameter should be a positive integer")
+
+        if cursor and not isinstance(cursor, dict):
+            raise TypeError("cursor parameter should be a dict")
+
+        if proxies and not isinstance(proxies, dict):
+            raise TypeError("proxies parameter should be dict")
+
+        self.session = session
+        self.language = language
+        self.pageSize = pageSize
+        self.sortby = sortby
+        self.ascending = ascending
+        self.mode = mode
+        self.prefetch = prefetch
+        self.workers = workers
+        self.proxies = proxies
+        self.fields = session._screener_fields(field, sortby)
+        self.query = f"_ ~= '{term}'" + session._screener_filters(filters)
+        self.cursor = {"page": 1, "index": 0} | (cursor or {})
+        self.total = None
+
+    def fetch(self,
+              page:int) -> list:
+        """
+        This function requests a page of the screener.
+
+        Args:
+            page (int) : page to request, starting at 1
+
+        Returns:
+            list of dict results of the page
+
+        """
+        params = self.session._screener_params(self.query, self.fields, page, self.pageSize,
+                                               self.sortby, self.ascending)
+        result = self.session.general_search(params, language=self.language, proxies=self.proxies)
+        if result.get("total") is not None:
+            self.total = result["total"]
+        return result.get("results") or []
+
+    def pages(self):
+        """
+        This function yields the pages of results in order from the page of the cursor.
+
+        Yields:
+            tuple (page, list of dict results of the page)
+
+        """
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        futures = deque()
+        next_page = self.cursor["page"]
+
+        def submit() -> None:
+            nonlocal next_page
+            futures.append((next_page, executor.submit(self.fetch, next_page)))
+            next_page += 1
+
+        try:
+            submit()
+            while futures:
+                page, future = futures.popleft()
+                results = future.result()
+                last_page = math.ceil(self.total / self.pageSize) if self.total is not None else None
+                last = len(results) < self.pageSize or (last_page is not None and page >= last_page)
+                if not last and self.prefetch:
+                    # the pages after the next one are requested once the total is known
+                    ahead = self.workers if last_page is not None else 1
+                    while len(futures) < ahead and (last_page is None or next_page <= last_page):
+                        submit()
+                yield page, results
+                if last:
+                    return
+                if not futures:
+                    submit()
+        finally:
+            # a scan stopped by the consumer does not wait for the pages requested in advance
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def __iter__(self):
+        for page, results in self.pages():
+            index = self.cursor["index"] if page == self.cursor["page"] else 0
+            if self.mode == "page":
+                self.cursor = {"page": page + 1, "index": 0}
+                if results[index:]:
+                    yield results[index:]
+                continue
+
+            for i in range(index, len(results)):
+                self.cursor = {"page": page, "index": i + 1}
+                yield results[i]
+            self.cursor = {"page": page + 1, "index": 0}
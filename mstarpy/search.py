@@ -1,34 +1,298 @@
+from __future__ import annotations
+import base64
+import datetime
+import json
 import os
 import requests
 import re
 import warnings
-import pandas as pd
+import threading
 
-from .utils import random_user_agent, get_webdriver
-from .utils import ASSET_TYPE, FILTER_TYPE, LANGUAGE
+from .utils import browser_pool, cookies_set, random_user_agent, resource_loaded, wait_until_ready
+from .utils import ASSET_TYPE, FILTER_TYPE, LANGUAGE, WAF_COOKIES
+from .cache import MemoryCache, ResponseCache, SQLiteCache
 from .error import not_200_response
+from .lazy import lazy_import
+from .screener import SCAN_OUTPUT, UNIVERSE_OUTPUT, ScreenerIterator, screener_frame
+from .session_store import SessionStore
+from .timeseries import (
+    TIMESERIES_URL,
+    check_output,
+    estimate_points,
+    frequency_codes,
+    series_output,
+    time_series_params,
+    )
+from .timeseries_store import TimeSeriesStore
+from .transport import (
+    DEFAULT_TIMEOUT,
+    TIMEOUT,
+    RateLimiter,
+    RetryPolicy,
+    SingleFlight,
+    mount_pools,
+    request_key,
+    request_timeout,
+    )
 import time
 
+pd = lazy_import("pandas")
+
+
+# page of morningstar.com where the bearer token of the chart API is found
+CHART_URL = "https://www.morningstar.com/funds/xnas/afozx/chart"
+
+
+# lifetime in seconds of a chart token without expiry
+CHART_TOKEN_TTL = 3600
+
+
+# the chart token is scraped again when it expires within CHART_TOKEN_MARGIN seconds
+CHART_TOKEN_MARGIN = 300
+
+
+# positional arguments of requests.Session.request after the method and the url
+REQUEST_ARGUMENTS = ["params", "data", "headers", "cookies", "files", "auth", "timeout",
+                     "allow_redirects", "proxies", "hooks", "stream", "verify", "cert", "json"]
+
+
+# ids of the meta of the results of the screener
+META_ID = ["securityID", "performanceID", "fundID"]
+
+
+# urls of the catalogues of the screener
+CATALOGUE_URL = {
+    "fields": "https://global.morningstar.com/api/v1/fr/stores/data-points/fields",
+    "filters": "https://global.morningstar.com/api/v1/fr/stores/filters",
+}
+
+
+def _find_token(all_text:str) -> str|None:
+    """
+    This function finds the bearer token in the html of a chart page of morningstar.com.
+    """
+    if all_text.find("token") == -1:
+        return None
+
+    token_start = all_text[all_text.find("token") :]
+    return token_start[7 : token_start.find("}") - 1]
+
+
+def _token_expiry(token:str) -> float|None:
+    """
+    This function reads the expiry of a JWT bearer token.
+
+    Returns:
+        float timestamp of expiry, None if the token has no expiry
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _catalogue_names(name:str,
+                     results:list) -> set:
+    """
+    This function returns the set of valid names of a screener catalogue.
+    """
+    if name == "fields":
+        return {f["field"] for f in results}
+    names = {"investmentType", "countriesOfSale"}
+    for security_type in results:
+        for filters in security_type["filters"]:
+            names.update(child["field"] for child in filters["children"])
+    return names
+
 
 class MorningstarSession(requests.Session):
-    def __init__(self):
+    """
+    Session to request the Morningstar APIs, the cookies granting access
+    are retrieved with a browser.
+
+    Args:
+        session_file (str) : path of a file where the cookies, user agent and chart token
+        are stored and reused until they expire, default is the environment variable
+        MSTARPY_SESSION_FILE, no file is used if not set
+        session_ttl (float) : maximum age in seconds of the stored session, default is
+        the environment variable MSTARPY_SESSION_TTL or 21600
+        pool_sizes (dict) : number of keep-alive connections per host, the hosts are
+        api-global, global, lt, us-api and www, example : {"api-global": 50}
+        catalogue_ttl (float) : time in seconds during which the screener fields and filters
+        are reused without being requested again, default is the environment variable
+        MSTARPY_CATALOGUE_TTL or 86400
+        catalogue_file (str) : path of a json snapshot of the screener fields and filters,
+        default is the environment variable MSTARPY_CATALOGUE_FILE, no snapshot if not set
+        timeseries_store (str|TimeSeriesStore) : path of a SQLite file where the time series are stored,
+        only the dates missing in the store are requested, default is the environment variable
+        MSTARPY_TIMESERIES_STORE, no store if not set
+        cache (str|ResponseCache) : cache of the responses of GetData and ltData, "memory" for
+        a MemoryCache, a path for a SQLiteCache, default is the environment variable MSTARPY_CACHE,
+        no cache if not set
+        rate_limits (dict) : requests per second, burst and maximum number of requests in flight per host,
+        example : {"api-global": {"rate": 50.0, "burst": 100, "concurrency": 40}}, the missing limits
+        are the ones of RATE_LIMIT, the number of requests in flight is halved when the host throttles
+        the session and increases back on success, default is no limit
+        retry (RetryPolicy) : policy of retry of the requests which fail with a transient status or
+        a connection error, default retries 3 times or the environment variable MSTARPY_RETRIES
+        connect_timeout (float) : time in seconds to connect to a host, default is the environment
+        variable MSTARPY_CONNECT_TIMEOUT or 5
+        read_timeout (float) : time in seconds to wait for data from a host, default is the environment
+        variable MSTARPY_READ_TIMEOUT or 30
+        timeouts (dict) : connect and read timeouts by endpoint, the keys are hosts or parts of the url,
+        example : {"us-api": (5, 120), "stores/realtime": (5, 60)}
+
+    Examples:
+        >>> MorningstarSession()
+        >>> MorningstarSession(session_file="~/.mstarpy/session.json")
+        >>> MorningstarSession(pool_sizes={"api-global": 50, "us-api": 50})
+        >>> MorningstarSession(timeseries_store="~/.mstarpy/timeseries.db")
+        >>> MorningstarSession(cache=MemoryCache(ttl={"trailingReturn": 86400}))
+
+    """
+    def __init__(self,
+                 session_file:str=None,
+                 session_ttl:float=None,
+                 pool_sizes:dict=None,
+                 catalogue_ttl:float=None,
+                 catalogue_file:str=None,
+                 timeseries_store:str|TimeSeriesStore=None,
+                 cache:str|ResponseCache=None,
+                 rate_limits:dict=None,
+                 retry:RetryPolicy=None,
+                 connect_timeout:float=None,
+                 read_timeout:float=None,
+                 timeouts:dict=None):
         super().__init__()
-        self._init_browser_session()
 
-    def _init_browser_session(self):
+        if session_file and not isinstance(session_file, str):
+            raise TypeError("session_file parameter should be a string")
+
+        if session_ttl and not isinstance(session_ttl, (int, float)):
+            raise TypeError("session_ttl parameter should be a number")
+
+        if catalogue_ttl and not isinstance(catalogue_ttl, (int, float)):
+            raise TypeError("catalogue_ttl parameter should be a number")
+
+        if catalogue_file and not isinstance(catalogue_file, str):
+            raise TypeError("catalogue_file parameter should be a string")
+
+        if timeseries_store and not isinstance(timeseries_store, (str, TimeSeriesStore)):
+            raise TypeError("timeseries_store parameter should be a string or a TimeSeriesStore")
+
+        if cache and not isinstance(cache, (str, ResponseCache)):
+            raise TypeError("cache parameter should be a string or a ResponseCache")
+
+        if retry and not isinstance(retry, RetryPolicy):
+            raise TypeError("retry parameter should be a RetryPolicy")
+
+        if connect_timeout and not isinstance(connect_timeout, (int, float)):
+            raise TypeError("connect_timeout parameter should be a number")
+
+        if read_timeout and not isinstance(read_timeout, (int, float)):
+            raise TypeError("read_timeout parameter should be a number")
+
+        if timeouts and not isinstance(timeouts, dict):
+            raise TypeError("timeouts parameter should be a dict")
+
+        session_file = session_file or os.environ.get("MSTARPY_SESSION_FILE")
+        session_ttl = session_ttl or float(os.environ.get("MSTARPY_SESSION_TTL", 21600))
+
+        mount_pools(self, pool_sizes)
+        self._flights = SingleFlight()
+        self._refresh_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._bootstrap_metrics = {"count": 0,
+                                   "timeouts": 0,
+                                   "total_seconds": 0.0,
+                                   "max_seconds": 0.0,
+                                   "last": None}
+        self.limiter = RateLimiter(rate_limits)
+        self.retry = retry or RetryPolicy(total=int(os.environ.get("MSTARPY_RETRIES", 3)))
+
+        self.timeout = (
+            connect_timeout or float(os.environ.get("MSTARPY_CONNECT_TIMEOUT", DEFAULT_TIMEOUT[0])),
+            read_timeout or float(os.environ.get("MSTARPY_READ_TIMEOUT", DEFAULT_TIMEOUT[1])),
+        )
+        self.timeouts = TIMEOUT | (timeouts or {})
+
+        self.store = SessionStore(session_file, ttl=session_ttl) if session_file else None
+        self.chart_token = None
+        self.chart_token_expiry = None
+        self._token_lock = threading.Lock()
+
+        self.catalogue_ttl = catalogue_ttl or float(os.environ.get("MSTARPY_CATALOGUE_TTL", 86400))
+        catalogue_file = catalogue_file or os.environ.get("MSTARPY_CATALOGUE_FILE")
+        self.catalogue_file = os.path.expanduser(catalogue_file) if catalogue_file else None
+        self._catalogues = None
+        self._catalogue_lock = threading.Lock()
+
+        timeseries_store = timeseries_store or os.environ.get("MSTARPY_TIMESERIES_STORE")
+        if isinstance(timeseries_store, str):
+            timeseries_store = TimeSeriesStore(timeseries_store)
+        self.timeseries_store = timeseries_store
+
+        cache = cache or os.environ.get("MSTARPY_CACHE")
+        if cache == "memory":
+            cache = MemoryCache()
+        elif isinstance(cache, str):
+            cache = SQLiteCache(cache)
+        self.cache = cache
+
+        if not self._load_session_store():
+            self._init_browser_session()
 
-        with get_webdriver() as driver:
-            driver.get("https://global.morningstar.com")
-            time.sleep(float(os.environ.get("SELENIUM_DRIVER_WAIT_TIME", 8)))
+    def _load_session_store(self) -> bool:
+        """
+        This function restores the cookies, user agent and chart token from the session store.
 
-            cookies = driver.get_cookies()
-            user_agent = driver.execute_script("return navigator.userAgent")
+        Returns:
+            bool True if a valid session was restored
+        """
+        if self.store is None:
+            return False
+
+        state = self.store.load()
+        if state is None:
+            return False
 
+        self._set_session_state(state["cookies"], state["user_agent"])
+        self.expires = state["expires"]
+        if state.get("chart_token"):
+            self._set_chart_token(state["chart_token"], state.get("chart_token_expiry"))
+        return True
+
+    def _save_session_store(self) -> None:
+        """
+        This function writes the current cookies, user agent and chart token in the session store.
+        """
+        if self.store is None:
+            return
+
+        self.store.save({
+            "cookies": self._cookies,
+            "user_agent": self.headers["User-Agent"],
+            "expires": self.expires,
+            "chart_token": self.chart_token,
+            "chart_token_expiry": self.chart_token_expiry,
+        })
+
+    def _set_session_state(self,
+                           cookies:list[dict],
+                           user_agent:str) -> None:
+        """
+        This function sets the cookies and the headers of the session.
+        """
         self.cookies.clear()
 
         for c in cookies:
             self.cookies.set(c["name"], c["value"])
 
+        self._cookies = cookies
+
         self.headers.update({
             "User-Agent": user_agent,
             "Accept": "application/json, text/plain, */*",
@@ -36,26 +300,283 @@ class MorningstarSession(requests.Session):
             "Origin": "https://global.morningstar.com"
         })
 
+    def _init_browser_session(self):
+
+        start = time.monotonic()
+        with browser_pool().browser() as driver:
+            started = time.monotonic()
+            driver.get("https://global.morningstar.com")
+            loaded = time.monotonic()
+            # the cookies are read as soon as the page is ready, at most after SELENIUM_DRIVER_WAIT_TIME
+            condition = wait_until_ready(driver,
+                                         self._bootstrap_conditions(),
+                                         float(os.environ.get("SELENIUM_DRIVER_WAIT_TIME", 8)))
+            ready = time.monotonic()
+
+            cookies = driver.get_cookies()
+            user_agent = driver.execute_script("return navigator.userAgent")
+
+        self._record_bootstrap({"browser": started - start,
+                                "load": loaded - started,
+                                "ready": ready - loaded,
+                                "total": time.monotonic() - start,
+                                "condition": condition})
+
+        self._set_session_state(cookies, user_agent)
+
+        self.expires = self.store.expiry(cookies, WAF_COOKIES) if self.store else None
+        self._save_session_store()
+
+    @staticmethod
+    def _bootstrap_conditions() -> dict:
+        """
+        This function returns the conditions which mean that the cookies of the browser are ready,
+        the WAF cookies are set or the request whose url contains the environment variable
+        MSTARPY_BOOTSTRAP_RESOURCE has completed.
+        """
+        conditions = {"cookies": cookies_set(WAF_COOKIES)}
+        resource = os.environ.get("MSTARPY_BOOTSTRAP_RESOURCE")
+        if resource:
+            conditions["resource"] = resource_loaded(resource)
+        return conditions
+
+    def _record_bootstrap(self,
+                          timings:dict) -> None:
+        """
+        This function adds the timings of a cookie bootstrap to the metrics of the session.
+        """
+        with self._metrics_lock:
+            metrics = self._bootstrap_metrics
+            metrics["count"] += 1
+            metrics["timeouts"] += timings["condition"] is None
+            metrics["total_seconds"] += timings["total"]
+            metrics["max_seconds"] = max(metrics["max_seconds"], timings["total"])
+            metrics["last"] = {key: round(value, 3) if isinstance(value, float) else value
+                               for key, value in timings.items()}
+
+    def bootstrap_stats(self) -> dict:
+        """
+        This function returns the metrics of the cookie bootstraps of the session with the browser.
+
+        Returns:
+            dict with the number of bootstraps, the number of them which reached SELENIUM_DRIVER_WAIT_TIME,
+            their total and maximum durations and the timings in seconds of the last one
+
+        Examples:
+            >>> MorningstarSession().bootstrap_stats()
+            {'count': 1, 'timeouts': 0, 'total_seconds': 1.93, 'max_seconds': 1.93,
+            'last': {'browser': 1.2, 'load': 0.52, 'ready': 0.21, 'total': 1.93, 'condition': 'cookies'}}
+
+        """
+        with self._metrics_lock:
+            return self._bootstrap_metrics | {"last": dict(self._bootstrap_metrics["last"] or {})}
+
     def request(self, method, url, *args, **kwargs):
 
-        r = super().request(method, url, *args, **kwargs)
+        # the timeouts of the session or of the endpoint if not given for the request
+        if kwargs.get("timeout") is None and len(args) < 7:
+            kwargs["timeout"] = self.request_timeout(url)
+
+        # identical GET requests sent at the same time share the same response,
+        # the requests with a body, cookies or authentication are always sent
+        arguments = dict(zip(REQUEST_ARGUMENTS, args)) | kwargs
+        if (method.upper() == "GET" and not arguments.get("stream")
+                and not any(arguments.get(name) for name in ("data", "cookies", "files", "auth", "json"))):
+            key = request_key(url, arguments.get("params"), arguments.get("headers"), arguments.get("proxies"))
+            return self._flights.do(key, lambda: self._send(method, url, *args, **kwargs))
+
+        return self._send(method, url, *args, **kwargs)
+
+    def _send(self, method, url, *args, **kwargs):
+
+        attempt = 0
+        while True:
+            r, error = None, None
+            try:
+                r = self._attempt(method, url, *args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+
+            delay = self.retry.delay(url, method, attempt, r, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return r
+
+            time.sleep(delay)
+            attempt += 1
+
+    def _attempt(self, method, url, *args, **kwargs):
+
+        cookies = self.cookies.get_dict()
+        r = self._limited_request(method, url, *args, **kwargs)
 
         # Detect WAF challenge
         if r.status_code == 202 or r.headers.get("x-amzn-waf-action") == "challenge":
 
+            self._refresh_cookies(cookies)
+
+            r = self._limited_request(method, url, *args, **kwargs)
+
+        return r
+
+    def _refresh_cookies(self,
+                         cookies:dict) -> None:
+        """
+        This function refreshes the cookies with the browser, only one refresh runs at a time,
+        the threads waiting for it reuse its cookies instead of refreshing them again.
+
+        Args:
+            cookies (dict) : cookies sent with the challenged request
+        """
+        with self._refresh_lock:
+            if self.cookies.get_dict() != cookies:
+                return
+
             print("⚠️ WAF challenge detected → refreshing cookies")
 
             self._init_browser_session()
 
-            r = super().request(method, url, *args, **kwargs)
+    def _limited_request(self, method, url, *args, **kwargs):
+        """
+        This function sends a request within the rate and concurrency limits of its host.
+        """
+        limiter = self.limiter.host(url)
+        if limiter is None:
+            return super().request(method, url, *args, **kwargs)
+
+        limiter.acquire()
+        response = None
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        finally:
+            limiter.release(response)
+        return response
+
+    def request_timeout(self,
+                        url:str) -> tuple:
+        """
+        This function returns the connect and read timeouts of a request of the session.
 
-        return r
+        Args:
+            url (str) : url of the request
+
+        Returns:
+            tuple connect timeout, read timeout
+
+        """
+        return request_timeout(url, self.timeouts, self.timeout)
+
+    def transport_stats(self) -> dict:
+        """
+        This function returns the state of the transport of the session.
+
+        Returns:
+            dict with the limits and current rate per limited host, the number of coalesced requests,
+            the number of retries and the retry budget left per host
+
+        Examples:
+            >>> MorningstarSession(rate_limits={"api-global": {}}).transport_stats()
+            {'hosts': {'api-global': {'rate': 20.0, 'burst': 40, 'concurrency': 20, 'max_concurrency': 20,
+            'in_flight': 0, 'tokens': 38.0, 'current_rate': 0.2, 'requests': 2, 'throttled': 0}, ...},
+            'coalesced': 0, 'retries': 0, 'budget': {'api-global.morningstar.com': 10.4}}
+
+        """
+        return {"hosts": self.limiter.stats(),
+                "coalesced": self._flights.coalesced} | self.retry.stats()
+
+    def _load_catalogue_file(self) -> dict:
+        """
+        This function reads the snapshot of the screener catalogues.
+
+        Returns:
+            dict catalogue name to timestamp and results
+        """
+        if not self.catalogue_file:
+            return {}
+        try:
+            with open(self.catalogue_file, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(snapshot, dict):
+            return {}
+        return {name: entry for name, entry in snapshot.items() if name in CATALOGUE_URL}
+
+    def _save_catalogue_file(self) -> None:
+        """
+        This function writes the snapshot of the screener catalogues.
+        """
+        if not self.catalogue_file:
+            return
+        folder = os.path.dirname(os.path.abspath(self.catalogue_file))
+        os.makedirs(folder, exist_ok=True)
+        snapshot = {name: {"timestamp": entry["timestamp"], "results": entry["results"]}
+                    for name, entry in self._catalogues.items()}
+        tmp_path = f"{self.catalogue_file}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.catalogue_file)
+
+    def _catalogue(self,
+                   name:str,
+                   timeout:float|tuple=None) -> dict:
+        """
+        This function retrieves a screener catalogue, fields or filters,
+        it is requested again only when older than catalogue_ttl.
+
+        Args:
+            name (str) : fields or filters
+            timeout (float|tuple) : timeout in seconds or (connect, read) timeouts of the request,
+            default is the timeout of the session for the endpoint
+
+        Returns:
+            dict with the timestamp, the results of the API and the set of valid names
+        """
+        with self._catalogue_lock:
+            if self._catalogues is None:
+                self._catalogues = self._load_catalogue_file()
+
+            entry = self._catalogues.get(name)
+            if entry and time.time() - entry["timestamp"] < self.catalogue_ttl:
+                if "names" not in entry:
+                    entry["names"] = _catalogue_names(name, entry["results"])
+                return entry
+
+            url = CATALOGUE_URL[name]
+            response = self.get(url, timeout=timeout)
+            not_200_response(url, response)
+            if "results" not in response.json():
+                raise ValueError(f"No results found for the screener {name}")
+
+            results = response.json()["results"]
+            entry = {"timestamp": time.time(),
+                     "results": results,
+                     "names": _catalogue_names(name, results)}
+            self._catalogues[name] = entry
+            self._save_catalogue_file()
+            return entry
+
+    def clear_catalogue(self) -> None:
+        """
+        This function empties the cache of the screener fields and filters,
+        they will be requested again on the next call.
+
+        Examples:
+            >>> MorningstarSession().clear_catalogue()
+
+        """
+        with self._catalogue_lock:
+            self._catalogues = {}
+            if self.catalogue_file and os.path.exists(self.catalogue_file):
+                os.remove(self.catalogue_file)
 
     def general_search(
                     self,
                     params:dict,
                     language:str="en-gb", 
-                    proxies:dict=None) -> dict:
+                    proxies:dict=None,
+                    timeout:float|tuple=None) -> dict:
         """
         This function will use the screener of morningstar.com
         to find informations about funds or classification
@@ -65,6 +586,8 @@ class MorningstarSession(requests.Session):
         language (str) : language of the request, default is "en-gb"
         proxies (dict) : set the proxy if needed,
         example : {"http": "http://host:port","https": "https://host:port"}
+        timeout (float|tuple) : timeout in seconds or (connect, read) timeouts of the request,
+        default is the timeout of the session for the endpoint
 
         Returns:
         dict of information
@@ -97,7 +620,7 @@ class MorningstarSession(requests.Session):
             "user-agent": random_user_agent(),
         }
 
-        response = self.get(url, params=params, proxies=proxies)
+        response = self.get(url, params=params, proxies=proxies, timeout=timeout)
 
         not_200_response(url, response)
 
@@ -113,8 +636,10 @@ class MorningstarSession(requests.Session):
         page:int=1,
         sortby:str=None,
         ascending:bool=True,
-        proxies:dict=None
-        ) -> list:
+        proxies:dict=None,
+        output:str="records",
+        timeout:float|tuple=None
+        ) -> list|pd.DataFrame:
         """
         This function will use the screener of global.morningstar.com
         to find funds, etf, stocks which include the term.
@@ -130,9 +655,13 @@ class MorningstarSession(requests.Session):
         sortby (str) : sort by a field
         ascending (bool) : True sort by ascending order, False sort by descending order
         proxies (dict) : set the proxy if needed , example : {"http": "http://host:port","https": "https://host:port"}
+        output (str) : records for the list of dict, frame for a DataFrame with one column
+        per field and the ids of meta, the numeric fields are float64 columns
+        timeout (float|tuple) : timeout in seconds or (connect, read) timeouts of each request,
+        default is the timeout of the session for the endpoint
 
         Returns:
-        list of dict with secrity information
+        list of dict with secrity information or DataFrame
             [{'meta': {'securityID': 'F00000MRIF', 'performanceID': '0P0000TUB0', 'fundID': 
             'FS00008MVC', 'masterPortfolioID': '2852260', 'universe': 'FO'}, 
             'fields': {'isin': {'value': 'FR0010921445'}, 
@@ -149,6 +678,7 @@ class MorningstarSession(requests.Session):
         Examples:
         >>> screener_universe("myria",field=["isin", "name"],pageSize=10,page=1, sortby="name", ascending=False)
         >>> screener_universe("US67066G1040", language="de")
+        >>> screener_universe("a", field=["isin", "name", "ongoingCharge"], pageSize=500, output="frame")
 
         """
         if not isinstance(term, str):
@@ -184,7 +714,43 @@ class MorningstarSession(requests.Session):
                 f"language parameter can only take one of the values : {', '.join(LANGUAGE)}"
             )
 
-        all_fields = self.search_field(display_print=False)
+        if output not in UNIVERSE_OUTPUT:
+            raise ValueError(
+                f"output parameter must take one of the following value : {', '.join(UNIVERSE_OUTPUT)}"
+            )
+
+        fields = self._screener_fields(field, sortby, timeout=timeout)
+
+        query_params = f"_ ~= '{term}'" + self._screener_filters(filters, timeout=timeout)
+
+        params = self._screener_params(query_params, fields, page, pageSize, sortby, ascending)
+
+        result = self.general_search(params, 
+                                language=language,
+                                proxies=proxies,
+                                timeout=timeout)
+
+        if not "results" in result:
+            print(f"0 fund found whith the term {term}")
+            if output == "frame":
+                return screener_frame([], field, self.numeric_fields(timeout=timeout))
+            return {}
+
+        if output == "frame":
+            return screener_frame(result["results"], field, self.numeric_fields(timeout=timeout))
+        return result["results"]
+
+    def _screener_fields(self,
+                         field:str|list,
+                         sortby:str=None,
+                         timeout:float|tuple=None) -> str:
+        """
+        This function checks the fields and the sort field of a screener request.
+
+        Returns:
+            str fields of the request
+        """
+        all_fields = self._catalogue("fields", timeout)["names"]
         if not field:
             check_field = True
             fields = field
@@ -192,27 +758,37 @@ class MorningstarSession(requests.Session):
             check_field = field in all_fields
             fields = field
         else:
-            check_field = set(field).issubset(set(all_fields))
+            check_field = set(field).issubset(all_fields)
             fields = ",".join(field)
 
         if sortby and sortby not in all_fields:
             raise ValueError(
                 f"""The sort field {sortby} is not a valid field.
                 You can find the possible fields with the method search_field().
-                Possible fields are : {', '.join(all_fields)}"""
+                Possible fields are : {', '.join(sorted(all_fields))}"""
             )
 
         if not check_field:
             raise ValueError(
                 f"""The field {field} is not a valid field.
                 You can find the possible fields with the method search_field().
-                Possible fields are : {', '.join(all_fields)}"""
+                Possible fields are : {', '.join(sorted(all_fields))}"""
             )
-        
-        query_params = f"_ ~= '{term}'"
+        return fields
+
+    def _screener_filters(self,
+                          filters:dict=None,
+                          timeout:float|tuple=None) -> str:
+        """
+        This function converts the filters of a screener request into query conditions.
+
+        Returns:
+            str conditions to add to the query
+        """
+        query_params = ""
 
         if filters:
-            list_filter = self.search_filter()
+            list_filter = self._catalogue("filters", timeout)["names"]
             for f in filters:
                 if f not in list_filter:
                     warnings.warn(
@@ -241,8 +817,20 @@ class MorningstarSession(requests.Session):
                     # else = condition
                     else:
                         query_params += f" AND {f} = '{filters[f]}'"
+        return query_params
+
+    @staticmethod
+    def _screener_params(query:str,
+                         fields:str,
+                         page:int,
+                         pageSize:int,
+                         sortby:str=None,
+                         ascending:bool=True) -> dict:
+        """
+        This function builds the parameters of a screener request.
+        """
         params = {
-            "query": query_params,
+            "query": query,
             "fields" : fields,
             "page" : page,
             "limit": pageSize,
@@ -252,30 +840,283 @@ class MorningstarSession(requests.Session):
                 params["sort"] = f"{sortby}:asc"
             else:
                 params["sort"] = f"{sortby}:desc"
+        return params
 
+    def resolve_securities(
+        self,
+        terms:list,
+        by:str="isin",
+        language:str="en-gb",
+        field:list=None,
+        filters:dict=None,
+        chunkSize:int=100,
+        pageSize:int=500,
+        proxies:dict=None
+        ) -> dict:
+        """
+        This function finds many securities with a few requests to the screener
+        of global.morningstar.com, the terms are grouped in IN conditions.
 
-        
+        Args:
+        terms (list) : isin or ids of the securities
+        by (str) : field matched with the terms, can be isin or one of the ids securityID, performanceID, fundID
+        language (str): language of the request, default is "en-gb"
+        field (list) : fields to return, default is isin and name
+        filters (dict) : filter, use the method search_filter() to find the different possible filter keys
+        chunkSize (int) : number of terms per request
+        pageSize (int) : number of securities per page of a request
+        proxies (dict) : set the proxy if needed , example : {"http": "http://host:port","https": "https://host:port"}
 
-        result = self.general_search(params, 
-                                language=language,
-                                proxies=proxies)
+        Returns:
+        dict with the term as key and the first security found as value, 
+        the terms not found are not in the dict
+            {'FR0010921445': {'meta': {'securityID': 'F00000MRIF', 'performanceID': '0P0000TUB0', 
+            'fundID': 'FS00008MVC', 'masterPortfolioID': '2852260', 'universe': 'FO'}, 
+            'fields': {'isin': {'value': 'FR0010921445'}, 
+            'name': {'value': 'Abeille Capital Planète'}}}}
 
-        if not "results" in result:
-            print(f"0 fund found whith the term {term}")
-            return {}
-        
-        return result["results"]
+        Examples:
+        >>> resolve_securities(["FR0010921445", "US67066G1040"])
+        >>> resolve_securities(["F00000MRIF"], by="securityID", chunkSize=200)
+
+        """
+        if not isinstance(terms, list):
+            raise TypeError("terms parameter should be a list")
+
+        if not all(isinstance(term, str) for term in terms):
+            raise TypeError("terms parameter should be a list of strings")
+
+        if not isinstance(by, str):
+            raise TypeError("by parameter should be a string")
+
+        if field and not isinstance(field, list):
+            raise TypeError("field parameter should be a list")
+
+        if filters and not isinstance(filters, dict):
+            raise TypeError("filters parameter should be a dict")
+
+        if not isinstance(chunkSize, int) or chunkSize < 1:
+            raise ValueError("chunkSize parameter should be a positive integer")
+
+        if not isinstance(pageSize, int) or pageSize < 1:
+            raise ValueError("pageSize parameter should be a positive integer")
+
+        if by not in META_ID and by not in self._catalogue("fields")["names"]:
+            raise ValueError(
+                f"by parameter should be one of {', '.join(META_ID)} or a field of the screener"
+            )
+
+        field = list(dict.fromkeys((field or ["isin", "name"]) + ([] if by in META_ID else [by])))
+        fields = self._screener_fields(field)
+        query_filters = self._screener_filters(filters)
+
+        # terms are matched without case
+        wanted = {}
+        for term in terms:
+            wanted.setdefault(term.upper(), []).append(term)
+        keys = list(wanted)
+
+        found = {}
+        for i in range(0, len(keys), chunkSize):
+            chunk = [wanted[key][0] for key in keys[i:i + chunkSize]]
+            query = f"""{by} IN ({','.join(f"'{x}'" for x in chunk)})""" + query_filters
+            page = 1
+            while True:
+                params = self._screener_params(query, fields, page, pageSize)
+                result = self.general_search(params, language=language, proxies=proxies)
+                results = result.get("results", [])
+                for security in results:
+                    if by in META_ID:
+                        value = security["meta"].get(by)
+                    else:
+                        value = security["fields"].get(by, {}).get("value")
+                    if not isinstance(value, str):
+                        continue
+                    for term in wanted.get(value.upper(), []):
+                        found.setdefault(term, security)
+                if len(results) < pageSize:
+                    break
+                page += 1
+
+        return found
+
+    def screener_pages(
+        self,
+        term:str,
+        language:str="en-gb",
+        field:str|list="",
+        filters:dict=None,
+        pageSize:int=500,
+        sortby:str=None,
+        ascending:bool=True,
+        mode:str="page",
+        prefetch:bool=True,
+        cursor:dict=None,
+        proxies:dict=None
+        ) -> ScreenerIterator:
+        """
+        This function iterates over all the results of the screener of global.morningstar.com,
+        the pages are requested until the results run out and the next page is requested
+        while the current one is consumed.
+
+        Args:
+        term (str): text to find a security can be a the name, 
+        part of a name or the isin
+        language (str): language of the request, default is "en-gb"
+        field (str | list) : field to find
+        filters (dict) : filter, use the method search_filter() to find the different possible filter keys
+        pageSize (int): number of securities per page
+        sortby (str) : sort by a field, keeps the order of the pages stable
+        ascending (bool) : True sort by ascending order, False sort by descending order
+        mode (str) : page to yield a list of results per page, record to yield one result at a time
+        prefetch (bool) : if True, the next page is requested while the current one is consumed
+        cursor (dict) : position to resume from, the attribute cursor of a previous iterator
+        proxies (dict) : set the proxy if needed , example : {"http": "http://host:port","https": "https://host:port"}
+
+        Returns:
+        ScreenerIterator, its attribute cursor is the position of the next result
+            {'page': 3, 'index': 120}
+
+        Examples:
+        >>> for page in screener_pages("a", field=["isin", "name"], sortby="isin"):
+        ...     print(len(page))
+        >>> for security in screener_pages("a", field=["isin"], mode="record", cursor={'page': 3, 'index': 120}):
+        ...     print(security["fields"]["isin"]["value"])
+
+        """
+        return ScreenerIterator(self, term, language=language, field=field, filters=filters,
+                                pageSize=pageSize, sortby=sortby, ascending=ascending, mode=mode,
+                                prefetch=prefetch, cursor=cursor, proxies=proxies)
+
+    def screener_scan(
+        self,
+        term:str,
+        language:str="en-gb",
+        field:str|list="",
+        filters:dict=None,
+        pageSize:int=500,
+        sortby:str=None,
+        ascending:bool=True,
+        workers:int=8,
+        output:str="frame",
+        proxies:dict=None
+        ) -> pd.DataFrame|ScreenerIterator:
+        """
+        This function exports all the results of the screener of global.morningstar.com,
+        the first page gives the total number of results then the other pages are requested
+        concurrently and reassembled in order.
+
+        Args:
+        term (str): text to find a security can be a the name, 
+        part of a name or the isin
+        language (str): language of the request, default is "en-gb"
+        field (str | list) : field to find
+        filters (dict) : filter, use the method search_filter() to find the different possible filter keys
+        pageSize (int): number of securities per page
+        sortby (str) : sort by a field, keeps the order of the pages stable
+        ascending (bool) : True sort by ascending order, False sort by descending order
+        workers (int) : maximum number of pages requested at the same time
+        output (str) : frame for a DataFrame, page for an iterator of pages,
+        record for an iterator of results
+        proxies (dict) : set the proxy if needed , example : {"http": "http://host:port","https": "https://host:port"}
+
+        Returns:
+        DataFrame with one row per security and the numeric fields as float64 columns, or ScreenerIterator
+
+        Examples:
+        >>> screener_scan("a", field=["name", "isin", "ongoingCharge"], filters={"investmentType": "FO"}, sortby="isin")
+        >>> for security in screener_scan("a", field=["isin"], output="record", workers=4):
+        ...     print(security["fields"]["isin"]["value"])
+
+        Raises:
+        TypeError: raised whenever the parameter type is not the type expected
+        ValueError : raised whenever the parameter is not valid
+
+        """
+        if output not in SCAN_OUTPUT:
+            raise ValueError(
+                f"output parameter must take one of the following value : {', '.join(SCAN_OUTPUT)}"
+            )
+
+        iterator = ScreenerIterator(self, term, language=language, field=field, filters=filters,
+                                    pageSize=pageSize, sortby=sortby, ascending=ascending,
+                                    mode="page" if output == "frame" else output,
+                                    workers=workers, proxies=proxies)
+        if output != "frame":
+            return iterator
+
+        numeric = self.numeric_fields()
+        frames = [screener_frame(page, field, numeric) for page in iterator]
+        if not frames:
+            return screener_frame([], field, numeric)
+        return pd.concat(frames, ignore_index=True)
+
+    def data_points(
+        self,
+        securities:list,
+        field:str|list,
+        by:str="securityID",
+        language:str="en-gb",
+        chunkSize:int=200,
+        proxies:dict=None
+        ) -> pd.DataFrame:
+        """
+        This function retrieves fields of many securities with a few requests to the screener
+        of global.morningstar.com, the securities are grouped in IN conditions of chunkSize securities.
+
+        Args:
+        securities (list) : securityID or isin of the securities
+        field (str | list) : field to find
+        by (str) : field matched with the securities, can be isin or one of the ids securityID, performanceID, fundID
+        language (str): language of the request, default is "en-gb"
+        chunkSize (int) : number of securities per request
+        proxies (dict) : set the proxy if needed , example : {"http": "http://host:port","https": "https://host:port"}
+
+        Returns:
+        DataFrame indexed by the securities, named security, with one column per field and the ids of meta,
+        the numeric fields are float64 columns and the securities not found are rows of missing values
+
+        Examples:
+        >>> data_points(["F00000MRIF", "F0GBR04S23"], ["standardDeviation", "ongoingCharge"])
+        >>> data_points(["FR0010921445", "LU0171289902"], "ongoingCharge", by="isin")
+
+        Raises:
+        TypeError: raised whenever the parameter type is not the type expected
+        ValueError : raised whenever the parameter is not valid
+
+        """
+        if not isinstance(field, (str, list)):
+            raise TypeError("field parameter should be a string or a list")
+
+        fields = [field] if isinstance(field, str) else field
+        if not fields:
+            raise ValueError("field parameter should not be empty")
+
+        found = self.resolve_securities(securities,
+                                        by=by,
+                                        language=language,
+                                        field=fields,
+                                        chunkSize=chunkSize,
+                                        pageSize=max(chunkSize, 500),
+                                        proxies=proxies)
+
+        frame = screener_frame(list(found.values()), fields, self.numeric_fields())
+        frame.index = pd.Index(list(found), name="security")
+        return frame.reindex(pd.Index(list(dict.fromkeys(securities)), name="security"))
 
     def search_field(
                     self,
                     pattern:str="",
-                    display_print=True) -> list:
+                    display_print=True,
+                    timeout:float|tuple=None) -> list:
         """
         This function retrieves the possible fields for the screener 
 
         Args:
         pattern (str) : text contained in the field
         display_print (bool) : if True, print the possible fields
+        timeout (float|tuple) : timeout in seconds or (connect, read) timeouts of the request,
+        default is the timeout of the session for the endpoint
 
         Returns:
             list of possible fields for the screener of securities
@@ -288,19 +1129,9 @@ class MorningstarSession(requests.Session):
         if not isinstance(pattern, str):
             raise TypeError("pattern parameter should be a string")
         
-        headers = {"user-agent": random_user_agent()}
-        
-        url = "https://global.morningstar.com/api/v1/fr/stores/data-points/fields"
-
-        response = self.get(url)
-        not_200_response(url, response)
-        if "results" not in response.json():
-            raise ValueError("No results found for the given pattern")
-        
-        result = response.json()["results"]
-        df = pd.DataFrame(result)
-        df_filtered = df.loc[df["field"].str.contains(f"(?i){pattern}",regex=True)]
-        filtered_list = df_filtered["field"].tolist()
+        result = self._catalogue("fields", timeout)["results"]
+        filtered_list = [f["field"] for f in result 
+                         if re.search(pattern, f["field"], re.IGNORECASE)]
 
         if display_print:
             print(f"possible fields for screener can be : {', '.join(filtered_list)}")
@@ -314,7 +1145,8 @@ class MorningstarSession(requests.Session):
                     pattern:str="",
                     asset_type:str="",
                     filter_type:str="",
-                    explicit:bool=False) -> list:
+                    explicit:bool=False,
+                    timeout:float|tuple=None) -> list:
                     
         """
         This function retrieves the possible filters for the parameter filters of the function screener_universe
@@ -324,6 +1156,8 @@ class MorningstarSession(requests.Session):
             asset_type (str): type of asset, can be one of the values in ASSET_TYPE
             filter_type (str): type of filter, can be one of the values in FILTER_TYPE
             explicit (bool): if True, return a list of dict with fields and their metadata
+            timeout (float|tuple) : timeout in seconds or (connect, read) timeouts of the request,
+            default is the timeout of the session for the endpoint
         Returns:
             list of possible filters
             Raise[{'field': 'dividendYield', 'label': 'Dividend Yield (%)', 
@@ -355,13 +1189,7 @@ class MorningstarSession(requests.Session):
                 f"filter_type parameter can only take one of the values : {','.join(FILTER_TYPE)}"
             )
         
-        headers = {"user-agent": random_user_agent()}
-        url = "https://global.morningstar.com/api/v1/fr/stores/filters"
-
-        response = self.get(url)
-        not_200_response(url, response)
-
-        result = response.json()
+        result = {"results": self._catalogue("filters", timeout)["results"]}
 
         list_filter = ["investmentType","countriesOfSale"]
         list_filter_explicit = []
@@ -386,14 +1214,41 @@ class MorningstarSession(requests.Session):
             return list_filter_explicit
         return list_filter
 
+    def numeric_fields(self,
+                       timeout:float|tuple=None) -> set:
+        """
+        This function returns the fields of the screener whose values are numbers,
+        they are the filters flagged numeric by search_filter(explicit=True).
+
+        Args:
+            timeout (float|tuple) : timeout in seconds or (connect, read) timeouts of the request,
+            default is the timeout of the session for the endpoint
+
+        Returns:
+            set of numeric fields
+
+        Example:
+            >>> numeric_fields()
+            {'ongoingCharge', 'standardDeviation', 'dividendYield', ...}
+
+        """
+        return {child["field"] for child in self.search_filter(explicit=True, timeout=timeout)
+                if child.get("numeric")}
+
     def token_chart(self,
-                    proxies:dict=None) -> str:
+                    proxies:dict=None,
+                    refresh:bool=False,
+                    timeout:float|tuple=None) -> str:
         """
-        This function will scrape the Bearer Token needed to access MS API chart data
+        This function will scrape the Bearer Token needed to access MS API chart data,
+        the token is cached and scraped again only when it is about to expire or when refresh is True
 
         Args:
         proxies (dict) : set the proxy if needed ,
         example : {"http": "http://host:port","https": "https://host:port"}
+        refresh (bool) : if True, the token is scraped even if the cached one is valid
+        timeout (float|tuple) : timeout in seconds or (connect, read) timeouts of the request,
+        default is the timeout of the session for the endpoint
 
         Returns:
         str bearer token
@@ -403,16 +1258,253 @@ class MorningstarSession(requests.Session):
         if proxies and not isinstance(proxies, dict):
             raise TypeError("proxies parameter should be dict")
 
-        url = "https://www.morningstar.com/funds/xnas/afozx/chart"
+        if not isinstance(refresh, bool):
+            raise TypeError("refresh parameter should be a boolean")
+
+        token = None if refresh else self._cached_chart_token()
+        if token:
+            return token
+
+        with self._token_lock:
+            # another thread may have scraped the token while waiting
+            token = None if refresh else self._cached_chart_token()
+            if token:
+                return token
+
+            url = CHART_URL
+
+            response = self.get(url, proxies=proxies, timeout=timeout)
 
-        headers = {"user-agent": random_user_agent()}
+            token = _find_token(response.text)
+            if token is None:
+                return None
 
-        response = self.get(url, proxies=proxies)
+            self._set_chart_token(token)
+            return self.chart_token
 
-        all_text = response.text
-        if all_text.find("token") == -1:
+    def _cached_chart_token(self) -> str|None:
+        """
+        This function returns the cached chart token if it does not expire
+        within CHART_TOKEN_MARGIN seconds.
+        """
+        if not self.chart_token:
+            return None
+        if self.chart_token_expiry is None:
             return None
+        if self.chart_token_expiry - CHART_TOKEN_MARGIN <= time.time():
+            return None
+        return self.chart_token
+
+    def _set_chart_token(self,
+                         token:str,
+                         expiry:float=None) -> None:
+        """
+        This function caches the chart token with its expiry and saves it in the session store.
+        """
+        self.chart_token = token
+        self.chart_token_expiry = expiry or _token_expiry(token) or time.time() + CHART_TOKEN_TTL
+        self._save_session_store()
+
+    def _cached_get(self,
+                    endpoint:str,
+                    url:str,
+                    params:dict=None,
+                    headers:dict=None,
+                    **kwargs) -> requests.Response:
+        """
+        This function sends a GET request through the cache of the session if there is one.
+        """
+        if self.cache is None:
+            return self.get(url, params=params, headers=headers, **kwargs)
+        return self.cache.request(self, endpoint, url, params=params, headers=headers, **kwargs)
+
+    def _chart_request(self,
+                       url:str,
+                       params:dict,
+                       proxies:dict=None,
+                       timeout:float|tuple=None) -> requests.Response:
+        """
+        This function requests the chart API with the cached bearer token,
+        the token is scraped again once if it is rejected.
+        """
+        headers = {
+            "user-agent": random_user_agent(),
+            "authorization": f"Bearer {self.token_chart(proxies=proxies, timeout=timeout)}",
+        }
+        response = self.get(url, params=params, headers=headers, proxies=proxies, timeout=timeout)
+        # the cached token is rejected, it is scraped again
+        if response.status_code == 401:
+            token = self.token_chart(proxies=proxies, refresh=True, timeout=timeout)
+            headers["authorization"] = f"Bearer {token}"
+            response = self.get(url, params=params, headers=headers, proxies=proxies, timeout=timeout)
+
+        return response
 
-        token_start = all_text[all_text.find("token") :]
-        return token_start[7 : token_start.find("}") - 1]
+    def time_series(
+        self,
+        codes:list,
+        field:str|list,
+        start_date:datetime.datetime,
+        end_date:datetime.datetime,
+        frequency:str="daily",
+        asset_type:str="fund",
+        chunkSize:int=50,
+        maxUrlLength:int=4000,
+        maxPoints:int=500000,
+        output:str="records",
+        proxies:dict=None,
+        timeout:float|tuple=None
+        ) -> dict:
+        """
+        This function retrieves historical data of many securities with a few requests
+        to the time series API, the securities are packed in the query of a request and
+        a request is split in two whenever the url or the response would be too large.
+        With a time series store, only the dates missing in the store are requested.
+
+        Args:
+        codes (list) : securityID of the securities or Security objects
+        field (str|list) : field to retrieve, can be a string or a list of string
+        start_date (datetime) : start date to get history
+        end_date (datetime) : end date to get history
+        frequency (str) : daily, monthly, quarterly for funds and etf,
+        daily, 5min, 10min, 15min, 30min for stocks
+        asset_type (str) : stock, fund or etf
+        chunkSize (int) : maximum number of securities per request
+        maxUrlLength (int) : maximum length of the url of a request
+        maxPoints (int) : maximum number of values expected in the response of a request
+        output (str) : records for a list of dict, frame for a DataFrame indexed by date,
+        arrays for a dict of numpy arrays
+        proxies (dict) : set the proxy if needed , example : {"http": "http://host:port","https": "https://host:port"}
+        timeout (float|tuple) : timeout in seconds or (connect, read) timeouts of the request,
+        default is the timeout of the session for the endpoint
 
+        Returns:
+        dict with the securityID as key and the time series in the output format as value
+            {'F00000MRIF': [{'nav': 150.01, 'totalReturn': 232.36911, 'date': '2025-07-03'}, ...]}
+
+        Examples:
+        >>> session.time_series(["F00000MRIF", "F000010S65"], ["nav", "totalReturn"], start_date, end_date)
+        >>> session.time_series([ms.Stock("FR0000121014", session=session)], ["open", "close"], start_date, end_date, asset_type="stock")
+
+        Raises:
+            TypeError: raised whenever the parameter type is not the type expected
+            ValueError : raised whenever the parameter is not valid
+
+        """
+        if not isinstance(codes, list):
+            raise TypeError("codes parameter should be a list")
+
+        codes = [getattr(code, "code", code) for code in codes]
+        if not all(isinstance(code, str) for code in codes):
+            raise TypeError("codes parameter should be a list of strings or securities")
+
+        if not isinstance(chunkSize, int) or chunkSize < 1:
+            raise ValueError("chunkSize parameter should be a positive integer")
+
+        if not isinstance(maxUrlLength, int) or maxUrlLength < 1:
+            raise ValueError("maxUrlLength parameter should be a positive integer")
+
+        if not isinstance(maxPoints, int) or maxPoints < 1:
+            raise ValueError("maxPoints parameter should be a positive integer")
+
+        if proxies and not isinstance(proxies, dict):
+            raise TypeError("proxies parameter should be dict")
+
+        codes = list(dict.fromkeys(codes))
+        # check the parameters before any request
+        time_series_params(codes, field, start_date, end_date, frequency, asset_type)
+        check_output(output)
+
+        batch = {"chunkSize": chunkSize,
+                 "maxUrlLength": maxUrlLength,
+                 "maxPoints": maxPoints,
+                 "proxies": proxies,
+                 "timeout": timeout}
+        if self.timeseries_store is None:
+            found = self._time_series_batch(codes, field, start_date, end_date,
+                                            frequency, asset_type, **batch)
+        else:
+            found = self._stored_time_series(codes, field, start_date, end_date,
+                                             frequency, asset_type, **batch)
+
+        return {code: series_output(found.get(code, []), field, output) for code in codes}
+
+    def _stored_time_series(self,
+                            codes:list,
+                            field:str|list,
+                            start_date:datetime.datetime,
+                            end_date:datetime.datetime,
+                            frequency:str,
+                            asset_type:str,
+                            **batch) -> dict:
+        """
+        This function requests only the dates missing in the time series store,
+        the securities missing the same dates are requested together,
+        and returns the series read from the store.
+        """
+        store = self.timeseries_store
+        fields = [field] if isinstance(field, str) else field
+        frequency_code = frequency_codes(asset_type)[frequency]
+
+        segments = {}
+        for code in codes:
+            for segment in store.missing(code, fields, frequency_code, start_date, end_date):
+                segments.setdefault(segment, []).append(code)
+
+        for (start, end), segment_codes in segments.items():
+            found = self._time_series_batch(segment_codes, field, start, end,
+                                            frequency, asset_type, **batch)
+            # a security missing from the response has no value in the segment,
+            # it is saved as covered so that it is not requested again
+            for code in segment_codes:
+                store.save(code, fields, frequency_code, start, end, found.get(code, []))
+
+        return {code: store.load(code, fields, frequency_code, start_date, end_date) for code in codes}
+
+    def _time_series_batch(self,
+                           codes:list,
+                           field:str|list,
+                           start_date:datetime.datetime,
+                           end_date:datetime.datetime,
+                           frequency:str,
+                           asset_type:str,
+                           chunkSize:int,
+                           maxUrlLength:int,
+                           maxPoints:int,
+                           proxies:dict=None,
+                           timeout:float|tuple=None) -> dict:
+        """
+        This function requests the time series of the securities in chunks and splits
+        a chunk whenever the request or the response is too large.
+        """
+        url = TIMESERIES_URL
+        chunks = [codes[i:i + chunkSize] for i in range(0, len(codes), chunkSize)]
+        found = {}
+        while chunks:
+            chunk = chunks.pop(0)
+            params = time_series_params(chunk, field, start_date, end_date, frequency, asset_type)
+            # request too large, split before sending it
+            if len(chunk) > 1 and (
+                len(requests.Request("GET", url, params=params).prepare().url) > maxUrlLength
+                or estimate_points(params) > maxPoints
+            ):
+                chunks[:0] = [chunk[:len(chunk) // 2], chunk[len(chunk) // 2:]]
+                continue
+
+            response = self._chart_request(url, params, proxies=proxies, timeout=timeout)
+            # request rejected by the server because of its size
+            if len(chunk) > 1 and response.status_code in (413, 414, 431):
+                chunks[:0] = [chunk[:len(chunk) // 2], chunk[len(chunk) // 2:]]
+                continue
+
+            not_200_response(url, response)
+            result = response.json() or []
+            # the series are matched by position, split if some are missing
+            if len(chunk) > 1 and len(result) != len(chunk):
+                chunks[:0] = [chunk[:len(chunk) // 2], chunk[len(chunk) // 2:]]
+                continue
+
+            for code, series in zip(chunk, result):
+                found[code] = series.get("series", []) if isinstance(series, dict) else []
+
+        return found
@@ -1,9 +1,13 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 import re
 import requests
 
 from .error import not_200_response
+from .lazy import lazy_import
 from .search import MorningstarSession
+from .timeseries import TIMESERIES_URL, check_output, series_output, time_series_params
 from .utils import (
     APIKEY,
     ASSET_TYPE,
@@ -11,6 +15,8 @@ from .utils import (
     LANGUAGE
     )
 
+pd = lazy_import("pandas")
+
 
 
 class Security():
@@ -38,6 +44,10 @@ class Security():
 
     """
 
+    # asset type and filters used by the constructors of the inherited classes
+    _default_asset_type = ""
+    _default_filters = None
+
     def __init__(
         self,
         term:str,
@@ -94,20 +104,17 @@ class Security():
                 f"language parameter can only take one of the values : {', '.join(LANGUAGE)}"
             )
         #instantiate superclass MorningstarSession
-        self.session = session or MorningstarSession()
-
-        self.language = language
-        self.proxies = proxies
-        self.filters = filters
-        self.pageSize = pageSize
-        self.page = page
-        self.sortby = sortby
-        self.ascending = ascending
-        self.itemRange = itemRange
-
-        self.asset_type = "security"
-
-        code_list = []
+        self._set_attributes(
+            session or MorningstarSession(),
+            language,
+            proxies=proxies,
+            filters=filters,
+            pageSize=pageSize,
+            page=page,
+            sortby=sortby,
+            ascending=ascending,
+            itemRange=itemRange,
+        )
 
 
         code_list = self.session.screener_universe(
@@ -123,60 +130,322 @@ class Security():
 
         if code_list:
             if itemRange < len(code_list):
-                self.code = code_list[itemRange]['meta']["securityID"]
-                if "name" in code_list[itemRange]['fields']:
-                    self.name = code_list[itemRange]['fields']["name"]['value']
-                else:
-                    self.name = self.code
-                if "isin" in code_list[itemRange]['fields']:
-                    self.isin = code_list[itemRange]['fields']["isin"]['value']
-                else:
-                    self.isin = self.code
-                universe = code_list[itemRange]['meta']["universe"]
-
-                if universe not in ASSET_TYPE:
-                    raise ValueError(
-                                f"universe {universe} parameter can only take one of the values : {','.join(ASSET_TYPE.keys())}"
-                            )
-                self.asset_type = ASSET_TYPE[universe]
+                self._set_security(code_list[itemRange], term, asset_type)
+            else:
+                raise ValueError(
+                    f"Found only {len(code_list)} {self.asset_type} with the term {term}. The paramater itemRange must maximum equal to {len(code_list)-1}"
+                )
+        else:
+            raise ValueError(f"0 {self.asset_type} found with the term {term}")
 
-                if universe == "EQ" and asset_type in ["etf", "fund"]:
-                    raise ValueError(
-                        f"The security found with the term {term} is a stock and the parameter asset_type is equal to {asset_type}, the class Stock should be used with this security."
-                    )
+    def _set_security(self,
+                      security:dict,
+                      term:str,
+                      asset_type:str) -> None:
+        """
+        This function sets the code, name, isin and asset type from a result of the screener.
+
+        Args:
+            security (dict) : result of the screener with meta and fields
+            term (str) : term used to find the security
+            asset_type (str) : security type expected, can be fund, stock, etf
+
+        Raises:
+            ValueError : raised whenever the universe of the security does not match the asset_type
+
+        """
+        self.code = security['meta']["securityID"]
+        if "name" in security['fields']:
+            self.name = security['fields']["name"]['value']
+        else:
+            self.name = self.code
+        if "isin" in security['fields']:
+            self.isin = security['fields']["isin"]['value']
+        else:
+            self.isin = self.code
+        self._set_universe(security['meta']["universe"], term, asset_type)
+
+    def _set_universe(self,
+                      universe:str,
+                      term:str,
+                      asset_type:str) -> None:
+        """
+        This function sets the asset type from the universe of the security.
 
-                if universe in ["FO", "FE", "FC", "FV", "FM"] and asset_type == "stock":
-                    if universe == "FO":
-                        raise ValueError(
-                            f"The security found with the term {term} is a Open-end fund and the parameter asset_type is equal to {asset_type}, the class Fund should be used with this security."
-                        )
-                    elif universe == "FE":
-                        raise ValueError(
-                            f"The security found with the term {term} is an ETF and the parameter asset_type is equal to {asset_type}, the class Fund should be used with this security."
-                        )
-                    elif universe == "FC":
-                        raise ValueError(
-                            f"The security found with the term {term} is a Closed-end fund and the parameter asset_type is equal to {asset_type}, the class Fund should be used with this security."
-                        )
-                    elif universe == "FM":
-                        raise ValueError(
-                            f"The security found with the term {term} is a Money Market Funds and the parameter asset_type is equal to {asset_type}, the class Fund should be used with this security."
-                        )
-                    else:
-                        raise ValueError(
-                            f"The security found with the term {term} is an Insurance and Pension Funds and the parameter asset_type is equal to {asset_type}, the class Fund should be used with this security."
-                        )
-                    
+        Args:
+            universe (str) : universe of the security, one of the keys of ASSET_TYPE
+            term (str) : term used to find the security
+            asset_type (str) : security type expected, can be fund, stock, etf
+
+        Raises:
+            ValueError : raised whenever the universe of the security does not match the asset_type
+
+        """
+        if universe not in ASSET_TYPE:
+            raise ValueError(
+                        f"universe {universe} parameter can only take one of the values : {','.join(ASSET_TYPE.keys())}"
+                    )
+        self.asset_type = ASSET_TYPE[universe]
 
+        if universe == "EQ" and asset_type in ["etf", "fund"]:
+            raise ValueError(
+                f"The security found with the term {term} is a stock and the parameter asset_type is equal to {asset_type}, the class Stock should be used with this security."
+            )
 
+        if universe in ["FO", "FE", "FC", "FV", "FM"] and asset_type == "stock":
+            if universe == "FO":
+                raise ValueError(
+                    f"The security found with the term {term} is a Open-end fund and the parameter asset_type is equal to {asset_type}, the class Fund should be used with this security."
+                )
+            elif universe == "FE":
+                raise ValueError(
+                    f"The security found with the term {term} is an ETF and the parameter asset_type is equal to {asset_type}, the class Fund should be used with this security."
+                )
+            elif universe == "FC":
+                raise ValueError(
+                    f"The security found with the term {term} is a Closed-end fund and the parameter asset_type is equal to {asset_type}, the class Fund should be used with this security."
+                )
+            elif universe == "FM":
+                raise ValueError(
+                    f"The security found with the term {term} is a Money Market Funds and the parameter asset_type is equal to {asset_type}, the class Fund should be used with this security."
+                )
             else:
                 raise ValueError(
-                    f"Found only {len(code_list)} {self.asset_type} with the term {term}. The paramater itemRange must maximum equal to {len(code_list)-1}"
+                    f"The security found with the term {term} is an Insurance and Pension Funds and the parameter asset_type is equal to {asset_type}, the class Fund should be used with this security."
                 )
-        else:
-            raise ValueError(f"0 {self.asset_type} found with the term {term}")
 
+    @classmethod
+    def from_list(cls,
+                  terms:list,
+                  by:str="isin",
+                  language:str="en-gb",
+                  filters:dict=None,
+                  chunkSize:int=100,
+                  proxies:dict=None,
+                  session:requests.Session=None,
+                  ) -> tuple[dict, list]:
+        """
+        This function creates many securities from a list of isin or ids 
+        with a few requests to the screener, all the securities share the same session.
+
+        Args:
+            terms (list) : isin or ids of the securities
+            by (str) : field matched with the terms, can be isin or one of the ids securityID, performanceID, fundID
+            language (str): language of the data, default is "en-gb"
+            filters (dict) : filter, use the method search_filter() to find the different possible filter keys
+            chunkSize (int) : number of terms per request to the screener
+            proxies (dict) : set the proxy if needed , example : {"http": "http://host:port","https": "https://host:port"}
+            session (MorningstarSession) : session shared by the securities
+
+        Returns:
+            tuple with a dict of securities by term and the list of terms not found
+
+        Examples:
+            >>> Funds.from_list(["FR0010921445", "LU1681043599"], session=session)
+            >>> Stock.from_list(["0P000000GY"], by="performanceID")
+
+        Raises:
+            TypeError: raised whenever the parameter type is not the type expected
+            ValueError : raised whenever the parameter is not valid
+
+        """
+        if not isinstance(language, str):
+            raise TypeError("language parameter should be a string")
+
+        if filters and not isinstance(filters, dict):
+            raise TypeError("filters parameter should be dict")
+
+        if proxies and not isinstance(proxies, dict):
+            raise TypeError("proxies parameter should be dict")
+
+        if language not in LANGUAGE:
+            raise ValueError(
+                f"language parameter can only take one of the values : {', '.join(LANGUAGE)}"
+            )
+
+        session = session or MorningstarSession()
+
+        class_filters = cls._default_filters
+        if filters:
+            class_filters = (class_filters or {}) | filters
+
+        found = session.resolve_securities(
+            terms,
+            by=by,
+            language=language,
+            filters=class_filters,
+            chunkSize=chunkSize,
+            proxies=proxies,
+        )
+
+        return cls._from_results(terms, found, session, language, proxies, class_filters)
+
+    @classmethod
+    def _from_results(cls,
+                      terms:list,
+                      found:dict,
+                      session:requests.Session,
+                      language:str,
+                      proxies:dict=None,
+                      filters:dict=None) -> tuple[dict, list]:
+        """
+        This function creates the securities of from_list from the results of the screener.
+        """
+        securities = {}
+        not_found = []
+        for term in terms:
+            if term not in found:
+                not_found.append(term)
+                continue
+            security = cls.__new__(cls)
+            security._set_attributes(session, language, proxies, filters)
+            try:
+                security._set_security(found[term], term, cls._default_asset_type)
+            except ValueError:
+                not_found.append(term)
+                continue
+            securities[term] = security
+
+        return securities, not_found
+
+    @classmethod
+    def from_id(cls,
+                securityID:str,
+                universe:str,
+                name:str=None,
+                isin:str=None,
+                language:str="en-gb",
+                proxies:dict=None,
+                session:requests.Session=None,
+                ):
+        """
+        This function creates a security from its Morningstar id without any request,
+        the name and the isin are retrieved from the screener only when they are first used.
+
+        Args:
+            securityID (str) : Morningstar securityID of the security
+            universe (str) : universe of the security, one of the keys of ASSET_TYPE
+            name (str) : name of the security if known
+            isin (str) : isin of the security if known
+            language (str): language of the data, default is "en-gb"
+            proxies (dict) : set the proxy if needed , example : {"http": "http://host:port","https": "https://host:port"}
+            session (MorningstarSession) : session of the security
+
+        Returns:
+            security of the class
+
+        Examples:
+            >>> Funds.from_id("F00000MRIF", "FO", session=session).feeLevel()
+            >>> Stock.from_id("0P000000GY", "EQ", name="Apple Inc")
+
+        Raises:
+            TypeError: raised whenever the parameter type is not the type expected
+            ValueError : raised whenever the parameter is not valid
+
+        """
+        if not isinstance(securityID, str):
+            raise TypeError("securityID parameter should be a string")
+
+        if not isinstance(universe, str):
+            raise TypeError("universe parameter should be a string")
+
+        if name and not isinstance(name, str):
+            raise TypeError("name parameter should be a string")
+
+        if isin and not isinstance(isin, str):
+            raise TypeError("isin parameter should be a string")
+
+        if not isinstance(language, str):
+            raise TypeError("language parameter should be a string")
 
+        if proxies and not isinstance(proxies, dict):
+            raise TypeError("proxies parameter should be dict")
+
+        if language not in LANGUAGE:
+            raise ValueError(
+                f"language parameter can only take one of the values : {', '.join(LANGUAGE)}"
+            )
+
+        security = cls.__new__(cls)
+        security._set_attributes(session or MorningstarSession(),
+                                 language,
+                                 proxies=proxies,
+                                 filters=cls._default_filters)
+        security.code = securityID
+        security._set_universe(universe, securityID, cls._default_asset_type)
+        security._name = name
+        security._isin = isin
+
+        return security
+
+    @property
+    def name(self) -> str:
+        """name of the security, retrieved from the screener on first use, the code if not found"""
+        if self._name is None and not self._metadata_loaded:
+            self._load_metadata()
+        return self._name if self._name is not None else self.code
+
+    @name.setter
+    def name(self, value:str) -> None:
+        self._name = value
+
+    @property
+    def isin(self) -> str:
+        """isin of the security, retrieved from the screener on first use, the code if not found"""
+        if self._isin is None and not self._metadata_loaded:
+            self._load_metadata()
+        return self._isin if self._isin is not None else self.code
+
+    @isin.setter
+    def isin(self, value:str) -> None:
+        self._isin = value
+
+    def _load_metadata(self) -> None:
+        """
+        This function retrieves the name and the isin of the security from the screener
+        with an exact match of its securityID. The screener is requested once, the name
+        and the isin it does not return stay unknown.
+        """
+        found = self.session.resolve_securities([self.code],
+                                                by="securityID",
+                                                language=self.language,
+                                                field=["isin", "name"],
+                                                proxies=self.proxies)
+        self._metadata_loaded = True
+
+        fields = found.get(self.code, {}).get("fields", {})
+        if self._name is None:
+            self._name = fields.get("name", {}).get("value")
+        if self._isin is None:
+            self._isin = fields.get("isin", {}).get("value")
+
+    def _set_attributes(self,
+                        session:requests.Session,
+                        language:str,
+                        proxies:dict=None,
+                        filters:dict=None,
+                        pageSize:int=10,
+                        page:int=1,
+                        sortby:str=None,
+                        ascending:bool=True,
+                        itemRange:int=0) -> None:
+        """
+        This function sets the attributes of the security shared by all the constructors.
+        """
+        self.session = session
+        self.language = language
+        self.proxies = proxies
+        self.filters = filters
+        self.pageSize = pageSize
+        self.page = page
+        self.sortby = sortby
+        self.ascending = ascending
+        self.itemRange = itemRange
+
+        self.asset_type = "security"
+        self._name = None
+        self._isin = None
+        self._metadata_loaded = False
 
     def dataPoint(self, 
                   field:str|list) -> list[dict]:
@@ -211,11 +480,97 @@ class Security():
         return result[self.itemRange]['fields']
         
     
+    def fetch_many(self,
+                   methods:list|dict,
+                   max_workers:int=8) -> tuple[dict, dict]:
+        """
+        This function calls many methods of the security concurrently on a pool of threads
+        sharing the session of the security.
+
+        Args:
+            methods (list|dict) : methods to call, an item is the name of a method or a tuple
+            with the name and a dict of the parameters, with a dict the keys are the keys of the results
+            max_workers (int) : maximum number of requests at the same time
+
+        Returns:
+            tuple with a dict of results and a dict of errors, both by method
+
+        Examples:
+            >>> Funds("myria").fetch_many(["quote", "sector", "holdings", "feeLevel"])
+            >>> Funds("myria").fetch_many({"return1y": ("trailingReturn", {"duration": "annually"}),
+                                           "returnMonth": ("trailingReturn", {"duration": "monthly"})})
+
+        Raises:
+            TypeError: raised whenever the parameter type is not the type expected
+            ValueError : raised whenever a method is not valid
+
+        """
+        if not isinstance(methods, (list, dict)):
+            raise TypeError("methods parameter should be a list or a dict")
+
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError("max_workers parameter should be a positive integer")
+
+        calls = self._method_calls(methods)
+
+        results = {}
+        errors = {}
+        if not calls:
+            return results, errors
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as executor:
+            futures = {key: executor.submit(function, **kwargs)
+                       for key, (function, kwargs) in calls.items()}
+            for key, future in futures.items():
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    errors[key] = e
+
+        return results, errors
+
+    def _method_calls(self,
+                      methods:list|dict) -> dict:
+        """
+        This function converts the methods of fetch_many into bound methods and parameters.
+
+        Returns:
+            dict with the key of the result as key and a tuple of the method and its parameters as value
+        """
+        if isinstance(methods, list):
+            specs = {}
+            for method in methods:
+                key = method if isinstance(method, str) else method[0]
+                if key in specs:
+                    raise ValueError(
+                        f"method {key} is called twice, use a dict to give a key to each call"
+                    )
+                specs[key] = method
+        else:
+            specs = methods
+
+        calls = {}
+        for key, method in specs.items():
+            if isinstance(method, str):
+                name, kwargs = method, {}
+            elif isinstance(method, tuple) and len(method) == 2 and isinstance(method[1], dict):
+                name, kwargs = method
+            else:
+                raise TypeError(
+                    f"method {key} should be a string or a tuple with the name and a dict of parameters"
+                )
+            if name.startswith("_") or name in ["fetch_many", "from_id", "from_list"] or not callable(getattr(self, name, None)):
+                raise ValueError(f"{name} is not a method of {type(self).__name__}")
+            calls[key] = (getattr(self, name), kwargs)
+
+        return calls
+
     def GetData(self, 
                 field:str, 
                 params:dict=None, 
                 headers:dict=None, 
-                url_suffix:str="data") -> dict|list:
+                url_suffix:str="data",
+                timeout:float|tuple=None) -> dict|list:
         """
         This function retrieves data from the MorningStar global API.
         Args:
@@ -223,6 +578,8 @@ class Security():
             params (dict) : parameter for the request
             headers (dict) : headers of the request
             url_suffix (str) : suffix of the url
+            timeout (float|tuple) : timeout in seconds or (connect, read) timeouts of the request,
+            default is the timeout of the session for the endpoint
 
         Raises:
             TypeError raised whenever type of paramater are invalid
@@ -235,6 +592,25 @@ class Security():
 
         """
 
+        url, default_params, default_headers = self._data_request(field, params, headers, url_suffix)
+
+        response = self.session._cached_get(
+            field, url, params=default_params, headers=default_headers, proxies=self.proxies,
+            timeout=timeout
+        )
+
+        not_200_response(url, response)
+
+        return response
+
+    def _data_request(self,
+                      field:str,
+                      params:dict=None,
+                      headers:dict=None,
+                      url_suffix:str="data") -> tuple[str, dict, dict]:
+        """
+        This function builds the url, parameters and headers of a request to the MorningStar global API.
+        """
         if not isinstance(field, str):
             raise TypeError("field parameter should be a string")
 
@@ -269,24 +645,20 @@ class Security():
         if params:
             default_params = default_params | params
 
-
-        response = requests.get(
-            url, params=default_params, headers=default_headers, proxies=self.proxies
-        )
-
-        not_200_response(url, response)
-
-        return response
+        return url, default_params, default_headers
 
     def ltData(self, 
                field:str, 
-               currency:str="EUR") -> dict:
+               currency:str="EUR",
+               timeout:float|tuple=None) -> dict:
         """
         Generic function to use MorningStar lt api.
 
         Args:
             field (str) : viewId in the params
             currency (str) : currency in 3 letters
+            timeout (float|tuple) : timeout in seconds or (connect, read) timeouts of the request,
+            default is the timeout of the session for the endpoint
 
         Raises:
             TypeError raised whenever type of paramater are invalid
@@ -297,6 +669,21 @@ class Security():
         Examples:
             >>> Security("rmagx").ltData("price/feeLevel")
 
+        """
+        url, params = self._lt_request(field, currency)
+
+        response = self.session._cached_get(field, url, params=params, proxies=self.proxies,
+                                            timeout=timeout)
+
+        not_200_response(url, response)
+
+        return self._lt_result(response)
+
+    def _lt_request(self,
+                    field:str,
+                    currency:str="EUR") -> tuple[str, dict]:
+        """
+        This function builds the url and parameters of a request to the MorningStar lt API.
         """
         if not isinstance(field, str):
             raise TypeError("field parameter should be a string")
@@ -311,10 +698,13 @@ class Security():
             "languageId": "en",
             "responseViewFormat": "json",
         }
-        response = requests.get(url, params=params, proxies=self.proxies)
-
-        not_200_response(url, response)
+        return url, params
 
+    @staticmethod
+    def _lt_result(response:requests.Response) -> dict:
+        """
+        This function returns the data of a response of the MorningStar lt API.
+        """
         # responseis a list
         response_list = response.json()
         if response_list:
@@ -323,12 +713,15 @@ class Security():
             return {}
 
     def RealtimeData(self, 
-                     url_suffix: str) -> dict:
+                     url_suffix: str,
+                     timeout:float|tuple=None) -> dict:
         """
         This function retrieves historical data of the specified fields
 
         Args:
             url_suffix (str) : suffixe of the url
+            timeout (float|tuple) : timeout in seconds or (connect, read) timeouts of the request,
+            default is the timeout of the session for the endpoint
 
         Returns:
             dict of realtime data
@@ -341,6 +734,23 @@ class Security():
             is not the type expected
             ConnectionError : raised whenever the response is not 200 OK
 
+        """
+        url, params, headers = self._realtime_request(url_suffix)
+        # response
+        response = self.session.get(url, 
+                                    params=params, 
+                                    headers=headers, 
+                                    proxies=self.proxies,
+                                    timeout=timeout)
+        # manage response
+        not_200_response(url, response)
+        # result
+        return response.json()
+    
+    def _realtime_request(self,
+                          url_suffix:str) -> tuple[str, dict, dict]:
+        """
+        This function builds the url, parameters and headers of a request to the realtime API.
         """
         # error raised if url_suffix is not a string
         if not isinstance(url_suffix, str):
@@ -354,22 +764,16 @@ class Security():
                     }
         #parameters of the request
         params = {"securities": self.code}
-        # response
-        response = requests.get(url, 
-                                params=params, 
-                                headers=headers, 
-                                proxies=self.proxies,
-                                timeout=60)
-        # manage response
-        not_200_response(url, response)
-        # result
-        return response.json()
-    
+
+        return url, params, headers
+
     def TimeSeries(self, 
                    field:str|list, 
                    start_date:datetime.datetime,
                    end_date:datetime.datetime,
-                   frequency:str="daily") -> list:
+                   frequency:str="daily",
+                   output:str="records",
+                   timeout:float|tuple=None) -> list|pd.DataFrame|dict:
         """
         This function retrieves historical data of the specified fields
 
@@ -378,12 +782,17 @@ class Security():
             start_date (datetime) : start date to get history
             end_date (datetime) : end date to get history
             frequency (str) : can be daily, weekly, monthly
+            output (str) : records for a list of dict, frame for a DataFrame indexed by date,
+            arrays for a dict of numpy arrays
+            timeout (float|tuple) : timeout in seconds or (connect, read) timeouts of the request,
+            default is the timeout of the session for the endpoint
 
         Returns:
-            list of dict time series
+            list of dict time series, DataFrame or dict of numpy arrays
 
         Examples:
             >>> Security("RMAGX").TimeSeries(["nav","totalReturn"],datetime.datetime.today()- datetime.timedelta(30),datetime.datetime.today())
+            >>> Security("RMAGX").TimeSeries(["nav","totalReturn"],datetime.datetime.today()- datetime.timedelta(30),datetime.datetime.today(), output="frame")
 
         Raises:
             TypeError: raised whenever the parameter type is not the type expected
@@ -391,76 +800,49 @@ class Security():
 
         """
 
-        # error raised if field is not a string or a list
-        if not isinstance(field, (str, list)):
-            raise TypeError("field parameter should be a string or a list")
-
-        # error raised if start_date is note a datetime.date
-        if not isinstance(start_date, datetime.date):
-            raise TypeError("start_date parameter should be a datetime.date")
-
-        # error raised if end_date is note a datetime.date
-        if not isinstance(end_date, datetime.date):
-            raise TypeError("end_date parameter should be a datetime.date")
-
-        # error if end_date < start_date
-        if end_date < start_date:
-            raise ValueError("end_date must be more recent than start_date")
-
-        # error raised if frequency is not a string
-        if not isinstance(frequency, str):
-            raise TypeError("frequency parameter should be a string")
-
-        # dict of frequency
-        frequency_row = {"daily": "d", "weekly": "w", "monthly": "m"}
-
-        if self.asset_type == "stock":
-            frequency_row = {"daily": "d", 
-                             "5min": "5", 
-                             "10min": "10", 
-                             "15min": "15", 
-                             "30min": "30",
-                             }
-        else:
-            frequency_row = {"daily": "d", "monthly": "m", "quarterly": "q"}
-
-
-        # raise an error if frequency is not daily, wekly or monthly
-        if frequency not in frequency_row:
-            raise ValueError(
-                f"frequency parameter must take one of the following value : { ', '.join(frequency_row.keys())}"
-            )
-
-        if isinstance(field, list):
-            queryField = ",".join(field)
-        else:
-            queryField = field
-
-        # bearer token
-        bearer_token = self.session.token_chart()
-        # url for nav
-        url = "https://www.us-api.morningstar.com/QS-markets/chartservice/v2/timeseries"
-        # header with bearer token
-        headers = {
-            "user-agent": random_user_agent(),
-            "authorization": f"Bearer {bearer_token}",
-        }
-        #params of the request
-        params ={
-            "query" : f"{self.code}:{queryField}",
-            "frequency": frequency_row[frequency],
-            "startDate": start_date.strftime('%Y-%m-%d'),
-            "endDate": end_date.strftime('%Y-%m-%d'),
-            "trackMarketData": "3.6.3",
-            "instid": "DOTCOM",
-        }
-        # response
-        response = requests.get(url,
-                                params=params,
-                                headers=headers, 
-                                proxies=self.proxies)
+        check_output(output)
+        # only the dates missing in the time series store are requested
+        if self.session.timeseries_store is not None:
+            return self.session.time_series([self.code],
+                                            field,
+                                            start_date,
+                                            end_date,
+                                            frequency,
+                                            self.asset_type,
+                                            output=output,
+                                            proxies=self.proxies,
+                                            timeout=timeout)[self.code]
+
+        url, params = self._time_series_request(field, start_date, end_date, frequency)
+
+        # response, authenticated with the bearer token cached by the session
+        response = self.session._chart_request(url, params, proxies=self.proxies, timeout=timeout)
         # manage response
         not_200_response(url, response)
+
+        return series_output(self._time_series_result(response), field, output)
+
+    def _time_series_request(self,
+                             field:str|list,
+                             start_date:datetime.datetime,
+                             end_date:datetime.datetime,
+                             frequency:str="daily") -> tuple[str, dict]:
+        """
+        This function builds the url and parameters of a request to the time series API.
+        """
+        params = time_series_params([self.code],
+                                    field,
+                                    start_date,
+                                    end_date,
+                                    frequency,
+                                    self.asset_type)
+        return TIMESERIES_URL, params
+
+    @staticmethod
+    def _time_series_result(response:requests.Response) -> list:
+        """
+        This function returns the series of a response of the time series API.
+        """
         # result
         result = response.json()
         # return empty list if we don't get data
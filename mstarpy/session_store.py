@@ -0,0 +1,138 @@
+"""module to persist the state of a Morningstar session on disk"""
+import json
+import os
+import tempfile
+import time
+
+
+SESSION_STORE_VERSION = 1
+
+
+class SessionStore():
+    """
+    Local file store for the cookies, user agent and chart bearer token
+    of a MorningstarSession, so a new session can skip the browser
+    as long as the stored state is not expired.
+
+    Args:
+        path (str) : path of the json file
+        ttl (float) : maximum age of the stored state in seconds
+
+    Examples:
+        >>> SessionStore("~/.mstarpy/session.json")
+        >>> SessionStore("/tmp/mstarpy_session.json", ttl=3600)
+
+    Raises:
+        TypeError: raised whenever the parameter type is not the type expected
+
+    """
+
+    def __init__(self,
+                 path:str,
+                 ttl:float=21600) -> None:
+
+        if not isinstance(path, str):
+            raise TypeError("path parameter should be a string")
+
+        if not isinstance(ttl, (int, float)):
+            raise TypeError("ttl parameter should be a number")
+
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+
+    def load(self) -> dict|None:
+        """
+        This function reads the stored session state.
+
+        Returns:
+            dict with the session state, None if the file does not exist,
+            cannot be read or is expired
+
+        Examples:
+            >>> SessionStore("session.json").load()
+
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(state, dict):
+            return None
+
+        if state.get("version") != SESSION_STORE_VERSION:
+            return None
+
+        if state.get("expires", 0) <= time.time():
+            return None
+
+        if not state.get("cookies"):
+            return None
+
+        return state
+
+    def save(self,
+             state:dict) -> None:
+        """
+        This function writes the session state, the file is replaced atomically
+        and is only readable by the current user.
+
+        Args:
+            state (dict) : session state with cookies, user_agent, expires and chart_token
+
+        Examples:
+            >>> SessionStore("session.json").save({"cookies": [], "user_agent": "", "expires": 0})
+
+        """
+        if not isinstance(state, dict):
+            raise TypeError("state parameter should be a dict")
+
+        state = state | {"version": SESSION_STORE_VERSION}
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".mstarpy-session-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def clear(self) -> None:
+        """
+        This function deletes the stored session state.
+
+        Examples:
+            >>> SessionStore("session.json").clear()
+
+        """
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def expiry(self,
+               cookies:list[dict],
+               waf_cookies:list[str]) -> float:
+        """
+        This function computes the expiry of a session state, it is the ttl
+        of the store capped by the expiry of the WAF cookies.
+
+        Args:
+            cookies (list) : list of cookies as returned by selenium
+            waf_cookies (list) : names of the cookies which grant access to the API
+
+        Returns:
+            float timestamp of expiry
+
+        """
+        expires = time.time() + self.ttl
+        for cookie in cookies:
+            if cookie["name"] in waf_cookies and cookie.get("expiry"):
+                expires = min(expires, float(cookie["expiry"]))
+        return expires
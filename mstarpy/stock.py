@@ -1,7 +1,11 @@
+from __future__ import annotations
+from .lazy import lazy_import
 from .security import Security
 import datetime
 import requests
 
+pd = lazy_import("pandas")
+
 class Stock(Security):
     """
     Main class to access data about stocks, inherit from Security class
@@ -26,6 +30,9 @@ class Stock(Security):
 
     """
 
+    _default_asset_type = "stock"
+    _default_filters = {"investmentType" : 'EQ'}
+
     def __init__(
         self,
         term:str,
@@ -40,7 +47,7 @@ class Stock(Security):
         session:requests.Session=None
     ) -> None:
         
-        stock_filter = {"investmentType" : 'EQ'}
+        stock_filter = dict(self._default_filters)
         if filters:
             stock_filter = stock_filter | filters
 
@@ -241,6 +248,27 @@ class Stock(Security):
 
         """
 
+        params, url_suffix = self._financial_statement_request(
+            statement, period, reportType, export, folderPath
+        )
+
+        response = self.GetData("newfinancials", params=params, url_suffix=url_suffix)
+
+        if not export:
+            return response.json()
+
+        return self._export_statement(response, url_suffix.split("/")[0], folderPath)
+
+    def _financial_statement_request(self,
+                                     statement:str="summary",
+                                     period:str="annual",
+                                     reportType:str="original",
+                                     export:bool=False,
+                                     folderPath:str=".") -> tuple[dict, str]:
+        """
+        This function checks the parameters of financialStatement and builds the parameters
+        and the url suffix of the request.
+        """
         if not isinstance(statement, str):
             raise TypeError("statement parameter should be a string")
 
@@ -284,29 +312,23 @@ class Stock(Security):
         
 
 
-        params = {"reportType": reportType_choice[reportType]}
+        params = {"reportType": reportType_choice[reportType],
+                  "dataType": period_choice[period]}
 
         if export:
             params["operation"] = "export"
 
-        if statement == "summary":
-            response = self.GetData(
-                "newfinancials", params=params, url_suffix=f"{period}/summary"
-            )
-
-        params["dataType"] = period_choice[period]
-
-        response = self.GetData(
-            "newfinancials",
-            params=params,
-            url_suffix=f"{statement_choice[statement]}/detail",
-        )
+        return params, f"{statement_choice[statement]}/detail"
 
-        if not export:
-            return response.json()
-        
+    def _export_statement(self,
+                          response:requests.Response,
+                          statement:str,
+                          folderPath:str) -> dict:
+        """
+        This function saves an exported financial statement in the folderPath.
+        """
         timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-        fileName = f"{statement_choice[statement]}-{self.code}-{timestamp}.xls"
+        fileName = f"{statement}-{self.code}-{timestamp}.xls"
         with open(f"{folderPath}/{fileName}", "wb") as f:
             f.write(response.content)
 
@@ -357,7 +379,8 @@ class Stock(Security):
     def historical(self,
                    start_date:datetime.datetime, 
                    end_date:datetime.datetime, 
-                   frequency:str="daily") -> list:
+                   frequency:str="daily",
+                   output:str="records") -> list|pd.DataFrame|dict:
         """
         This function retrieves the historical price, volume and dividends of the stock.
 
@@ -365,9 +388,11 @@ class Stock(Security):
             start_date (datetime) : start date to get history
             end_date (datetime) : end date to get history
             frequency (str) : can be daily, weekly, monthly
+            output (str) : records for a list of dict, frame for a DataFrame indexed by date,
+            arrays for a dict of numpy arrays
 
         Returns:
-            list of dict with price, volume and dividend
+            list of dict with price, volume and dividend, DataFrame or dict of numpy arrays
 
         Examples:
             >>> Stock("US0378331005").history(datetime.datetime.today()- datetime.timedelta(30),datetime.datetime.today())
@@ -378,6 +403,7 @@ class Stock(Security):
             start_date=start_date,
             end_date=end_date,
             frequency=frequency,
+            output=output,
         )
 
     def incomeStatement(self, 
@@ -0,0 +1,256 @@
+"""module to build the requests of the time series API of Morningstar"""
+from __future__ import annotations
+import datetime
+
+from .lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+
+# url of the time series API
+TIMESERIES_URL = "https://www.us-api.morningstar.com/QS-markets/chartservice/v2/timeseries"
+
+
+# separator of the securities in the query of the time series API
+QUERY_SEPARATOR = "|"
+
+
+# frequencies of the time series API by asset type
+FREQUENCY = {
+    "stock": {"daily": "d",
+              "5min": "5",
+              "10min": "10",
+              "15min": "15",
+              "30min": "30",
+              },
+    "fund": {"daily": "d", "monthly": "m", "quarterly": "q"},
+}
+
+
+# output formats of the time series
+OUTPUT = ["records", "frame", "arrays"]
+
+
+# approximate number of points per calendar day of each frequency
+POINTS_PER_DAY = {
+    "d": 1,
+    "m": 1 / 30,
+    "q": 1 / 91,
+    "5": 78,
+    "10": 39,
+    "15": 26,
+    "30": 13,
+}
+
+
+def frequency_codes(asset_type:str) -> dict:
+    """
+    This function returns the frequencies of the time series API for an asset type.
+
+    Args:
+        asset_type (str) : stock, fund or etf
+
+    Returns:
+        dict with the frequency as key and the code of the API as value
+
+    """
+    if asset_type == "stock":
+        return FREQUENCY["stock"]
+    return FREQUENCY["fund"]
+
+
+def time_series_params(codes:list,
+                       field:str|list,
+                       start_date:datetime.datetime,
+                       end_date:datetime.datetime,
+                       frequency:str="daily",
+                       asset_type:str="fund") -> dict:
+    """
+    This function builds the parameters of a request to the time series API
+    for one or many securities.
+
+    Args:
+        codes (list) : securityID of the securities
+        field (str|list) : field to retrieve, can be a string or a list of string
+        start_date (datetime) : start date to get history
+        end_date (datetime) : end date to get history
+        frequency (str) : frequency of the data, the possible values depend on asset_type
+        asset_type (str) : stock, fund or etf
+
+    Returns:
+        dict parameters of the request
+
+    Examples:
+        >>> time_series_params(["F00000MRIF"], ["nav"], datetime.date(2024, 1, 1), datetime.date(2024, 12, 31))
+
+    Raises:
+        TypeError: raised whenever the parameter type is not the type expected
+        ValueError : raised whenever the parameter is not valid
+
+    """
+    # error raised if field is not a string or a list
+    if not isinstance(field, (str, list)):
+        raise TypeError("field parameter should be a string or a list")
+
+    # error raised if start_date is note a datetime.date
+    if not isinstance(start_date, datetime.date):
+        raise TypeError("start_date parameter should be a datetime.date")
+
+    # error raised if end_date is note a datetime.date
+    if not isinstance(end_date, datetime.date):
+        raise TypeError("end_date parameter should be a datetime.date")
+
+    # error if end_date < start_date
+    if end_date < start_date:
+        raise ValueError("end_date must be more recent than start_date")
+
+    # error raised if frequency is not a string
+    if not isinstance(frequency, str):
+        raise TypeError("frequency parameter should be a string")
+
+    frequency_row = frequency_codes(asset_type)
+
+    # raise an error if frequency is not daily, wekly or monthly
+    if frequency not in frequency_row:
+        raise ValueError(
+            f"frequency parameter must take one of the following value : { ', '.join(frequency_row.keys())}"
+        )
+
+    if isinstance(field, list):
+        queryField = ",".join(field)
+    else:
+        queryField = field
+
+    #params of the request
+    return {
+        "query" : QUERY_SEPARATOR.join(f"{code}:{queryField}" for code in codes),
+        "frequency": frequency_row[frequency],
+        "startDate": start_date.strftime('%Y-%m-%d'),
+        "endDate": end_date.strftime('%Y-%m-%d'),
+        "trackMarketData": "3.6.3",
+        "instid": "DOTCOM",
+    }
+
+
+def estimate_points(params:dict) -> float:
+    """
+    This function estimates the number of values returned by a request to the time series API.
+
+    Args:
+        params (dict) : parameters of the request
+
+    Returns:
+        float number of values
+
+    """
+    start_date = datetime.date.fromisoformat(params["startDate"])
+    end_date = datetime.date.fromisoformat(params["endDate"])
+    days = (end_date - start_date).days + 1
+
+    securities = params["query"].split(QUERY_SEPARATOR)
+    fields = sum(len(security.split(":", 1)[1].split(",")) for security in securities)
+
+    return days * POINTS_PER_DAY[params["frequency"]] * fields
+
+
+def _column(series:list,
+            field:str) -> np.ndarray:
+    """
+    This function returns the values of a field of the series as a numpy array,
+    int64 if all the values are integers, float64 otherwise with nan for missing values.
+    """
+    values = [row.get(field) for row in series]
+    if values and all(type(value) is int for value in values):
+        return np.array(values, dtype=np.int64)
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def series_arrays(series:list,
+                  field:str|list) -> dict:
+    """
+    This function decodes the series of the time series API into columns.
+
+    Args:
+        series (list) : list of dict returned by the time series API
+        field (str|list) : fields of the series
+
+    Returns:
+        dict with a numpy array per field and the key date with a datetime64 array
+
+    Examples:
+        >>> series_arrays([{'nav': 150.01, 'totalReturn': 232.36911, 'date': '2025-07-03'}], ["nav", "totalReturn"])
+
+    """
+    fields = [field] if isinstance(field, str) else field
+    arrays = {"date": np.array([row["date"] for row in series], dtype="datetime64[ns]")}
+    for name in fields:
+        arrays[name] = _column(series, name)
+    return arrays
+
+
+def series_frame(series:list,
+                 field:str|list) -> pd.DataFrame:
+    """
+    This function decodes the series of the time series API into a DataFrame.
+
+    Args:
+        series (list) : list of dict returned by the time series API
+        field (str|list) : fields of the series
+
+    Returns:
+        DataFrame with one column per field and a DatetimeIndex named date
+
+    Examples:
+        >>> series_frame([{'nav': 150.01, 'totalReturn': 232.36911, 'date': '2025-07-03'}], ["nav", "totalReturn"])
+
+    """
+    arrays = series_arrays(series, field)
+    index = pd.DatetimeIndex(arrays.pop("date"), name="date")
+    return pd.DataFrame(arrays, index=index)
+
+
+def check_output(output:str) -> None:
+    """
+    This function raises an error if the output format of the time series is not valid.
+
+    Raises:
+        TypeError: raised whenever the parameter type is not the type expected
+        ValueError : raised whenever the output is not valid
+
+    """
+    if not isinstance(output, str):
+        raise TypeError("output parameter should be a string")
+
+    if output not in OUTPUT:
+        raise ValueError(
+            f"output parameter must take one of the following value : {', '.join(OUTPUT)}"
+        )
+
+
+def series_output(series:list,
+                  field:str|list,
+                  output:str="records") -> list|pd.DataFrame|dict:
+    """
+    This function returns the series of the time series API in the output format.
+
+    Args:
+        series (list) : list of dict returned by the time series API
+        field (str|list) : fields of the series
+        output (str) : records for the list of dict, frame for a DataFrame,
+        arrays for a dict of numpy arrays
+
+    Returns:
+        list of dict, DataFrame or dict of numpy arrays
+
+    Raises:
+        TypeError: raised whenever the parameter type is not the type expected
+        ValueError : raised whenever the output is not valid
+
+    """
+    check_output(output)
+    if output == "frame":
+        return series_frame(series, field)
+    if output == "arrays":
+        return series_arrays(series, field)
+    return series
@@ -0,0 +1,243 @@
+"""module to store the time series of Morningstar locally"""
+import datetime
+import os
+import sqlite3
+import threading
+
+
+# number of days before today during which the data may still be published,
+# these days are not recorded as covered unless the API returned a value for them
+SETTLE_DAYS = 3
+
+
+def _to_date(value:datetime.date|str) -> datetime.date:
+    """
+    This function converts a date, a datetime or an iso string to a date.
+    """
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(value[:10])
+
+
+class TimeSeriesStore():
+    """
+    Local SQLite store of the time series, the values are kept by security, field and
+    frequency with the date ranges already requested so only the missing dates are
+    requested again.
+
+    Args:
+        path (str) : path of the SQLite file, ":memory:" for a store in memory
+
+    Examples:
+        >>> TimeSeriesStore("~/.mstarpy/timeseries.db")
+
+    Raises:
+        TypeError: raised whenever the parameter type is not the type expected
+
+    """
+
+    def __init__(self,
+                 path:str) -> None:
+
+        if not isinstance(path, str):
+            raise TypeError("path parameter should be a string")
+
+        self.path = os.path.expanduser(path) if path != ":memory:" else path
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._connection as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS series (
+                securityID TEXT, field TEXT, frequency TEXT, date TEXT, value,
+                PRIMARY KEY (securityID, field, frequency, date))"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS coverage (
+                securityID TEXT, field TEXT, frequency TEXT, start TEXT, end TEXT)"""
+            )
+            conn.execute(
+                """CREATE INDEX IF NOT EXISTS coverage_key
+                ON coverage (securityID, field, frequency)"""
+            )
+
+    def _coverage(self,
+                  conn:sqlite3.Connection,
+                  code:str,
+                  field:str,
+                  frequency:str) -> list[tuple[datetime.date, datetime.date]]:
+        """
+        This function returns the sorted date ranges covered for a security, field and frequency.
+        """
+        rows = conn.execute(
+            "SELECT start, end FROM coverage WHERE securityID=? AND field=? AND frequency=? ORDER BY start",
+            (code, field, frequency),
+        ).fetchall()
+        return [(_to_date(start), _to_date(end)) for start, end in rows]
+
+    def missing(self,
+                code:str,
+                fields:list,
+                frequency:str,
+                start_date:datetime.date,
+                end_date:datetime.date) -> list[tuple[datetime.date, datetime.date]]:
+        """
+        This function returns the date ranges which are not covered by the store
+        for at least one of the fields.
+
+        Args:
+            code (str) : securityID of the security
+            fields (list) : fields of the time series
+            frequency (str) : frequency code of the time series API
+            start_date (datetime) : start date of the history
+            end_date (datetime) : end date of the history
+
+        Returns:
+            list of tuple (start date, end date) to request
+
+        Examples:
+            >>> TimeSeriesStore("timeseries.db").missing("F00000MRIF", ["nav"], "d", datetime.date(2020, 1, 1), datetime.date.today())
+
+        """
+        start_date, end_date = _to_date(start_date), _to_date(end_date)
+        one_day = datetime.timedelta(days=1)
+
+        with self._lock:
+            # days since start_date covered for every field
+            covered = set()
+            for i, field in enumerate(fields):
+                dates = set()
+                for start, end in self._coverage(self._connection, code, field, frequency):
+                    start, end = max(start, start_date), min(end, end_date)
+                    dates.update(range((start - start_date).days, (end - start_date).days + 1))
+                covered = dates if i == 0 else covered & dates
+
+        segments = []
+        day = 0
+        last = (end_date - start_date).days
+        while day <= last:
+            if day in covered:
+                day += 1
+                continue
+            start = day
+            while day <= last and day not in covered:
+                day += 1
+            segments.append((start_date + start * one_day, start_date + (day - 1) * one_day))
+        return segments
+
+    def save(self,
+             code:str,
+             fields:list,
+             frequency:str,
+             start_date:datetime.date,
+             end_date:datetime.date,
+             series:list) -> None:
+        """
+        This function stores the series of a security and records the date range as covered,
+        the recent days without value are not recorded as covered.
+
+        Args:
+            code (str) : securityID of the security
+            fields (list) : fields of the time series
+            frequency (str) : frequency code of the time series API
+            start_date (datetime) : start date of the request
+            end_date (datetime) : end date of the request
+            series (list) : list of dict returned by the time series API
+
+        """
+        start_date, end_date = _to_date(start_date), _to_date(end_date)
+
+        last_date = max((_to_date(row["date"]) for row in series), default=None)
+        settled = datetime.date.today() - datetime.timedelta(days=SETTLE_DAYS)
+        covered_end = min(end_date, max(settled, last_date or settled))
+
+        with self._lock, self._connection as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO series VALUES (?, ?, ?, ?, ?)",
+                [(code, field, frequency, row["date"], row.get(field))
+                 for row in series for field in fields],
+            )
+            if covered_end < start_date:
+                return
+
+            for field in fields:
+                # merge the new range with the ranges it overlaps or touches
+                start, end = start_date, covered_end
+                for old_start, old_end in self._coverage(conn, code, field, frequency):
+                    if old_start <= end + datetime.timedelta(days=1) and start <= old_end + datetime.timedelta(days=1):
+                        start, end = min(start, old_start), max(end, old_end)
+                        conn.execute(
+                            """DELETE FROM coverage WHERE securityID=? AND field=? AND frequency=?
+                            AND start=? AND end=?""",
+                            (code, field, frequency, old_start.isoformat(), old_end.isoformat()),
+                        )
+                conn.execute(
+                    "INSERT INTO coverage VALUES (?, ?, ?, ?, ?)",
+                    (code, field, frequency, start.isoformat(), end.isoformat()),
+                )
+
+    def load(self,
+             code:str,
+             fields:list,
+             frequency:str,
+             start_date:datetime.date,
+             end_date:datetime.date) -> list[dict]:
+        """
+        This function reads the stored series of a security.
+
+        Args:
+            code (str) : securityID of the security
+            fields (list) : fields of the time series
+            frequency (str) : frequency code of the time series API
+            start_date (datetime) : start date of the history
+            end_date (datetime) : end date of the history
+
+        Returns:
+            list of dict time series sorted by date, in the format of the time series API
+
+        """
+        start_date, end_date = _to_date(start_date), _to_date(end_date)
+        placeholders = ",".join("?" for _ in fields)
+
+        with self._lock:
+            rows = self._connection.execute(
+                f"""SELECT date, field, value FROM series
+                WHERE securityID=? AND frequency=? AND field IN ({placeholders})
+                AND date >= ? AND date < ? ORDER BY date""",
+                (code, frequency, *fields, start_date.isoformat(),
+                 (end_date + datetime.timedelta(days=1)).isoformat()),
+            ).fetchall()
+
+        series = {}
+        for date, field, value in rows:
+            series.setdefault(date, dict.fromkeys(fields))[field] = value
+
+        return [values | {"date": date} for date, values in series.items()]
+
+    def clear(self,
+              code:str=None) -> None:
+        """
+        This function deletes the stored series of a security or of all the securities.
+
+        Args:
+            code (str) : securityID of the security, all the securities if None
+
+        Examples:
+            >>> TimeSeriesStore("timeseries.db").clear("F00000MRIF")
+
+        """
+        where, args = ("WHERE securityID=?", (code,)) if code else ("", ())
+        with self._lock, self._connection as conn:
+            conn.execute(f"DELETE FROM series {where}", args)
+            conn.execute(f"DELETE FROM coverage {where}", args)
+
+    def close(self) -> None:
+        """
+        This function closes the connection to the SQLite file.
+        """
+        with self._lock:
+            self._connection.close()
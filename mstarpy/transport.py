@@ -0,0 +1,594 @@
+"""module to configure the HTTP transport of the Morningstar session"""
+import asyncio
+import collections
+import copy
+import email.utils
+import random
+import threading
+import time
+import urllib.parse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .error import RETRYABLE_STATUS
+
+
+# hosts requested by mstarpy
+HOSTS = {
+    "api-global": "https://api-global.morningstar.com/",
+    "global": "https://global.morningstar.com/",
+    "lt": "https://lt.morningstar.com/",
+    "us-api": "https://www.us-api.morningstar.com/",
+    "www": "https://www.morningstar.com/",
+}
+
+
+# maximum number of keep-alive connections kept open per host
+POOL_SIZE = {
+    "api-global": 20,
+    "global": 10,
+    "lt": 10,
+    "us-api": 20,
+    "www": 10,
+}
+
+
+# default requests per second, burst and maximum number of requests in flight of the hosts
+# given to a RateLimiter, the number of requests in flight adapts between 1 and the maximum
+RATE_LIMIT = {
+    "api-global": {"rate": 20.0, "burst": 40, "concurrency": 20},
+    "global": {"rate": 10.0, "burst": 20, "concurrency": 10},
+    "lt": {"rate": 10.0, "burst": 20, "concurrency": 10},
+    "us-api": {"rate": 20.0, "burst": 40, "concurrency": 20},
+    "www": {"rate": 5.0, "burst": 10, "concurrency": 10},
+}
+
+
+# seconds between two decreases of the concurrency of a host
+BACKOFF_INTERVAL = 1.0
+
+
+# seconds between two checks of a free slot of concurrency by the asynchronous requests
+SLOT_POLL_INTERVAL = 0.01
+
+
+# connect and read timeouts in seconds of the requests
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+
+# connect and read timeouts in seconds by endpoint, the keys are hosts of HOSTS
+# or parts of the url, the longest key found in the url is used
+TIMEOUT = {
+    "stores/realtime": (5.0, 60.0),
+}
+
+
+# methods which can be sent again without side effect
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def mount_pools(session:requests.Session,
+                pool_sizes:dict=None) -> None:
+    """
+    This function mounts one connection pool per Morningstar host on the session
+    so connections are kept alive and reused between requests.
+
+    Args:
+        session (requests.Session) : session where the pools are mounted
+        pool_sizes (dict) : size of the pool per host, the keys are the ones of HOSTS,
+        default sizes are in POOL_SIZE
+
+    Raises:
+        TypeError: raised whenever the parameter type is not the type expected
+        ValueError : raised whenever a host is not valid
+
+    Examples:
+        >>> mount_pools(requests.Session(), {"api-global": 50, "us-api": 50})
+
+    """
+    if pool_sizes and not isinstance(pool_sizes, dict):
+        raise TypeError("pool_sizes parameter should be a dict")
+
+    pool_sizes = POOL_SIZE | (pool_sizes or {})
+
+    for host, size in pool_sizes.items():
+        if host not in HOSTS:
+            raise ValueError(
+                f"pool_sizes keys can only take one of the values : {', '.join(HOSTS)}"
+            )
+        if not isinstance(size, int) or size < 1:
+            raise ValueError(f"pool size of {host} should be a positive integer")
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+        session.mount(HOSTS[host], adapter)
+
+
+def request_timeout(url:str,
+                    timeouts:dict,
+                    default:tuple=DEFAULT_TIMEOUT) -> tuple:
+    """
+    This function returns the connect and read timeouts of a request.
+
+    Args:
+        url (str) : url of the request
+        timeouts (dict) : timeouts by endpoint, the keys are hosts of HOSTS or parts of the url
+        default (tuple) : timeouts of the endpoints not in timeouts
+
+    Returns:
+        tuple connect timeout, read timeout
+
+    Examples:
+        >>> request_timeout("https://www.morningstar.com/api/v2/stores/realtime/quotes", TIMEOUT)
+        (5.0, 60.0)
+
+    """
+    keys = [key for key in timeouts
+            if (key in HOSTS and url.startswith(HOSTS[key])) or (key not in HOSTS and key in url)]
+    if not keys:
+        return default
+    return timeouts[max(keys, key=len)]
+
+
+# headers which do not change the response of a request, they are not part of its key
+KEYLESS_HEADERS = {"user-agent"}
+
+
+def request_key(url:str,
+                params:dict|list=None,
+                headers:dict=None,
+                proxies:dict=None) -> str:
+    """
+    This function returns a key identifying a GET request by its url, its parameters,
+    its headers and its proxies, the order of the parameters and of the headers does not matter.
+    The headers of KEYLESS_HEADERS are not part of the key.
+    """
+    key = url
+    if params:
+        items = params.items() if isinstance(params, dict) else params
+        key += f"?{urllib.parse.urlencode(sorted(items), doseq=True)}"
+    headers = sorted((name.lower(), str(value)) for name, value in (headers or {}).items()
+                     if name.lower() not in KEYLESS_HEADERS)
+    if headers:
+        key += f"#headers={urllib.parse.urlencode(headers)}"
+    if proxies:
+        key += f"#proxies={urllib.parse.urlencode(sorted(proxies.items()))}"
+    return key
+
+
+class _Flight():
+    """
+    Request in flight, the followers wait for its result.
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight():
+    """
+    Coalesces identical calls made at the same time, the first call is executed
+    and the other ones wait for its result instead of executing the call again.
+
+    Examples:
+        >>> flights = SingleFlight()
+        >>> flights.do(request_key(url, params), lambda: session.get(url, params=params))
+
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.coalesced = 0
+
+    def do(self,
+           key:str,
+           call):
+        """
+        This function executes the call, or waits for the result of the identical call in flight.
+
+        Args:
+            key (str) : key identifying the call
+            call (callable) : function without argument to execute
+
+        Returns:
+            the result of the call, a shallow copy for the calls which waited
+
+        Raises:
+            the exception raised by the call
+
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.copy(flight.result)
+
+        try:
+            flight.result = call()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+        return flight.result
+
+
+def throttled(response:requests.Response) -> bool:
+    """
+    This function returns True if the response means that the client is sending too many requests,
+    status 429, 202 or a WAF challenge.
+    """
+    return (response.status_code in (202, 429)
+            or response.headers.get("x-amzn-waf-action") == "challenge")
+
+
+class HostLimiter():
+    """
+    Limits the requests to a host with a token bucket and an adaptive number of requests
+    in flight, which is halved when the host throttles the client and increased
+    by one every round of successful requests (AIMD).
+
+    Args:
+        rate (float) : requests per second
+        burst (int) : maximum number of requests sent at once after a pause
+        concurrency (int) : maximum number of requests in flight
+
+    Raises:
+        ValueError : raised whenever a parameter is not positive
+
+    """
+
+    def __init__(self,
+                 rate:float,
+                 burst:int,
+                 concurrency:int) -> None:
+
+        if not isinstance(rate, (int, float)) or rate <= 0:
+            raise ValueError("rate should be a positive number")
+
+        if not isinstance(burst, int) or burst < 1:
+            raise ValueError("burst should be a positive integer")
+
+        if not isinstance(concurrency, int) or concurrency < 1:
+            raise ValueError("concurrency should be a positive integer")
+
+        self.rate = float(rate)
+        self.burst = burst
+        self.max_concurrency = concurrency
+        self.concurrency = float(concurrency)
+        self.tokens = float(burst)
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self._updated = time.monotonic()
+        self._backoff = 0.0
+        self._sent = collections.deque()
+        self._condition = threading.Condition()
+
+    def _refill(self,
+                now:float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _take(self) -> float|None:
+        """
+        This function takes a token and a slot of concurrency if they are available.
+
+        Returns:
+            None if they are taken, otherwise the time in seconds until the next token,
+            0 if only a slot of concurrency is missing
+        """
+        now = time.monotonic()
+        self._refill(now)
+        if self.tokens >= 1 and self.in_flight < int(self.concurrency):
+            self.tokens -= 1
+            self.in_flight += 1
+            self.requests += 1
+            self._sent.append(now)
+            return None
+        return (1 - self.tokens) / self.rate if self.tokens < 1 else 0.0
+
+    def acquire(self) -> None:
+        """
+        This function waits until a token and a slot of concurrency are available.
+        """
+        with self._condition:
+            while True:
+                wait = self._take()
+                if wait is None:
+                    return
+                self._condition.wait(wait or None)
+
+    async def acquire_async(self) -> None:
+        """
+        This function waits without blocking the event loop until a token
+        and a slot of concurrency are available.
+        """
+        while True:
+            with self._condition:
+                wait = self._take()
+            if wait is None:
+                return
+            await asyncio.sleep(wait or SLOT_POLL_INTERVAL)
+
+    def release(self,
+                response:requests.Response|None) -> None:
+        """
+        This function frees the slot of a request and adapts the concurrency to its response.
+
+        Args:
+            response (requests.Response) : response of the request, None if it failed
+
+        """
+        with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if response is not None and throttled(response):
+                self.throttled += 1
+                # one decrease per interval, the requests in flight were sent with the old limit
+                if now - self._backoff >= BACKOFF_INTERVAL:
+                    self.concurrency = max(1.0, self.concurrency / 2)
+                    self._backoff = now
+            elif response is not None and response.status_code < 500:
+                self.concurrency = min(self.max_concurrency,
+                                       self.concurrency + 1 / self.concurrency)
+            self._condition.notify_all()
+
+    def stats(self) -> dict:
+        """
+        This function returns the limits and the current rate of the host.
+        """
+        with self._condition:
+            now = time.monotonic()
+            self._refill(now)
+            while self._sent and self._sent[0] < now - 10:
+                self._sent.popleft()
+            return {"rate": self.rate,
+                    "burst": self.burst,
+                    "concurrency": int(self.concurrency),
+                    "max_concurrency": self.max_concurrency,
+                    "in_flight": self.in_flight,
+                    "tokens": round(self.tokens, 2),
+                    "current_rate": len(self._sent) / 10,
+                    "requests": self.requests,
+                    "throttled": self.throttled}
+
+
+class RateLimiter():
+    """
+    Rate limiter of the requests of a session, one HostLimiter per host given in limits,
+    the requests to the other hosts are not limited. No host is limited by default.
+
+    Args:
+        limits (dict) : limits per host, the keys are the ones of HOSTS and the values dict
+        with the keys rate, burst and concurrency, the missing keys are the ones of RATE_LIMIT
+
+    Examples:
+        >>> RateLimiter({"api-global": {"rate": 50.0, "concurrency": 40}})
+        >>> RateLimiter({"www": {}})
+
+    Raises:
+        TypeError: raised whenever the parameter type is not the type expected
+        ValueError : raised whenever a host or a limit is not valid
+
+    """
+
+    def __init__(self,
+                 limits:dict=None) -> None:
+
+        if limits and not isinstance(limits, dict):
+            raise TypeError("limits parameter should be a dict")
+
+        limits = limits or {}
+        for host, limit in limits.items():
+            if host not in HOSTS:
+                raise ValueError(
+                    f"limits keys can only take one of the values : {', '.join(HOSTS)}"
+                )
+            if not isinstance(limit, dict):
+                raise TypeError(f"limits of {host} should be a dict")
+
+        self.hosts = {host: HostLimiter(**(RATE_LIMIT[host] | limit))
+                      for host, limit in limits.items()}
+
+    def host(self,
+             url:str) -> HostLimiter|None:
+        """
+        This function returns the limiter of the host of an url, None if the host is not limited.
+        """
+        for host, prefix in HOSTS.items():
+            if url.startswith(prefix):
+                return self.hosts.get(host)
+        return None
+
+    def stats(self) -> dict:
+        """
+        This function returns the limits and the current rate of every host.
+        """
+        return {host: limiter.stats() for host, limiter in self.hosts.items()}
+
+
+class RetryBudget():
+    """
+    Budget of retries of a host, every request adds ratio to the budget
+    and every retry takes one, so the retries stay a fraction of the requests.
+
+    Args:
+        ratio (float) : retries allowed per request
+        minimum (int) : retries allowed before any request, also the minimum balance kept
+        after a pause
+
+    """
+
+    def __init__(self,
+                 ratio:float=0.2,
+                 minimum:int=10) -> None:
+        self.ratio = ratio
+        self.minimum = minimum
+        self.balance = float(minimum)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.balance = min(self.balance + self.ratio, max(self.minimum, 100 * self.ratio))
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+class RetryPolicy():
+    """
+    Policy of retry of the requests of a session: the idempotent requests which fail
+    with a transient status or a connection error are sent again after an exponential
+    backoff with jitter, or after the delay of the header Retry-After, as long as
+    the retry budget of the host is not empty.
+
+    Args:
+        total (int) : maximum number of retries of a request
+        backoff (float) : base of the backoff in seconds, the delay before the retry n
+        is a random time between 0 and backoff * 2 ** n
+        max_backoff (float) : maximum delay before a retry, a Retry-After longer than
+        this delay is not waited and the response is returned
+        statuses (set) : status codes which are retried
+        methods (set) : methods which are retried
+        budget (float) : retries allowed per request sent to a host
+        min_budget (int) : retries allowed to a host before any request
+
+    Examples:
+        >>> RetryPolicy(total=5, backoff=1.0)
+        >>> RetryPolicy(total=0)
+
+    Raises:
+        TypeError: raised whenever the parameter type is not the type expected
+        ValueError : raised whenever a parameter is negative
+
+    """
+
+    def __init__(self,
+                 total:int=3,
+                 backoff:float=0.5,
+                 max_backoff:float=30.0,
+                 statuses:set=RETRYABLE_STATUS,
+                 methods:set=IDEMPOTENT_METHODS,
+                 budget:float=0.2,
+                 min_budget:int=10) -> None:
+
+        if not isinstance(total, int) or total < 0:
+            raise ValueError("total parameter should be a positive integer or 0")
+
+        for name, value in (("backoff", backoff), ("max_backoff", max_backoff), ("budget", budget)):
+            if not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"{name} parameter should be a positive number")
+
+        if not isinstance(min_budget, int) or min_budget < 0:
+            raise ValueError("min_budget parameter should be a positive integer or 0")
+
+        self.total = total
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.budget = budget
+        self.min_budget = min_budget
+        self.retries = 0
+        self._budgets = {}
+        self._lock = threading.Lock()
+
+    def _host_budget(self,
+                     url:str) -> RetryBudget:
+        host = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            if host not in self._budgets:
+                self._budgets[host] = RetryBudget(self.budget, self.min_budget)
+            return self._budgets[host]
+
+    @staticmethod
+    def retry_after(response:requests.Response) -> float|None:
+        """
+        This function returns the delay in seconds of the header Retry-After of a response,
+        None if the header is missing or invalid.
+        """
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        if value.strip().isdigit():
+            return float(value)
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, date.timestamp() - time.time())
+
+    def delay(self,
+              url:str,
+              method:str,
+              attempt:int,
+              response:requests.Response=None,
+              error:Exception=None) -> float|None:
+        """
+        This function returns the delay before sending a request again,
+        None if the request must not be sent again.
+
+        Args:
+            url (str) : url of the request
+            method (str) : method of the request
+            attempt (int) : number of retries already done
+            response (requests.Response) : response of the request, None if it failed
+            error (Exception) : error raised by the request
+
+        Returns:
+            float delay in seconds or None
+
+        """
+        budget = self._host_budget(url)
+        if attempt == 0:
+            budget.deposit()
+
+        if attempt >= self.total or method.upper() not in self.methods:
+            return None
+
+        if response is not None and response.status_code not in self.statuses:
+            return None
+
+        if response is None and not isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return None
+
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        retry_after = self.retry_after(response) if response is not None else None
+        if retry_after is not None:
+            if retry_after > self.max_backoff:
+                return None
+            delay = max(delay, retry_after)
+
+        if not budget.withdraw():
+            return None
+
+        with self._lock:
+            self.retries += 1
+        return delay
+
+    def stats(self) -> dict:
+        """
+        This function returns the number of retries and the retry budget left per host.
+        """
+        with self._lock:
+            return {"retries": self.retries,
+                    "budget": {host: round(budget.balance, 2) for host, budget in self._budgets.items()}}
@@ -1,12 +1,15 @@
+from __future__ import annotations
 import atexit
 from contextlib import contextmanager
 import os
 import random
 import signal
+import threading
 import weakref
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+from .lazy import lazy_import
+
+webdriver = lazy_import("selenium.webdriver")
 
 
 APIKEY = "lstzFDEOhfFNMLikKa0am9mgEKLBl49T"
@@ -91,6 +94,10 @@ EXCHANGE = {
 }
 
 
+# cookies set by the WAF challenge of morningstar.com, the API is reachable as long as they are valid
+WAF_COOKIES = ["aws-waf-token"]
+
+
 FILTER_TYPE = [
         'basics',
         'dividends',
@@ -220,8 +227,36 @@ def cleanup_all_webdrivers():
         except Exception:
             pass
 
-atexit.register(cleanup_all_webdrivers)
-signal.signal(signal.SIGTERM, lambda s, f: cleanup_all_webdrivers())
+_cleanup_registered = False
+_cleanup_lock = threading.Lock()
+
+
+def _register_cleanup() -> None:
+    """
+    This function registers the cleanup of the webdrivers at exit and on SIGTERM,
+    once and only when the first browser is started.
+    """
+    global _cleanup_registered
+    with _cleanup_lock:
+        if _cleanup_registered:
+            return
+        _cleanup_registered = True
+    atexit.register(cleanup_all_webdrivers)
+    try:
+        signal.signal(signal.SIGTERM, lambda s, f: cleanup_all_webdrivers())
+    except ValueError:
+        # the handler can only be set from the main thread
+        pass
+
+
+def _start_webdriver():
+    """
+    This function starts a browser and registers it for the cleanup.
+    """
+    _register_cleanup()
+    driver = webdriver.Chrome(options=browser_options())
+    _active_webdrivers.add(driver)
+    return driver
 
 @contextmanager
 def get_webdriver():
@@ -231,8 +266,7 @@ def get_webdriver():
     """
     driver = None
     try:
-        driver = webdriver.Chrome(options=browser_options())
-        _active_webdrivers.add(driver)
+        driver = _start_webdriver()
         yield driver
     finally:
         if driver:
@@ -242,9 +276,167 @@ def get_webdriver():
                 pass
 
 
-def browser_options() -> Options:
+class BrowserPool():
+    """
+    Bounded pool of browsers kept open between the refreshes of the cookies,
+    so a refresh does not wait for a new browser to start.
+
+    Args:
+        size (int) : maximum number of browsers open at the same time
+
+    Examples:
+        >>> with BrowserPool(2).browser() as driver:
+        ...     driver.get("https://global.morningstar.com")
+
+    Raises:
+        ValueError : raised whenever size is not a positive integer
+
+    """
+
+    def __init__(self,
+                 size:int=1) -> None:
+
+        if not isinstance(size, int) or size < 1:
+            raise ValueError("size parameter should be a positive integer")
+
+        self.size = size
+        self._idle = []
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def browser(self):
+        """
+        This function lends a browser of the pool, a new one is started if none is idle.
+        The cookies of the browser are deleted before it is lent and the browser is
+        closed instead of being returned to the pool if an error is raised.
+        """
+        self._slots.acquire()
+        driver = None
+        try:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                driver = _start_webdriver()
+            else:
+                driver.delete_all_cookies()
+            yield driver
+        except BaseException:
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+                driver = None
+            raise
+        finally:
+            if driver is not None:
+                with self._lock:
+                    self._idle.append(driver)
+            self._slots.release()
+
+    def close(self) -> None:
+        """
+        This function closes the idle browsers of the pool.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+_browser_pool = None
+_browser_pool_lock = threading.Lock()
+
+
+def browser_pool() -> BrowserPool:
+    """
+    This function returns the browser pool shared by the sessions, its size is
+    the environment variable MSTARPY_BROWSER_POOL_SIZE or 1.
+    """
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool(int(os.environ.get("MSTARPY_BROWSER_POOL_SIZE", 1)))
+        return _browser_pool
+
+
+def cookies_set(names:list):
+    """
+    This function returns a readiness condition of the browser, met when
+    the cookies named names are set.
+
+    Args:
+        names (list) : names of the cookies expected
+
+    Returns:
+        callable taking the webdriver and returning True when the cookies are set
+
+    """
+    def condition(driver) -> bool:
+        return set(names) <= {cookie["name"] for cookie in driver.get_cookies()}
+    return condition
+
+
+def resource_loaded(fragment:str):
+    """
+    This function returns a readiness condition of the browser, met when a network request
+    whose url contains fragment has completed.
+
+    Args:
+        fragment (str) : part of the url of the request
+
+    Returns:
+        callable taking the webdriver and returning True when the request has completed
+
+    """
+    def condition(driver) -> bool:
+        return bool(driver.execute_script(
+            "return performance.getEntriesByType('resource')"
+            ".some(e => e.name.includes(arguments[0]) && e.responseEnd > 0)",
+            fragment,
+        ))
+    return condition
+
+
+def wait_until_ready(driver,
+                     conditions:dict,
+                     timeout:float,
+                     interval:float=0.1) -> str|None:
+    """
+    This function waits until one of the readiness conditions is met or the timeout is reached.
+
+    Args:
+        driver : selenium webdriver
+        conditions (dict) : readiness conditions by name
+        timeout (float) : maximum time to wait in seconds
+        interval (float) : time between two checks in seconds
+
+    Returns:
+        str name of the condition met, None if the timeout is reached
+
+    Examples:
+        >>> wait_until_ready(driver, {"cookies": cookies_set(WAF_COOKIES)}, 8)
+
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    def ready(driver) -> str|bool:
+        return next((name for name, condition in conditions.items() if condition(driver)), False)
+
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=interval).until(ready)
+    except TimeoutException:
+        return None
+
+
+def browser_options() -> webdriver.ChromeOptions:
     """Builds browser options."""
-    options = Options()
+    options = webdriver.ChromeOptions()
     #options.add_argument("--headless=new")
     options.add_argument("--disable-blink-features=AutomationControlled")
     # loading additional user defined flags, eg. "--no-sandbox --disable-dev-shm-usage --disable-gpu"
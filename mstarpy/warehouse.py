@@ -0,0 +1,337 @@
+"""module to store the data of Morningstar in a local Parquet warehouse"""
+from __future__ import annotations
+import datetime
+import json
+import os
+import uuid
+
+from .funds import Funds
+from .lazy import lazy_import
+from .screener import screener_frame
+from .security import Security
+from .stock import Stock
+
+pd = lazy_import("pandas")
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.fs as fs
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+def flatten_columns(data:dict,
+                    index:str="columnDefs") -> pd.DataFrame:
+    """
+    This function flattens a columnar response, such as the trailing return,
+    where a list of labels is followed by lists of values of the same length.
+
+    Args:
+        data (dict) : response of the API
+        index (str) : key of the list of labels
+
+    Returns:
+        DataFrame with one row per label and one column per list of values
+
+    Examples:
+        >>> flatten_columns(Funds("myria").trailingReturn())
+
+    """
+    labels = data.get(index) or []
+    columns = {"period": labels}
+    for key, values in data.items():
+        if key != index and isinstance(values, list) and len(values) == len(labels):
+            columns[key] = values
+    return pd.DataFrame(columns)
+
+
+def flatten_statement(data:dict) -> pd.DataFrame:
+    """
+    This function flattens a financial statement, the rows and their sub levels
+    become one record per line and period.
+
+    Args:
+        data (dict) : response of Stock.financialStatement
+
+    Returns:
+        DataFrame with the columns label, parent, level, period and value
+
+    Examples:
+        >>> flatten_statement(Stock("US0378331005").financialStatement("incomestatement"))
+
+    """
+    periods = data.get("columnDefs") or []
+    records = []
+
+    def rows(lines:list, parent:str|None, level:int) -> None:
+        for line in lines or []:
+            label = line.get("label")
+            for period, value in zip(periods, line.get("datum") or []):
+                records.append({"label": label,
+                                "parent": parent,
+                                "level": level,
+                                "period": period,
+                                "value": value})
+            rows(line.get("subLevel"), label, level + 1)
+
+    rows(data.get("rows"), None, 0)
+    return pd.DataFrame.from_records(records, columns=["label", "parent", "level", "period", "value"])
+
+
+def flatten_screener(results:list) -> pd.DataFrame:
+    """
+    This function flattens the results of the screener, the ids of meta and
+    the value of every field become columns.
+
+    Args:
+        results (list) : results of MorningstarSession.screener_universe
+
+    Returns:
+        DataFrame with one row per security
+
+    Examples:
+        >>> flatten_screener(session.screener_universe("a", field=["name", "isin"]))
+
+    """
+    return screener_frame(results)
+
+
+def _parquet_frame(frame:pd.DataFrame) -> pd.DataFrame:
+    """
+    This function makes the object columns writable in Parquet, the nested values are
+    dumped in json and the columns mixing types are converted to strings.
+    """
+    frame = frame.copy()
+    for column in frame.columns[frame.dtypes == object]:
+        values = frame[column]
+        types = {type(value) for value in values if value is not None and value == value}
+        if types & {dict, list}:
+            values = values.map(lambda x: json.dumps(x) if isinstance(x, (dict, list)) else x)
+            types = {type(value) for value in values if value is not None and value == value}
+        if len(types) > 1:
+            values = values.map(lambda x: x if x is None or x != x else str(x))
+        frame[column] = values
+    return frame
+
+
+class Warehouse():
+    """
+    Local warehouse of Parquet datasets, every dataset is partitioned by the date
+    of extraction and every record carries the timestamp of extraction in the column asOf.
+
+    Args:
+        path (str) : folder of the warehouse
+
+    Examples:
+        >>> Warehouse("~/.mstarpy/warehouse")
+
+    Raises:
+        ImportError: raised whenever pyarrow is not installed
+        TypeError: raised whenever the parameter type is not the type expected
+
+    """
+
+    def __init__(self,
+                 path:str) -> None:
+
+        if pa is None:
+            raise ImportError(
+                "pyarrow is required by the warehouse, install it with pip install mstarpy[parquet]"
+            )
+
+        if not isinstance(path, str):
+            raise TypeError("path parameter should be a string")
+
+        self.path = os.path.expanduser(path)
+
+    def write(self,
+              dataset:str,
+              frame:pd.DataFrame,
+              asof:datetime.datetime=None) -> pd.DataFrame:
+        """
+        This function appends a DataFrame to a dataset of the warehouse.
+
+        Args:
+            dataset (str) : name of the dataset
+            frame (DataFrame) : records to write
+            asof (datetime) : timestamp of extraction, default is now in UTC
+
+        Returns:
+            DataFrame written with the columns asOf and asOfDate
+
+        Examples:
+            >>> Warehouse("warehouse").write("nav", df)
+
+        Raises:
+            TypeError: raised whenever the parameter type is not the type expected
+
+        """
+        if not isinstance(dataset, str):
+            raise TypeError("dataset parameter should be a string")
+
+        if not isinstance(frame, pd.DataFrame):
+            raise TypeError("frame parameter should be a DataFrame")
+
+        if asof and not isinstance(asof, datetime.datetime):
+            raise TypeError("asof parameter should be a datetime.datetime")
+
+        asof = pd.Timestamp(asof or datetime.datetime.now(datetime.timezone.utc))
+        frame = _parquet_frame(frame).assign(asOf=asof, asOfDate=asof.strftime("%Y-%m-%d"))
+
+        if not frame.empty:
+            pq.write_to_dataset(pa.Table.from_pandas(frame, preserve_index=False),
+                                os.path.join(self.path, dataset),
+                                partition_cols=["asOfDate"],
+                                basename_template=f"{asof.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex}-{{i}}.parquet")
+        return frame
+
+    def read(self,
+             dataset:str,
+             columns:list=None,
+             filters=None) -> pd.DataFrame:
+        """
+        This function reads a dataset of the warehouse, the files are memory mapped
+        and only the columns requested are read.
+
+        Args:
+            dataset (str) : name of the dataset
+            columns (list) : columns to read, all the columns if None
+            filters : pyarrow filter expression or list of tuple, example : [("asOfDate", ">=", "2025-01-01")]
+
+        Returns:
+            DataFrame of the dataset
+
+        Examples:
+            >>> Warehouse("warehouse").read("nav", columns=["securityID", "date", "nav"])
+
+        """
+        path = os.path.join(self.path, dataset)
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=columns)
+
+        filesystem = fs.LocalFileSystem(use_mmap=True)
+        data = ds.dataset(path, format="parquet", partitioning="hive", filesystem=filesystem)
+        # the files written at different dates may not have the same columns
+        schema = pa.unify_schemas([data.schema] + [fragment.physical_schema
+                                                   for fragment in data.get_fragments()])
+        data = ds.dataset(path, schema=schema, format="parquet", partitioning="hive",
+                          filesystem=filesystem)
+        if filters is not None and not isinstance(filters, ds.Expression):
+            filters = pq.filters_to_expression(filters)
+        return data.to_table(columns=columns, filter=filters).to_pandas()
+
+    def holdings(self,
+                 fund:Funds,
+                 holdingType:str="all") -> pd.DataFrame:
+        """
+        This function writes the holdings of a fund in the dataset holdings.
+
+        Args:
+            fund (Funds) : fund of the holdings
+            holdingType (str) : type of holdings, can be all, equity, bond, other
+
+        Returns:
+            DataFrame written
+
+        Examples:
+            >>> Warehouse("warehouse").holdings(Funds("VTSAX", session=session))
+
+        """
+        frame = fund.holdings(holdingType).assign(securityID=fund.code, holdingType=holdingType)
+        return self.write("holdings", frame)
+
+    def time_series(self,
+                    security:Security,
+                    field:str|list,
+                    start_date:datetime.datetime,
+                    end_date:datetime.datetime,
+                    frequency:str="daily") -> pd.DataFrame:
+        """
+        This function writes the time series of a security in the dataset timeseries.
+
+        Args:
+            security (Security) : fund or stock of the time series
+            field (str|list) : field to retrieve, can be a string or a list of string
+            start_date (datetime) : start date to get history
+            end_date (datetime) : end date to get history
+            frequency (str) : frequency of the data
+
+        Returns:
+            DataFrame written
+
+        Examples:
+            >>> Warehouse("warehouse").time_series(fund, ["nav", "totalReturn"], start_date, end_date)
+
+        """
+        frame = security.TimeSeries(field, start_date, end_date, frequency, output="frame")
+        frame = frame.reset_index().assign(securityID=security.code, frequency=frequency)
+        return self.write("timeseries", frame)
+
+    def trailing_return(self,
+                        fund:Funds,
+                        duration:str="daily") -> pd.DataFrame:
+        """
+        This function writes the trailing return of a fund in the dataset trailingReturn.
+
+        Args:
+            fund (Funds) : fund of the trailing return
+            duration (str) : frequency of return can be daily, monthly or quarterly
+
+        Returns:
+            DataFrame written
+
+        Examples:
+            >>> Warehouse("warehouse").trailing_return(Funds("VTSAX", session=session), "monthly")
+
+        """
+        frame = flatten_columns(fund.trailingReturn(duration))
+        return self.write("trailingReturn", frame.assign(securityID=fund.code, duration=duration))
+
+    def financial_statement(self,
+                            stock:Stock,
+                            statement:str="summary",
+                            period:str="annual",
+                            reportType:str="original") -> pd.DataFrame:
+        """
+        This function writes a financial statement of a stock in the dataset financialStatement.
+
+        Args:
+            stock (Stock) : stock of the financial statement
+            statement (str) : possible values are balancesheet, cashflow, incomestatement, summary
+            period (str) : possible values are annual, quarterly
+            reportType (str) : possible values are original, restated
+
+        Returns:
+            DataFrame written
+
+        Examples:
+            >>> Warehouse("warehouse").financial_statement(Stock("US0378331005", session=session), "incomestatement")
+
+        """
+        frame = flatten_statement(stock.financialStatement(statement, period, reportType))
+        frame = frame.assign(securityID=stock.code,
+                             statement=statement,
+                             statementPeriod=period,
+                             reportType=reportType)
+        return self.write("financialStatement", frame)
+
+    def screener(self,
+                 results:list,
+                 dataset:str="screener") -> pd.DataFrame:
+        """
+        This function writes the results of the screener in a dataset.
+
+        Args:
+            results (list) : results of MorningstarSession.screener_universe
+            dataset (str) : name of the dataset
+
+        Returns:
+            DataFrame written
+
+        Examples:
+            >>> Warehouse("warehouse").screener(session.screener_universe("a", field=["name", "isin"]))
+
+        """
+        return self.write(dataset, flatten_screener(results))
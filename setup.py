@@ -26,5 +26,9 @@ setup(
     long_description= readme(),
     long_description_content_type="text/markdown",
     install_requires=requirements(filename='requirements/requirements.txt'),
+    extras_require={
+        "async": ["aiohttp>=3.8"],
+        "parquet": ["pyarrow>=10.0"],
+    },
     include_package_data=True,
 )
\ No newline at end of file
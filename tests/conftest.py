@@ -0,0 +1,236 @@
+"""fixtures of the tests, the browser and the Morningstar hosts are replaced by fakes, no test uses the network"""
+import contextlib
+import datetime
+import json
+import re
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import mstarpy.search
+from mstarpy.search import MorningstarSession
+
+
+# catalogues of the screener
+FIELDS = {"results": [{"field": name} for name in ("isin", "name", "ongoingCharge", "standardDeviation")]}
+FILTERS = {"results": [{"id": "fund-filters",
+                        "filters": [{"id": "basics",
+                                     "children": [{"field": "ongoingCharge", "numeric": True},
+                                                  {"field": "standardDeviation", "numeric": True},
+                                                  {"field": "name", "numeric": False}]}]}]}
+
+
+# result of the screener for a fund
+FUND = {"meta": {"securityID": "F00000MRIF", "performanceID": "0P0000TUB0", "fundID": "FS00008MVC",
+                 "universe": "FO"},
+        "fields": {"isin": {"value": "FR0010921445"}, "name": {"value": "Abeille Capital Planete"}}}
+
+
+def make_response(status_code:int=200,
+                  payload=None,
+                  headers:dict=None,
+                  request:requests.PreparedRequest=None) -> requests.Response:
+    """response with a json payload, or the payload itself if it is bytes or str"""
+    r = requests.Response()
+    r.status_code = status_code
+    r.headers = CaseInsensitiveDict(headers or {})
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    r._content = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+    r.encoding = "utf-8"
+    if request is not None:
+        r.request = request
+        r.url = request.url
+    return r
+
+
+def query(request:requests.PreparedRequest) -> dict:
+    """parameters of a request"""
+    return dict(parse_qsl(urlsplit(request.url).query))
+
+
+class FakeAdapter(requests.adapters.BaseAdapter):
+    """
+    Adapter answering the requests of a session with the last route whose pattern is in the url,
+    the requests without route get a 404. A route is a payload or a function of the request
+    returning a response. The timeouts of the requests are kept by url.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.routes = []
+        self.requests = []
+        self.timeouts = {}
+        self._lock = threading.Lock()
+
+    def route(self,
+              pattern:str,
+              payload=None,
+              status_code:int=200,
+              headers:dict=None) -> None:
+        if callable(payload):
+            self.routes.insert(0, (pattern, payload))
+        else:
+            self.routes.insert(0, (pattern, lambda request: make_response(status_code, payload, headers)))
+
+    def calls(self,
+              pattern:str="") -> list:
+        with self._lock:
+            return [request for request in self.requests if pattern in request.url]
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.requests.append(request)
+            self.timeouts[request.url] = kwargs.get("timeout")
+        for pattern, handler in self.routes:
+            if pattern in request.url:
+                r = handler(request)
+                break
+        else:
+            r = make_response(404, {})
+        r.request = request
+        r.url = request.url
+        return r
+
+    def close(self) -> None:
+        pass
+
+
+class FakeChart():
+    """
+    Time series API returning one value per day and field, the value is the day of the month,
+    the codes in absent are left out of the response.
+    """
+
+    def __init__(self) -> None:
+        self.absent = set()
+
+    def __call__(self, request:requests.PreparedRequest) -> requests.Response:
+        params = query(request)
+        start = datetime.date.fromisoformat(params["startDate"])
+        end = datetime.date.fromisoformat(params["endDate"])
+        days = [start + datetime.timedelta(days=i) for i in range((end - start).days + 1)]
+        result = []
+        for security in params["query"].split("|"):
+            code, fields = security.split(":", 1)
+            if code in self.absent:
+                continue
+            result.append({"series": [{"date": day.isoformat()} | {field: day.day for field in fields.split(",")}
+                                      for day in days]})
+        return make_response(200, result)
+
+
+class FakeScreener():
+    """
+    Screener returning the pages of securities matching the term or the IN condition of the query,
+    with the requested fields only.
+    """
+
+    def __init__(self,
+                 securities:list) -> None:
+        self.securities = securities
+
+    def __call__(self, request:requests.PreparedRequest) -> requests.Response:
+        params = query(request)
+        condition = re.match(r"(\w+) IN \((.*?)\)", params["query"])
+        securities = self.securities
+        if condition:
+            name, values = condition.group(1), {value.strip("'").upper() for value in condition.group(2).split(",")}
+            securities = [security for security in securities
+                          if str(security["meta"].get(name) or security["fields"].get(name, {}).get("value")).upper()
+                          in values]
+        fields = params.get("fields", "").split(",")
+        page, limit = int(params.get("page", 1)), int(params.get("limit", 10))
+        results = [{"meta": security["meta"],
+                    "fields": {name: value for name, value in security["fields"].items() if name in fields}}
+                   for security in securities[(page - 1) * limit:page * limit]]
+        return make_response(200, {"results": results, "total": len(securities)})
+
+
+class FakeDriver():
+    """browser with the WAF cookie already set"""
+
+    started = 0
+
+    def __init__(self) -> None:
+        FakeDriver.started += 1
+
+    def get(self, url:str) -> None:
+        pass
+
+    def get_cookies(self) -> list:
+        return [{"name": "aws-waf-token", "value": f"token{FakeDriver.started}", "expiry": time.time() + 3600}]
+
+    def execute_script(self, script:str) -> str:
+        return "mstarpy-tests"
+
+
+class FakePool():
+
+    @contextlib.contextmanager
+    def browser(self):
+        yield FakeDriver()
+
+
+@pytest.fixture
+def adapter() -> FakeAdapter:
+    return FakeAdapter()
+
+
+@pytest.fixture
+def catalogue(adapter) -> FakeAdapter:
+    """routes of the screener catalogues"""
+    adapter.route("stores/data-points/fields", FIELDS)
+    adapter.route("stores/filters", FILTERS)
+    return adapter
+
+
+@pytest.fixture
+def screener(catalogue) -> FakeScreener:
+    """route of the screener, its securities are set by the tests"""
+    screener = FakeScreener([])
+    catalogue.route("tools/screener/_data", screener)
+    return screener
+
+
+@pytest.fixture
+def chart(adapter) -> FakeChart:
+    """routes of the chart token and of the time series API"""
+    chart = FakeChart()
+    adapter.route("funds/xnas/afozx/chart", '<script>window.__NUXT__={token:"chart-token"}</script>')
+    adapter.route("chartservice/v2/timeseries", chart)
+    return chart
+
+
+@pytest.fixture
+def browser(monkeypatch):
+    """fake browser of the sessions, its attribute started counts the browsers started"""
+    FakeDriver.started = 0
+    monkeypatch.setattr(mstarpy.search, "browser_pool", FakePool)
+    monkeypatch.setattr(mstarpy.search, "wait_until_ready", lambda driver, conditions, timeout: "cookies")
+    return FakeDriver
+
+
+@pytest.fixture
+def make_session(monkeypatch, adapter, browser):
+    """factory of MorningstarSession whose requests are answered by the fake adapter"""
+    for name in ("MSTARPY_SESSION_FILE", "MSTARPY_CATALOGUE_FILE", "MSTARPY_TIMESERIES_STORE",
+                 "MSTARPY_CACHE", "MSTARPY_RETRIES"):
+        monkeypatch.delenv(name, raising=False)
+
+    def make(**kwargs) -> MorningstarSession:
+        session = MorningstarSession(**kwargs)
+        for prefix in list(session.adapters) + ["https://", "http://"]:
+            session.mount(prefix, adapter)
+        return session
+
+    return make
+
+
+@pytest.fixture
+def session(make_session) -> MorningstarSession:
+    return make_session()
@@ -0,0 +1,148 @@
+"""tests of the asyncio client, the requests are answered by the fake adapter"""
+import asyncio
+import threading
+
+import pytest
+import requests
+
+from conftest import FUND, query
+
+pytest.importorskip("aiohttp")
+
+import mstarpy.aio
+from mstarpy.aio import AsyncFunds, AsyncMorningstarSession, AsyncStock
+
+
+@pytest.fixture
+def state(adapter, monkeypatch) -> dict:
+    """requests of the asynchronous sessions answered by the fake adapter after a pause"""
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    async def send(self, method, url, params=None, headers=None, proxies=None, timeout=None):
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            await asyncio.sleep(0.01)
+            request = requests.Request(method, url, params=params,
+                                       headers=dict(self.session.headers) | (headers or {})).prepare()
+            return adapter.send(request)
+        finally:
+            state["in_flight"] -= 1
+
+    monkeypatch.setattr(AsyncMorningstarSession, "_send", send)
+    return state
+
+
+@pytest.fixture
+def aio(session, state) -> AsyncMorningstarSession:
+    return AsyncMorningstarSession(session)
+
+
+def gather(fund, method:str, count:int) -> list:
+    async def main():
+        return await asyncio.gather(*(getattr(fund, method)() for _ in range(count)))
+    return asyncio.run(main())
+
+
+def test_create_finds_the_security(aio, catalogue):
+    catalogue.route("screener/_data", {"results": [FUND], "total": 1})
+
+    fund = asyncio.run(AsyncFunds.create("myria", session=aio))
+
+    assert (fund.code, fund.isin, fund.asset_type) == ("F00000MRIF", "FR0010921445", "fund")
+    params = query(catalogue.calls("screener/_data")[0])
+    assert params["query"] == "_ ~= 'myria' AND investmentType IN ('FE','FO','FC','FV','FM')"
+
+
+def test_endpoints_are_requested_concurrently(aio, adapter, state):
+    adapter.route("price/feeLevel", {"fee": 1})
+    fund = AsyncFunds.from_id("F00000MRIF", "FO", isin="FR0010921445", session=aio)
+
+    assert gather(fund, "feeLevel", 50) == [{"fee": 1}] * 50
+    assert len(adapter.calls("price/feeLevel")) == 50
+    assert state["max_in_flight"] == 50
+
+
+def test_failed_request_raises(aio, adapter):
+    adapter.route("price/feeLevel", {}, status_code=404)
+    fund = AsyncFunds.from_id("F00000MRIF", "FO", isin="FR0010921445", session=aio)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(fund.feeLevel())
+
+
+def test_metadata_is_requested_in_a_thread(aio, adapter, screener):
+    threads = []
+
+    def resolve(request):
+        threads.append(threading.current_thread())
+        return screener(request)
+
+    adapter.route("securityID+IN", resolve)
+    screener.securities = [FUND | {"fields": FUND["fields"] | {"ongoingCharge": {"value": 1.5}}}]
+    fund = AsyncFunds.from_id("F00000MRIF", "FO", session=aio)
+
+    assert asyncio.run(fund.dataPoint(["ongoingCharge"])) == {"ongoingCharge": {"value": 1.5}}
+    assert len(threads) == 1 and threads[0] is not threading.main_thread()
+    assert fund.isin == "FR0010921445"
+
+
+def test_limits_of_the_session_do_not_apply_to_the_asynchronous_session(make_session, adapter, state):
+    session = make_session(rate_limits={"api-global": {"rate": 1000.0, "burst": 100, "concurrency": 2}})
+    adapter.route("price/feeLevel", {"fee": 1})
+    fund = AsyncFunds.from_id("F00000MRIF", "FO", isin="FR0010921445", session=AsyncMorningstarSession(session))
+
+    gather(fund, "feeLevel", 20)
+
+    assert state["max_in_flight"] == 20
+    assert session.limiter.host("https://api-global.morningstar.com/").stats()["requests"] == 0
+
+
+def test_asynchronous_session_keeps_its_requests_within_its_limits(session, adapter, state):
+    aio = AsyncMorningstarSession(session, rate_limits={"api-global": {"rate": 1000.0, "burst": 100,
+                                                                       "concurrency": 2}})
+    adapter.route("price/feeLevel", {"fee": 1})
+    fund = AsyncFunds.from_id("F00000MRIF", "FO", isin="FR0010921445", session=aio)
+
+    gather(fund, "feeLevel", 20)
+
+    assert state["max_in_flight"] == 2
+    assert len(adapter.calls("price/feeLevel")) == 20
+
+
+def test_statement_is_written_in_a_thread(aio, adapter, monkeypatch, tmp_path):
+    threads = []
+    export = AsyncStock._export_statement
+
+    def spy(self, *args):
+        threads.append(threading.current_thread())
+        return export(self, *args)
+
+    monkeypatch.setattr(AsyncStock, "_export_statement", spy)
+    adapter.route("newfinancials", b"xls")
+    stock = AsyncStock.from_id("0P000000GY", "EQ", isin="US0378331005", session=aio)
+
+    result = asyncio.run(stock.financialStatement("cashflow", export=True, folderPath=str(tmp_path)))
+
+    assert (tmp_path / result["filename"]).read_bytes() == b"xls"
+    assert len(threads) == 1 and threads[0] is not threading.main_thread()
+
+
+def test_new_session_is_built_in_a_thread(make_session, adapter, catalogue, state, monkeypatch):
+    threads = []
+
+    class Session(mstarpy.aio.MorningstarSession):
+        def __init__(self) -> None:
+            threads.append(threading.current_thread())
+            super().__init__()
+            for prefix in list(self.adapters):
+                self.mount(prefix, adapter)
+
+    monkeypatch.setattr(mstarpy.aio, "MorningstarSession", Session)
+    catalogue.route("screener/_data", {"results": [FUND], "total": 1})
+
+    fund = asyncio.run(AsyncFunds.create("myria"))
+
+    assert fund.code == "F00000MRIF"
+    assert isinstance(fund.session, Session)
+    assert len(threads) == 1 and threads[0] is not threading.main_thread()
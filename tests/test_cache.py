@@ -0,0 +1,117 @@
+"""tests of the cache of responses and of the revalidation of the expired responses"""
+import time
+
+import pytest
+
+from conftest import make_response
+from mstarpy.cache import MemoryCache, ResponseCache, SQLiteCache
+from mstarpy.funds import Funds
+
+
+FEE_LEVEL = "price/feeLevel"
+
+
+@pytest.fixture
+def fund(session) -> Funds:
+    return Funds.from_id("F00000MRIF", "FO", isin="FR0010921445", session=session)
+
+
+def test_response_is_served_from_the_cache(fund, adapter):
+    fund.session.cache = MemoryCache()
+    adapter.route(FEE_LEVEL, {"fee": 1})
+
+    assert fund.feeLevel() == fund.feeLevel() == {"fee": 1}
+    assert len(adapter.calls(FEE_LEVEL)) == 1
+    assert fund.session.cache.stats()["hits"] == 1
+
+
+def test_expired_response_is_revalidated_with_its_etag(fund, adapter, monkeypatch):
+    fund.session.cache = MemoryCache(ttl={"feeLevel": 60})
+
+    def fee_level(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return make_response(304, b"")
+        return make_response(200, {"fee": 1}, {"ETag": '"v1"'})
+
+    adapter.route(FEE_LEVEL, fee_level)
+    fund.feeLevel()
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+
+    assert fund.feeLevel() == {"fee": 1}
+    assert adapter.calls(FEE_LEVEL)[1].headers["If-None-Match"] == '"v1"'
+    # the revalidated response is valid for a new ttl
+    fund.feeLevel()
+    assert len(adapter.calls(FEE_LEVEL)) == 2
+    stats = fund.session.cache.stats()
+    assert (stats["hits"], stats["misses"], stats["revalidated"]) == (1, 1, 1)
+
+
+def test_changed_response_replaces_the_cached_one(fund, adapter, monkeypatch):
+    fund.session.cache = MemoryCache(ttl={"feeLevel": 60})
+    adapter.route(FEE_LEVEL, {"fee": 1}, headers={"ETag": '"v1"'})
+    fund.feeLevel()
+    adapter.route(FEE_LEVEL, {"fee": 2}, headers={"ETag": '"v2"'})
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+
+    assert fund.feeLevel() == {"fee": 2}
+    assert fund.feeLevel() == {"fee": 2}
+    assert len(adapter.calls(FEE_LEVEL)) == 2
+
+
+def test_errors_are_not_cached(fund, adapter):
+    fund.session.cache = MemoryCache()
+    adapter.route(FEE_LEVEL, {}, status_code=404)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            fund.feeLevel()
+    assert len(adapter.calls(FEE_LEVEL)) == 2
+
+
+def test_zero_ttl_disables_the_cache(fund, adapter):
+    fund.session.cache = MemoryCache(ttl={"feeLevel": 0})
+    adapter.route(FEE_LEVEL, {"fee": 1})
+    fund.feeLevel()
+    fund.feeLevel()
+    assert len(adapter.calls(FEE_LEVEL)) == 2
+
+
+def test_sqlite_cache_is_kept_between_sessions(make_session, adapter, tmp_path):
+    path = str(tmp_path / "cache.db")
+    adapter.route(FEE_LEVEL, {"fee": 1})
+    for _ in range(2):
+        session = make_session(cache=SQLiteCache(path))
+        assert Funds.from_id("F00000MRIF", "FO", isin="FR0010921445", session=session).feeLevel() == {"fee": 1}
+    assert len(adapter.calls(FEE_LEVEL)) == 1
+
+
+def test_memory_cache_drops_the_least_recently_used():
+    cache = MemoryCache(maxsize=2)
+    for key in ("a", "b", "a", "c"):
+        if cache._load(key) is None:
+            cache._store(key, {"key": key})
+    assert cache._load("b") is None
+    assert cache._load("a") == {"key": "a"}
+
+
+def test_endpoint_ttl_is_the_longest_matching_key():
+    cache = MemoryCache(ttl={"people": 10, "people/proxyVoting": 20})
+    assert cache.endpoint_ttl("people/proxyVoting/management") == 20
+    assert cache.endpoint_ttl("people/managers") == 10
+    assert cache.endpoint_ttl("price/fee") == cache.default_ttl
+
+
+def test_responses_through_other_proxies_are_stored_apart(fund, adapter):
+    fund.session.cache = MemoryCache()
+    adapter.route(FEE_LEVEL, {"fee": 1})
+    fund.feeLevel()
+    fund.proxies = {"https": "http://proxy:8080"}
+    fund.feeLevel()
+    fund.feeLevel()
+    assert len(adapter.calls(FEE_LEVEL)) == 2
+
+
+def test_response_cache_is_abstract():
+    with pytest.raises(TypeError):
+        ResponseCache()
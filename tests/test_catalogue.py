@@ -0,0 +1,40 @@
+"""tests of the cache of the screener catalogues"""
+import time
+
+import pytest
+
+from conftest import FIELDS
+
+
+def test_catalogue_is_requested_once_within_the_ttl(session, catalogue):
+    assert session.search_field() == session.search_field()
+    session._screener_fields(["isin", "name"])
+    assert len(catalogue.calls("data-points/fields")) == 1
+
+
+def test_catalogue_is_requested_again_after_the_ttl(make_session, catalogue, monkeypatch):
+    session = make_session(catalogue_ttl=60)
+    session.search_field()
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    session.search_field()
+    assert len(catalogue.calls("data-points/fields")) == 2
+
+
+def test_catalogue_file_is_shared_by_the_sessions(make_session, catalogue, tmp_path):
+    path = str(tmp_path / "catalogue.json")
+    make_session(catalogue_file=path).search_field()
+    assert make_session(catalogue_file=path).search_field() == [f["field"] for f in FIELDS["results"]]
+    assert len(catalogue.calls("data-points/fields")) == 1
+
+
+def test_clear_catalogue(session, catalogue):
+    session.search_field()
+    session.clear_catalogue()
+    session.search_field()
+    assert len(catalogue.calls("data-points/fields")) == 2
+
+
+def test_invalid_field_is_checked_with_the_catalogue(session, catalogue):
+    with pytest.raises(ValueError):
+        session._screener_fields(["isin", "unknown"])
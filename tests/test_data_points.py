@@ -0,0 +1,35 @@
+"""tests of the data points of many securities"""
+import math
+
+from conftest import query
+
+
+def security(i:int) -> dict:
+    return {"meta": {"securityID": f"S{i}", "performanceID": f"P{i}", "fundID": f"F{i}", "universe": "FO"},
+            "fields": {"isin": {"value": f"I{i}"}, "name": {"value": f"Fund {i}"},
+                       "ongoingCharge": {"value": i / 100}}}
+
+
+def test_securities_are_requested_in_chunks(session, adapter, screener):
+    screener.securities = [security(i) for i in range(5)]
+
+    frame = session.data_points([f"S{i}" for i in range(5)], ["name", "ongoingCharge"], chunkSize=2)
+
+    requests = adapter.calls("screener/_data")
+    assert len(requests) == 3
+    assert query(requests[0])["query"] == "securityID IN ('S0','S1')"
+    assert frame.index.name == "security"
+    assert frame.index.tolist() == ["S0", "S1", "S2", "S3", "S4"]
+    assert frame.loc["S3", "name"] == "Fund 3"
+    assert frame["ongoingCharge"].dtype == "float64"
+
+
+def test_frame_follows_the_order_of_the_input(session, screener):
+    screener.securities = [security(i) for i in range(3)]
+
+    frame = session.data_points(["I2", "missing", "I0", "I2"], "ongoingCharge", by="isin")
+
+    assert frame.index.tolist() == ["I2", "missing", "I0"]
+    assert frame.loc["I2", "ongoingCharge"] == 0.02
+    assert math.isnan(frame.loc["missing", "ongoingCharge"])
+
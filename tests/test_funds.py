@@ -0,0 +1,39 @@
+"""tests of the endpoints of Funds"""
+import pytest
+
+from mstarpy.funds import Funds
+
+
+POSITION = {
+    "equityHoldingPage": {"holdingList": [{"securityName": "Apple", "weighting": 5.0}]},
+    "boldHoldingPage": {"holdingList": [{"securityName": "Bund", "weighting": 3.0}]},
+    "otherHoldingPage": {"holdingList": [{"securityName": "Cash", "weighting": 1.0}]},
+}
+
+
+@pytest.fixture
+def fund(session) -> Funds:
+    return Funds.from_id("F00000MRIF", "FO", isin="FR0010921445", session=session)
+
+
+def test_all_holdings_are_built_from_one_position_request(fund, adapter):
+    adapter.route("portfolio/holding/v2", POSITION)
+
+    df = fund.holdings("all")
+
+    assert df["securityName"].tolist() == ["Apple", "Bund", "Cash"]
+    assert len(adapter.calls("portfolio/holding")) == 1
+
+
+def test_holdings_columns_and_type(fund, adapter):
+    adapter.route("portfolio/holding/v2", POSITION)
+
+    df = fund.holdings("bond", columns=["securityName", "weighting"], typed=True)
+
+    assert df.to_dict("records") == [{"securityName": "Bund", "weighting": 3.0}]
+    assert df["securityName"].dtype == "string"
+
+
+def test_invalid_holding_type(fund):
+    with pytest.raises(ValueError):
+        fund.holdings("cash")
@@ -0,0 +1,194 @@
+"""tests of the screener iterator and of the screener frames"""
+import threading
+import time
+
+import pytest
+
+from mstarpy.screener import ScreenerIterator, screener_frame
+from mstarpy.search import MorningstarSession
+
+
+class FakeSession():
+    """session serving the results of the screener from a list"""
+
+    _screener_params = staticmethod(MorningstarSession._screener_params)
+
+    def __init__(self,
+                 count:int,
+                 total:bool=True,
+                 delay:float=0) -> None:
+        self.results = [{"meta": {"securityID": f"S{i:04d}"}, "fields": {"isin": {"value": f"I{i:04d}"}}}
+                        for i in range(count)]
+        self.total = total
+        self.delay = delay
+        self.pages = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _screener_fields(field, sortby=None):
+        return ",".join(field) if isinstance(field, list) else field
+
+    @staticmethod
+    def _screener_filters(filters):
+        return ""
+
+    def general_search(self, params, language="en-gb", proxies=None):
+        with self._lock:
+            self.pages.append(params["page"])
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        start = (params["page"] - 1) * params["limit"]
+        result = {"results": self.results[start:start + params["limit"]]}
+        if self.total:
+            result["total"] = len(self.results)
+        return result
+
+
+def ids(results):
+    return [result["meta"]["securityID"] for result in results]
+
+
+@pytest.mark.parametrize("total", [True, False])
+@pytest.mark.parametrize("workers", [1, 4])
+def test_pages_are_yielded_in_order(total, workers):
+    session = FakeSession(23, total=total)
+    pages = list(ScreenerIterator(session, "a", field=["isin"], pageSize=5, workers=workers))
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+    assert ids(sum(pages, [])) == ids(session.results)
+    assert sorted(session.pages) == [1, 2, 3, 4, 5]
+
+
+def test_pages_are_requested_concurrently_once_the_total_is_known():
+    session = FakeSession(50, delay=0.02)
+    pages = list(ScreenerIterator(session, "a", field=["isin"], pageSize=5, workers=4))
+    assert ids(sum(pages, [])) == ids(session.results)
+    assert session.pages[0] == 1
+    assert 1 < session.max_in_flight <= 4
+
+
+def test_no_page_is_requested_after_the_total():
+    session = FakeSession(20)
+    pages = list(ScreenerIterator(session, "a", field=["isin"], pageSize=5, workers=8))
+    assert len(pages) == 4
+    assert sorted(session.pages) == [1, 2, 3, 4]
+
+
+def test_an_empty_page_ends_the_scan_without_total():
+    session = FakeSession(10, total=False)
+    pages = list(ScreenerIterator(session, "a", field=["isin"], pageSize=5))
+    assert [len(page) for page in pages] == [5, 5]
+    assert session.pages == [1, 2, 3]
+
+
+def test_without_prefetch_a_page_is_requested_when_it_is_consumed():
+    session = FakeSession(23)
+    iterator = iter(ScreenerIterator(session, "a", field=["isin"], pageSize=5, prefetch=False))
+    next(iterator)
+    assert session.pages == [1]
+    next(iterator)
+    assert session.pages == [1, 2]
+
+
+def test_record_mode_resumes_from_the_cursor():
+    session = FakeSession(12)
+    iterator = ScreenerIterator(session, "a", field=["isin"], pageSize=5, mode="record")
+    records = iter(iterator)
+    first = [next(records) for _ in range(7)]
+    assert iterator.cursor == {"page": 2, "index": 2}
+
+    resumed = ScreenerIterator(FakeSession(12), "a", field=["isin"], pageSize=5,
+                               mode="record", cursor=iterator.cursor)
+    assert ids(first) + ids(resumed) == ids(session.results)
+
+
+def test_record_mode_resumes_at_the_end_of_a_page():
+    session = FakeSession(12)
+    iterator = ScreenerIterator(session, "a", field=["isin"], pageSize=5, mode="record")
+    records = iter(iterator)
+    first = [next(records) for _ in range(5)]
+    assert iterator.cursor == {"page": 1, "index": 5}
+
+    resumed = FakeSession(12)
+    rest = list(ScreenerIterator(resumed, "a", field=["isin"], pageSize=5,
+                                 mode="record", cursor=iterator.cursor))
+    assert ids(first) + ids(rest) == ids(session.results)
+
+
+def test_page_mode_resumes_from_the_cursor():
+    session = FakeSession(12)
+    iterator = ScreenerIterator(session, "a", field=["isin"], pageSize=5, prefetch=False)
+    first = next(iter(iterator))
+    assert iterator.cursor == {"page": 2, "index": 0}
+
+    resumed = FakeSession(12)
+    rest = list(ScreenerIterator(resumed, "a", field=["isin"], pageSize=5, cursor=iterator.cursor))
+    assert ids(first) + ids(sum(rest, [])) == ids(session.results)
+    assert resumed.pages == [2, 3]
+
+
+def test_page_mode_resumes_inside_a_page():
+    session = FakeSession(12)
+    pages = list(ScreenerIterator(session, "a", field=["isin"], pageSize=5,
+                                  cursor={"page": 2, "index": 3}))
+    assert ids(sum(pages, [])) == ids(session.results[8:])
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        ScreenerIterator(FakeSession(1), "a", pageSize=0)
+    with pytest.raises(ValueError):
+        ScreenerIterator(FakeSession(1), "a", mode="frame")
+    with pytest.raises(TypeError):
+        ScreenerIterator(FakeSession(1), "a", cursor=[1, 0])
+
+
+def test_screener_frame_types_the_numeric_fields():
+    results = [{"meta": {"securityID": "S1"}, "fields": {"isin": {"value": "I1"}, "ongoingCharge": {"value": "0.5"}}},
+               {"meta": {"securityID": "S2"}, "fields": {"isin": {"value": "I2"}}}]
+    frame = screener_frame(results, ["isin", "ongoingCharge"], {"ongoingCharge"})
+    assert frame["ongoingCharge"].dtype == "float64"
+    assert frame["ongoingCharge"].isna().tolist() == [False, True]
+
+    empty = screener_frame([], ["isin", "ongoingCharge"], {"ongoingCharge"})
+    assert empty["ongoingCharge"].dtype == "float64"
+    assert empty["isin"].dtype == object
+
+
+def security(i:int,
+             ongoingCharge) -> dict:
+    return {"meta": {"securityID": f"S{i}", "performanceID": f"P{i}", "fundID": f"F{i}", "universe": "FO"},
+            "fields": {"isin": {"value": f"I{i}"}, "ongoingCharge": {"value": ongoingCharge}}}
+
+
+def test_universe_frame(session, screener):
+    screener.securities = [security(1, 0.5), security(2, "1.25"), security(3, None)]
+
+    frame = session.screener_universe("a", field=["isin", "ongoingCharge"], output="frame")
+
+    assert frame.columns.tolist() == ["securityID", "performanceID", "fundID", "universe", "isin", "ongoingCharge"]
+    assert frame["ongoingCharge"].dtype == "float64"
+    assert frame["ongoingCharge"].tolist()[:2] == [0.5, 1.25]
+
+
+def test_empty_universe_frame(session, catalogue):
+    catalogue.route("tools/screener/_data", {})
+
+    frame = session.screener_universe("a", field=["isin", "ongoingCharge"], output="frame")
+
+    assert frame.empty
+    assert frame["ongoingCharge"].dtype == "float64"
+
+
+def test_scan_frame(session, screener):
+    screener.securities = [security(i, i / 10) for i in range(12)]
+
+    frame = session.screener_scan("a", field=["isin", "ongoingCharge"], pageSize=5, workers=2)
+
+    assert frame["securityID"].tolist() == [f"S{i}" for i in range(12)]
+    assert frame.index.tolist() == list(range(12))
+    assert frame["ongoingCharge"].dtype == "float64"
@@ -0,0 +1,26 @@
+"""tests of the securities created from their id"""
+from conftest import FUND
+from mstarpy.funds import Funds
+
+
+def test_metadata_is_requested_on_first_use(session, adapter, screener):
+    screener.securities = [FUND]
+    fund = Funds.from_id("F00000MRIF", "FO", session=session)
+    assert adapter.calls("screener/_data") == []
+
+    assert (fund.name, fund.isin) == ("Abeille Capital Planete", "FR0010921445")
+    assert fund.isin == "FR0010921445"
+    assert len(adapter.calls("screener/_data")) == 1
+
+
+def test_unknown_metadata_is_requested_once(session, adapter, screener):
+    fund = Funds.from_id("F00000XXXX", "FO", session=session)
+
+    assert [fund.name, fund.isin, fund.name, fund.isin] == ["F00000XXXX"] * 4
+    assert len(adapter.calls("screener/_data")) == 1
+
+
+def test_known_metadata_is_not_requested(session, adapter, screener):
+    fund = Funds.from_id("F00000MRIF", "FO", name="Fund", isin="FR0010921445", session=session)
+    assert (fund.name, fund.isin) == ("Fund", "FR0010921445")
+    assert adapter.calls("screener/_data") == []
@@ -0,0 +1,41 @@
+"""tests of the session store, a warm session does not start the browser"""
+import json
+import os
+import time
+
+from mstarpy.session_store import SessionStore
+
+
+def test_warm_session_skips_the_browser(make_session, browser, tmp_path):
+    path = str(tmp_path / "session.json")
+    first = make_session(session_file=path)
+    assert browser.started == 1
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+    second = make_session(session_file=path)
+    assert browser.started == 1
+    assert second.cookies.get_dict() == first.cookies.get_dict()
+    assert second.headers["User-Agent"] == "mstarpy-tests"
+
+
+def test_expired_session_starts_the_browser(make_session, browser, tmp_path):
+    path = tmp_path / "session.json"
+    make_session(session_file=str(path))
+    state = json.loads(path.read_text())
+    path.write_text(json.dumps(state | {"expires": time.time() - 1}))
+
+    make_session(session_file=str(path))
+    assert browser.started == 2
+
+
+def test_expiry_is_capped_by_the_waf_cookies():
+    store = SessionStore("session.json", ttl=3600)
+    expiry = time.time() + 60
+    cookies = [{"name": "aws-waf-token", "expiry": expiry}, {"name": "other", "expiry": 0}]
+    assert store.expiry(cookies, ["aws-waf-token"]) == expiry
+
+
+def test_invalid_file_is_ignored(tmp_path):
+    path = tmp_path / "session.json"
+    path.write_text("not json")
+    assert SessionStore(str(path)).load() is None
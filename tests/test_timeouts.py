@@ -0,0 +1,28 @@
+"""tests of the timeouts given per call to the screener methods"""
+from conftest import FUND
+
+
+def test_screener_universe_passes_its_timeout(session, adapter, screener):
+    screener.securities = [FUND]
+
+    session.screener_universe("myria", field=["isin", "name"], filters={"ongoingCharge": ("<", 2)},
+                              output="frame", timeout=(1, 2))
+
+    assert set(adapter.timeouts.values()) == {(1, 2)}
+    assert len(adapter.calls("stores/filters")) == 1
+    assert len(adapter.calls("tools/screener/_data")) == 1
+
+
+def test_search_field_and_search_filter_pass_their_timeout(session, catalogue):
+    session.search_field(display_print=False, timeout=3)
+    session.search_filter(timeout=4)
+
+    assert catalogue.timeouts[catalogue.calls("data-points/fields")[0].url] == 3
+    assert catalogue.timeouts[catalogue.calls("stores/filters")[0].url] == 4
+
+
+def test_default_timeout_is_the_timeout_of_the_session(make_session, catalogue):
+    session = make_session(timeouts={"global": (5, 6)})
+    session.search_field(display_print=False)
+
+    assert set(catalogue.timeouts.values()) == {(5, 6)}
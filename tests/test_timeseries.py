@@ -0,0 +1,75 @@
+"""tests of the time series requested for many securities"""
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from conftest import query
+from mstarpy.timeseries import series_arrays, series_output
+
+
+START = datetime.date(2024, 1, 1)
+END = datetime.date(2024, 1, 10)
+
+
+def test_securities_are_requested_together(session, adapter, chart):
+    found = session.time_series(["A", "B", "C"], ["nav", "totalReturn"], START, END)
+
+    requests = adapter.calls("chartservice")
+    assert len(requests) == 1
+    assert query(requests[0])["query"] == "A:nav,totalReturn|B:nav,totalReturn|C:nav,totalReturn"
+    assert list(found) == ["A", "B", "C"]
+    assert found["B"][0] == {"date": "2024-01-01", "nav": 1, "totalReturn": 1}
+    assert len(found["C"]) == 10
+
+
+def test_securities_are_requested_in_chunks(session, adapter, chart):
+    session.time_series(["A", "B", "C"], "nav", START, END, chunkSize=2)
+    assert [query(r)["query"] for r in adapter.calls("chartservice")] == ["A:nav|B:nav", "C:nav"]
+
+
+def test_request_is_split_when_a_series_is_missing(session, adapter, chart):
+    chart.absent.add("B")
+    found = session.time_series(["A", "B", "C"], "nav", START, END)
+
+    assert [query(r)["query"] for r in adapter.calls("chartservice")] == ["A:nav|B:nav|C:nav", "A:nav", "B:nav|C:nav",
+                                                                          "B:nav", "C:nav"]
+    assert found["B"] == []
+    assert len(found["A"]) == len(found["C"]) == 10
+
+
+def test_request_is_split_when_too_many_points(session, adapter, chart):
+    session.time_series(["A", "B"], "nav", START, END, maxPoints=15)
+    assert [query(r)["query"] for r in adapter.calls("chartservice")] == ["A:nav", "B:nav"]
+
+
+def test_chart_token_is_scraped_once(session, adapter, chart):
+    session.time_series(["A"], "nav", START, END)
+    session.time_series(["B"], "nav", START, END)
+
+    assert len(adapter.calls("afozx/chart")) == 1
+    assert adapter.calls("chartservice")[0].headers["authorization"] == "Bearer chart-token"
+
+
+def test_frame_output(session, chart):
+    frame = session.time_series(["A"], ["nav", "totalReturn"], START, END, output="frame")["A"]
+
+    assert isinstance(frame.index, pd.DatetimeIndex) and frame.index.name == "date"
+    assert list(frame.columns) == ["nav", "totalReturn"]
+    assert frame.loc["2024-01-03", "nav"] == 3
+
+
+def test_arrays_output():
+    series = [{"date": "2024-01-01", "nav": 1, "totalReturn": 1.5},
+              {"date": "2024-01-02", "nav": 2, "totalReturn": None}]
+    arrays = series_arrays(series, ["nav", "totalReturn"])
+
+    assert arrays["date"].dtype == np.dtype("datetime64[ns]")
+    assert arrays["nav"].dtype == np.int64
+    assert arrays["totalReturn"].dtype == np.float64 and np.isnan(arrays["totalReturn"][1])
+
+
+def test_empty_series_output():
+    frame = series_output([], ["nav"], "frame")
+    assert frame.empty and list(frame.columns) == ["nav"]
+    assert series_output([], "nav", "arrays")["nav"].dtype == np.float64
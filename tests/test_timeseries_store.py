@@ -0,0 +1,114 @@
+"""tests of the coverage of the time series store"""
+import datetime
+
+import pytest
+
+from mstarpy.timeseries_store import SETTLE_DAYS, TimeSeriesStore
+
+
+CODE = "F00000MRIF"
+D = datetime.date
+
+
+def rows(start:datetime.date, end:datetime.date) -> list:
+    days = (end - start).days + 1
+    return [{"date": (start + datetime.timedelta(days=i)).isoformat(), "nav": 100.0 + i}
+            for i in range(days)]
+
+
+@pytest.fixture
+def store():
+    store = TimeSeriesStore(":memory:")
+    yield store
+    store.close()
+
+
+def coverage(store, field="nav"):
+    return store._coverage(store._connection, CODE, field, "d")
+
+
+def test_nothing_is_covered_at_first(store):
+    assert store.missing(CODE, ["nav"], "d", D(2020, 1, 1), D(2020, 1, 31)) == [(D(2020, 1, 1), D(2020, 1, 31))]
+
+
+def test_missing_returns_the_gaps(store):
+    store.save(CODE, ["nav"], "d", D(2020, 1, 10), D(2020, 1, 20), rows(D(2020, 1, 10), D(2020, 1, 20)))
+    assert store.missing(CODE, ["nav"], "d", D(2020, 1, 1), D(2020, 1, 31)) == [
+        (D(2020, 1, 1), D(2020, 1, 9)),
+        (D(2020, 1, 21), D(2020, 1, 31)),
+    ]
+    assert store.missing(CODE, ["nav"], "d", D(2020, 1, 12), D(2020, 1, 18)) == []
+
+
+def test_adjacent_and_overlapping_ranges_are_merged(store):
+    store.save(CODE, ["nav"], "d", D(2020, 1, 1), D(2020, 1, 10), rows(D(2020, 1, 1), D(2020, 1, 10)))
+    store.save(CODE, ["nav"], "d", D(2020, 1, 21), D(2020, 1, 31), rows(D(2020, 1, 21), D(2020, 1, 31)))
+    assert len(coverage(store)) == 2
+
+    # touches the first range
+    store.save(CODE, ["nav"], "d", D(2020, 1, 11), D(2020, 1, 15), rows(D(2020, 1, 11), D(2020, 1, 15)))
+    assert coverage(store) == [(D(2020, 1, 1), D(2020, 1, 15)), (D(2020, 1, 21), D(2020, 1, 31))]
+
+    # overlaps both ranges
+    store.save(CODE, ["nav"], "d", D(2020, 1, 14), D(2020, 1, 22), rows(D(2020, 1, 14), D(2020, 1, 22)))
+    assert coverage(store) == [(D(2020, 1, 1), D(2020, 1, 31))]
+    assert store.missing(CODE, ["nav"], "d", D(2020, 1, 1), D(2020, 1, 31)) == []
+
+
+def test_a_range_without_value_is_covered(store):
+    # a holiday period returns no value but does not need to be requested again
+    store.save(CODE, ["nav"], "d", D(2020, 12, 24), D(2020, 12, 27), [])
+    assert store.missing(CODE, ["nav"], "d", D(2020, 12, 24), D(2020, 12, 27)) == []
+
+
+def test_every_field_must_be_covered(store):
+    store.save(CODE, ["nav"], "d", D(2020, 1, 1), D(2020, 1, 31), rows(D(2020, 1, 1), D(2020, 1, 31)))
+    store.save(CODE, ["totalReturn"], "d", D(2020, 1, 1), D(2020, 1, 15), [])
+    assert store.missing(CODE, ["nav", "totalReturn"], "d", D(2020, 1, 1), D(2020, 1, 31)) == [
+        (D(2020, 1, 16), D(2020, 1, 31)),
+    ]
+    assert store.missing(CODE, ["nav"], "w", D(2020, 1, 1), D(2020, 1, 31)) == [(D(2020, 1, 1), D(2020, 1, 31))]
+
+
+def test_recent_days_without_value_are_not_covered(store):
+    today = datetime.date.today()
+    start = today - datetime.timedelta(days=30)
+    last = today - datetime.timedelta(days=10)
+    store.save(CODE, ["nav"], "d", start, today, rows(start, last))
+
+    settled = today - datetime.timedelta(days=SETTLE_DAYS)
+    assert coverage(store) == [(start, settled)]
+    assert store.missing(CODE, ["nav"], "d", start, today) == [(settled + datetime.timedelta(days=1), today)]
+
+
+def test_recent_days_with_value_are_covered(store):
+    today = datetime.date.today()
+    start = today - datetime.timedelta(days=30)
+    store.save(CODE, ["nav"], "d", start, today, rows(start, today))
+    assert store.missing(CODE, ["nav"], "d", start, today) == []
+
+
+def test_range_in_the_settle_days_without_value_is_not_covered(store):
+    today = datetime.date.today()
+    start = today - datetime.timedelta(days=1)
+    store.save(CODE, ["nav"], "d", start, today, [])
+    assert coverage(store) == []
+    assert store.missing(CODE, ["nav"], "d", start, today) == [(start, today)]
+
+
+def test_load_returns_the_saved_rows(store):
+    store.save(CODE, ["nav"], "d", D(2020, 1, 1), D(2020, 1, 5), rows(D(2020, 1, 1), D(2020, 1, 5)))
+    loaded = store.load(CODE, ["nav"], "d", D(2020, 1, 2), D(2020, 1, 3))
+    assert loaded == [{"date": "2020-01-02", "nav": 101.0}, {"date": "2020-01-03", "nav": 102.0}]
+
+
+def test_security_missing_from_the_response_is_not_requested_again(make_session, adapter, chart, store):
+    session = make_session(timeseries_store=store)
+    chart.absent.add("B")
+    session.time_series(["A", "B"], "nav", D(2024, 1, 1), D(2024, 1, 10))
+    requested = len(adapter.calls("chartservice"))
+
+    found = session.time_series(["A", "B"], "nav", D(2024, 1, 1), D(2024, 1, 10))
+
+    assert len(adapter.calls("chartservice")) == requested
+    assert found["B"] == [] and len(found["A"]) == 10
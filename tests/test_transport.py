@@ -0,0 +1,335 @@
+"""tests of the transport helpers of the Morningstar session"""
+import email.utils
+import threading
+import time
+
+import pytest
+import requests
+
+from conftest import make_response
+from mstarpy import transport
+from mstarpy.transport import HostLimiter, RetryBudget, RetryPolicy, SingleFlight, request_key
+
+
+URL = "https://api-global.morningstar.com/sal-service/v1/fund/quote/v7/F1/data"
+
+
+def wait_until(condition, timeout:float=5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def response(status_code:int=200,
+             headers:dict=None) -> requests.Response:
+    return make_response(status_code, {}, headers)
+
+
+def test_identical_calls_are_coalesced():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"value": 1}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do("key", call)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flights.do("key", call)))
+                 for _ in range(4)]
+    for follower in followers:
+        follower.start()
+    wait_until(lambda: flights.coalesced == 4)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [{"value": 1}] * 5
+    assert flights.coalesced == 4
+
+
+def test_coalesced_calls_share_the_exception():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        raise requests.ConnectionError("down")
+
+    errors = []
+
+    def run():
+        try:
+            flights.do("key", call)
+        except requests.ConnectionError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=run)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=run)
+    follower.start()
+    wait_until(lambda: flights.coalesced == 1)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(calls) == 1
+    assert len(errors) == 2 and errors[0] is errors[1]
+    # the failed flight is not kept, the next call is executed again
+    with pytest.raises(requests.ConnectionError):
+        flights.do("key", call)
+    assert len(calls) == 2
+
+
+def test_request_key_ignores_the_order_and_the_user_agent():
+    assert (request_key(URL, {"a": 1, "b": 2}, {"user-agent": "x", "apikey": "k"})
+            == request_key(URL, {"b": 2, "a": 1}, {"APIKEY": "k", "User-Agent": "y"}))
+    assert request_key(URL, headers={"authorization": "a"}) != request_key(URL, headers={"authorization": "b"})
+    assert request_key(URL, proxies={"https": "p1"}) != request_key(URL, proxies={"https": "p2"})
+
+
+def test_session_coalesces_identical_requests(session, adapter):
+    release = threading.Event()
+
+    def quote(request):
+        release.wait(5)
+        return make_response(200, {"authorization": request.headers["authorization"]})
+
+    adapter.route("quote/v7", quote)
+    results = []
+    threads = [threading.Thread(target=lambda token=token: results.append(
+                   session.get(URL, headers={"authorization": token}).json()))
+               for token in ["a"] * 4 + ["b"] * 4]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: session._flights.coalesced == 6)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    # the requests with another authorization are not coalesced
+    assert len(adapter.calls("quote/v7")) == 2
+    assert sorted(result["authorization"] for result in results) == ["a"] * 4 + ["b"] * 4
+
+
+def test_session_does_not_coalesce_requests_with_a_body(session, adapter):
+    adapter.route("quote/v7", {})
+    session.post(URL, json={"a": 1})
+    session.post(URL, json={"a": 1})
+    assert len(adapter.calls("quote/v7")) == 2
+
+
+def test_throttled_response_halves_the_concurrency_once_per_interval():
+    limiter = HostLimiter(rate=1000.0, burst=100, concurrency=16)
+    for _ in range(2):
+        limiter.acquire()
+    limiter.release(response(429))
+    assert limiter.concurrency == 8
+    # the requests in flight were sent with the old limit
+    limiter.release(response(429))
+    assert limiter.concurrency == 8
+    assert limiter.throttled == 2
+
+
+def test_throttled_response_halves_again_after_the_interval(monkeypatch):
+    monkeypatch.setattr(transport, "BACKOFF_INTERVAL", 0.0)
+    limiter = HostLimiter(rate=1000.0, burst=100, concurrency=16)
+    for status_code in (429, 202, 429, 429, 429):
+        limiter.acquire()
+        limiter.release(response(status_code))
+    assert limiter.concurrency == 1
+
+
+def test_success_increases_the_concurrency_up_to_the_maximum():
+    limiter = HostLimiter(rate=1000.0, burst=100, concurrency=4)
+    limiter.acquire()
+    limiter.release(response(429))
+    assert limiter.concurrency == 2
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(response(200))
+    assert limiter.concurrency == 4
+
+
+def test_server_errors_and_failures_do_not_change_the_concurrency():
+    limiter = HostLimiter(rate=1000.0, burst=100, concurrency=4)
+    limiter.acquire()
+    limiter.release(response(429))
+    for r in (response(503), None):
+        limiter.acquire()
+        limiter.release(r)
+    assert limiter.concurrency == 2
+
+
+def test_burst_then_rate():
+    limiter = HostLimiter(rate=50.0, burst=5, concurrency=100)
+    start = time.monotonic()
+    for _ in range(10):
+        limiter.acquire()
+    elapsed = time.monotonic() - start
+    # 5 requests of the burst then 5 requests at 50 per second
+    assert 0.08 <= elapsed < 0.5
+    assert limiter.stats()["requests"] == 10
+
+
+def test_concurrency_blocks_until_release():
+    limiter = HostLimiter(rate=1000.0, burst=100, concurrency=1)
+    limiter.acquire()
+    acquired = threading.Event()
+    thread = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+    thread.start()
+    assert not acquired.wait(0.1)
+    limiter.release(response(200))
+    assert acquired.wait(5)
+    thread.join(5)
+
+
+@pytest.mark.parametrize("kwargs", [{"rate": 0, "burst": 1, "concurrency": 1},
+                                    {"rate": 1, "burst": 0, "concurrency": 1},
+                                    {"rate": 1, "burst": 1, "concurrency": 0}])
+def test_invalid_limits(kwargs):
+    with pytest.raises(ValueError):
+        HostLimiter(**kwargs)
+
+
+def test_session_keeps_the_requests_in_flight_within_the_limit(make_session, adapter):
+    session = make_session(rate_limits={"api-global": {"rate": 1000.0, "burst": 100, "concurrency": 2}})
+    state = {"in_flight": 0, "max_in_flight": 0}
+    lock = threading.Lock()
+
+    def quote(request):
+        with lock:
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        time.sleep(0.01)
+        with lock:
+            state["in_flight"] -= 1
+        return make_response(200, {})
+
+    adapter.route("quote/v7", quote)
+    threads = [threading.Thread(target=session.get, args=(URL,), kwargs={"params": {"i": i}})
+               for i in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(adapter.calls("quote/v7")) == 10
+    assert state["max_in_flight"] == 2
+
+
+def test_backoff_is_bounded_by_the_attempt(monkeypatch):
+    monkeypatch.setattr(transport.random, "uniform", lambda low, high: high)
+    policy = RetryPolicy(total=5, backoff=0.5, max_backoff=3.0)
+    delays = [policy.delay(URL, "GET", attempt, response(503)) for attempt in range(5)]
+    assert delays == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+
+def test_no_retry_after_total():
+    policy = RetryPolicy(total=2)
+    assert policy.delay(URL, "GET", 2, response(503)) is None
+
+
+def test_no_retry_of_non_retryable_status_or_method():
+    policy = RetryPolicy()
+    assert policy.delay(URL, "GET", 0, response(404)) is None
+    assert policy.delay(URL, "POST", 0, response(503)) is None
+
+
+def test_connection_errors_are_retried_other_errors_are_not():
+    policy = RetryPolicy()
+    assert policy.delay(URL, "GET", 0, None, requests.ConnectionError()) is not None
+    assert policy.delay(URL, "GET", 0, None, requests.Timeout()) is not None
+    assert policy.delay(URL, "GET", 0, None, ValueError()) is None
+
+
+def test_retry_after_seconds_is_honoured(monkeypatch):
+    monkeypatch.setattr(transport.random, "uniform", lambda low, high: low)
+    policy = RetryPolicy(max_backoff=30.0)
+    assert policy.delay(URL, "GET", 0, response(429, {"Retry-After": "7"})) == 7.0
+
+
+def test_retry_after_date_is_honoured():
+    date = email.utils.formatdate(time.time() + 20, usegmt=True)
+    assert 15 < RetryPolicy.retry_after(response(503, {"Retry-After": date})) <= 20
+
+
+def test_retry_after_longer_than_max_backoff_is_not_waited():
+    policy = RetryPolicy(max_backoff=5.0)
+    assert policy.delay(URL, "GET", 0, response(429, {"Retry-After": "60"})) is None
+
+
+def test_invalid_retry_after_is_ignored():
+    assert RetryPolicy.retry_after(response(503, {"Retry-After": "soon"})) is None
+
+
+def test_budget_exhaustion_stops_the_retries():
+    policy = RetryPolicy(total=10, backoff=0, budget=0.0, min_budget=2)
+    delays = [policy.delay(URL, "GET", attempt, response(503)) for attempt in range(4)]
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2:] == [None, None]
+    assert policy.stats()["retries"] == 2
+
+
+def test_budget_is_refilled_by_the_requests():
+    budget = RetryBudget(ratio=0.5, minimum=0)
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+
+def test_session_retries_transient_statuses(make_session, adapter):
+    session = make_session(retry=RetryPolicy(total=3, backoff=0))
+    statuses = iter([503, 502, 200])
+    adapter.route("quote/v7", lambda request: make_response(next(statuses), {}))
+
+    assert session.get(URL).status_code == 200
+    assert len(adapter.calls("quote/v7")) == 3
+    assert session.transport_stats()["retries"] == 2
+
+
+def test_session_raises_the_connection_error_after_the_retries(make_session, adapter):
+    session = make_session(retry=RetryPolicy(total=2, backoff=0))
+
+    def down(request):
+        raise requests.ConnectionError("down")
+
+    adapter.route("quote/v7", down)
+    with pytest.raises(requests.ConnectionError):
+        session.get(URL)
+    assert len(adapter.calls("quote/v7")) == 3
+
+
+def test_session_does_not_retry_post(make_session, adapter):
+    session = make_session(retry=RetryPolicy(total=3, backoff=0))
+    adapter.route("quote/v7", {}, status_code=503)
+    assert session.post(URL, json={}).status_code == 503
+    assert len(adapter.calls("quote/v7")) == 1
+
+
+def test_session_is_not_rate_limited_by_default(session):
+    assert session.limiter.host(URL) is None
+    assert session.transport_stats()["hosts"] == {}
+
+
+def test_missing_limits_are_the_defaults():
+    limiter = transport.RateLimiter({"api-global": {"concurrency": 4}, "www": {}})
+    assert limiter.host(URL).stats()["concurrency"] == 4
+    assert limiter.host(URL).stats()["rate"] == transport.RATE_LIMIT["api-global"]["rate"]
+    assert limiter.host("https://www.morningstar.com/").stats()["rate"] == transport.RATE_LIMIT["www"]["rate"]
+    assert limiter.host("https://lt.morningstar.com/") is None
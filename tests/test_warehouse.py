@@ -0,0 +1,64 @@
+"""tests of the Parquet warehouse"""
+import datetime
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import mstarpy.warehouse
+from mstarpy.warehouse import Warehouse
+
+
+DAY1 = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+DAY2 = datetime.datetime(2025, 1, 2, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture
+def warehouse(tmp_path) -> Warehouse:
+    return Warehouse(str(tmp_path / "warehouse"))
+
+
+def test_read_returns_the_appended_frames(warehouse):
+    warehouse.write("nav", pd.DataFrame({"securityID": ["A", "B"], "nav": [1.0, 2.0]}), asof=DAY1)
+    warehouse.write("nav", pd.DataFrame({"securityID": ["A"], "nav": [1.5], "currency": ["EUR"]}), asof=DAY2)
+
+    frame = warehouse.read("nav").sort_values(["asOf", "securityID"])
+
+    assert frame["nav"].tolist() == [1.0, 2.0, 1.5]
+    assert frame["currency"].isna().tolist() == [True, True, False]
+    assert frame["asOfDate"].astype(str).tolist() == ["2025-01-01", "2025-01-01", "2025-01-02"]
+
+
+def test_read_columns_and_filters(warehouse):
+    warehouse.write("nav", pd.DataFrame({"securityID": ["A", "B"], "nav": [1.0, 2.0]}), asof=DAY1)
+    warehouse.write("nav", pd.DataFrame({"securityID": ["A"], "nav": [1.5]}), asof=DAY2)
+
+    frame = warehouse.read("nav", columns=["securityID", "nav"], filters=[("asOfDate", "=", "2025-01-02")])
+
+    assert frame.to_dict("records") == [{"securityID": "A", "nav": 1.5}]
+
+
+def test_read_memory_maps_the_files(warehouse, monkeypatch):
+    filesystems = []
+    dataset = mstarpy.warehouse.ds.dataset
+
+    def spy(*args, **kwargs):
+        filesystems.append(kwargs.get("filesystem"))
+        return dataset(*args, **kwargs)
+
+    warehouse.write("nav", pd.DataFrame({"nav": [1.0]}), asof=DAY1)
+    monkeypatch.setattr(mstarpy.warehouse.ds, "dataset", spy)
+    warehouse.read("nav")
+
+    memory_mapped = mstarpy.warehouse.fs.LocalFileSystem(use_mmap=True)
+    assert filesystems and all(filesystem == memory_mapped for filesystem in filesystems)
+
+
+def test_missing_dataset_is_empty(warehouse):
+    assert warehouse.read("nav", columns=["nav"]).columns.tolist() == ["nav"]
+
+
+def test_nested_values_are_written_as_json(warehouse):
+    warehouse.write("raw", pd.DataFrame({"value": [{"a": 1}, [1, 2]]}), asof=DAY1)
+    assert warehouse.read("raw")["value"].tolist() == ['{"a": 1}', "[1, 2]"]